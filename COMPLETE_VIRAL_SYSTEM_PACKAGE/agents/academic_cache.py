@@ -0,0 +1,318 @@
+"""
+Academic Cache - Persistent Two-Level Cache for Academic Lookups
+
+This file remembers academic search results so that neighbouring topics
+(which share most of their queries) don't re-fetch the same papers.
+
+EXPLANATION FOR BEGINNERS:
+There are TWO levels, like a library catalogue and its shelves:
+
+1. QUERY LEVEL ("catalogue"):
+   normalized query -> list of paper IDs, valid for a limited time (TTL)
+   "dopamine  Reward " and "dopamine reward" are the same query
+
+2. PAPER LEVEL ("shelves"):
+   paper ID (DOI, or URL if there is no DOI) -> full paper metadata
+   A paper found by 12 different queries is stored ONCE
+
+A query lookup is a hit only if the query is fresh AND every paper it
+points to is still on the shelf - otherwise it's treated as a miss and
+the search runs again.
+
+Papers are grouped by source ("jstor", "claude_synthesis", ...) because
+each source returns differently shaped records for the same DOI.
+
+CONFIGURATION (environment variables, all optional):
+- ACADEMIC_CACHE_ENABLED: "0" / "false" turns the cache off (default: on)
+- ACADEMIC_CACHE_PATH: SQLite file location (default: ./cache/academic.sqlite3)
+- ACADEMIC_CACHE_TTL_HOURS: How long query results stay valid (default: 168 = 1 week)
+
+USAGE EXAMPLE:
+    from agents.academic_cache import get_academic_cache
+
+    cache = get_academic_cache()
+    papers = cache.get_query("jstor", "dopamine reward")
+    if papers is None:
+        papers = run_search("dopamine reward")
+        cache.put_query("jstor", "dopamine reward", papers)
+"""
+
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+# Defaults (overridable with the environment variables listed above)
+DEFAULT_CACHE_PATH = os.path.join(".", "cache", "academic.sqlite3")
+DEFAULT_TTL_HOURS = 168
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a search query so trivially different spellings share a cache entry.
+
+    Lowercases and collapses whitespace: "  Dopamine   REWARD " -> "dopamine reward"
+    """
+    return re.sub(r"\s+", " ", query).strip().lower()
+
+
+def compound_query(topic: str, queries: List[str]) -> str:
+    """
+    Build one cache query for calls that answer a topic + several queries at once.
+
+    Queries are normalized and sorted, so the same set in a different order
+    still hits the same entry.
+    """
+    parts = sorted(normalize_query(q) for q in queries)
+    return normalize_query(topic) + " || " + " | ".join(parts)
+
+
+def paper_id(paper: Dict[str, Any]) -> str:
+    """
+    Pick the identifier a paper is stored under.
+
+    Prefers the DOI, then the URL. Records with neither (e.g. Claude
+    synthesis) are identified by a hash of their full contents.
+    """
+    doi = str(paper.get("doi") or "").strip().lower()
+    if doi:
+        return f"doi:{doi}"
+
+    url = str(paper.get("url") or "").strip()
+    if url:
+        return f"url:{url}"
+
+    payload = json.dumps(paper, sort_keys=True, ensure_ascii=False, default=str)
+    return "sha:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AcademicCache:
+    """
+    SQLite-backed query -> paper IDs -> paper metadata cache.
+
+    Safe to share between threads (all access goes through one lock).
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl_seconds: float = DEFAULT_TTL_HOURS * 3600):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: SQLite file location
+            ttl_seconds: How long query results stay valid
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # check_same_thread=False: the lock above makes cross-thread use safe
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS queries (
+                namespace TEXT NOT NULL,
+                query TEXT NOT NULL,
+                paper_ids TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (namespace, query)
+            )"""
+        )
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS papers (
+                source TEXT NOT NULL,
+                paper_id TEXT NOT NULL,
+                metadata TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (source, paper_id)
+            )"""
+        )
+        self._conn.commit()
+
+    # =================================================================
+    # QUERY LEVEL
+    # =================================================================
+
+    def get_query(self, namespace: str, query: str, source: Optional[str] = None) -> Optional[List[Dict]]:
+        """
+        Look up the papers a query returned last time.
+
+        Args:
+            namespace: Which search produced the results (e.g. "jstor:open:5")
+            query: Search query (normalized automatically)
+            source: Paper source the IDs point into (defaults to namespace)
+
+        Returns:
+            List of paper metadata in the original order, or None on a miss
+        """
+        now = time.time()
+        source = source or namespace
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT paper_ids, created_at FROM queries WHERE namespace = ? AND query = ?",
+                (namespace, normalize_query(query))
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            ids_json, created_at = row
+            if now - created_at > self.ttl_seconds:
+                # Too old - forget it
+                self._conn.execute(
+                    "DELETE FROM queries WHERE namespace = ? AND query = ?",
+                    (namespace, normalize_query(query))
+                )
+                self._conn.commit()
+                return None
+
+            papers = []
+            for pid in json.loads(ids_json):
+                paper_row = self._conn.execute(
+                    "SELECT metadata FROM papers WHERE source = ? AND paper_id = ?",
+                    (source, pid)
+                ).fetchone()
+                if paper_row is None:
+                    # A paper went missing - re-run the search
+                    return None
+                papers.append(json.loads(paper_row[0]))
+
+        return papers
+
+    def put_query(self, namespace: str, query: str, papers: List[Dict], source: Optional[str] = None):
+        """
+        Store a query's results (papers go to the paper level, IDs to the query level).
+
+        Args:
+            namespace: Which search produced the results
+            query: Search query (normalized automatically)
+            papers: Paper metadata, in result order
+            source: Paper source to file the papers under (defaults to namespace)
+        """
+        now = time.time()
+        source = source or namespace
+        ids = []
+
+        with self._lock:
+            for paper in papers:
+                pid = paper_id(paper)
+                ids.append(pid)
+                self._put_paper_locked(source, pid, paper, now)
+
+            self._conn.execute(
+                """INSERT OR REPLACE INTO queries (namespace, query, paper_ids, created_at)
+                   VALUES (?, ?, ?, ?)""",
+                (namespace, normalize_query(query), json.dumps(ids), now)
+            )
+            self._conn.commit()
+
+    # =================================================================
+    # PAPER LEVEL
+    # =================================================================
+
+    def get_paper(self, source: str, identifier: str) -> Optional[Dict]:
+        """
+        Look up one paper by DOI or URL.
+
+        Args:
+            source: Paper source (e.g. "jstor")
+            identifier: DOI, URL, or an ID from paper_id()
+
+        Returns:
+            Paper metadata, or None if not cached
+        """
+        if ":" not in identifier or identifier.startswith(("http://", "https://")):
+            # Bare DOI or URL - turn it into a stored ID
+            is_url = identifier.startswith(("http://", "https://"))
+            identifier = paper_id({"url": identifier} if is_url else {"doi": identifier})
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT metadata FROM papers WHERE source = ? AND paper_id = ?",
+                (source, identifier)
+            ).fetchone()
+
+        return json.loads(row[0]) if row else None
+
+    def put_paper(self, source: str, paper: Dict):
+        """
+        Store (or refresh) one paper's metadata.
+
+        Args:
+            source: Paper source (e.g. "jstor")
+            paper: Paper metadata
+        """
+        with self._lock:
+            self._put_paper_locked(source, paper_id(paper), paper, time.time())
+            self._conn.commit()
+
+    def _put_paper_locked(self, source: str, pid: str, paper: Dict, now: float):
+        """Write one paper row. Caller must hold self._lock."""
+        self._conn.execute(
+            """INSERT OR REPLACE INTO papers (source, paper_id, metadata, updated_at)
+               VALUES (?, ?, ?, ?)""",
+            (source, pid, json.dumps(paper, ensure_ascii=False, default=str), now)
+        )
+
+    def clear(self):
+        """Delete every cached query and paper."""
+        with self._lock:
+            self._conn.execute("DELETE FROM queries")
+            self._conn.execute("DELETE FROM papers")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return basic cache statistics.
+
+        Returns:
+            Dictionary with query and paper counts
+        """
+        with self._lock:
+            queries = self._conn.execute("SELECT COUNT(*) FROM queries").fetchone()[0]
+            papers = self._conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+
+        return {
+            "path": self.path,
+            "queries": queries,
+            "papers": papers,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+
+# =================================================================
+# PROCESS-WIDE DEFAULT CACHE
+# =================================================================
+
+_default_cache: Optional[AcademicCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_academic_cache() -> Optional[AcademicCache]:
+    """
+    Get the shared academic cache (created on first use).
+
+    Returns:
+        The shared AcademicCache, or None if caching is disabled
+        via ACADEMIC_CACHE_ENABLED=0
+    """
+    global _default_cache
+
+    if os.getenv("ACADEMIC_CACHE_ENABLED", "1").strip().lower() in ("0", "false", "no", "off"):
+        return None
+
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = AcademicCache(
+                path=os.getenv("ACADEMIC_CACHE_PATH", DEFAULT_CACHE_PATH),
+                ttl_seconds=float(os.getenv("ACADEMIC_CACHE_TTL_HOURS", DEFAULT_TTL_HOURS)) * 3600
+            )
+
+    return _default_cache
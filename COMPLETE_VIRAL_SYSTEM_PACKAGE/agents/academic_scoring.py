@@ -0,0 +1,145 @@
+"""
+Academic Scoring - Cheap Local Credibility Scores for Academic Papers
+
+These scorers need NO model call - they look only at a paper's metadata
+(journal name, citation count, publication year). They are shared by the
+Academic Depth Specialist and the Research Gatekeeper's pre-scoring pass.
+
+EXPLANATION FOR BEGINNERS:
+- Journal tier: Nature/Science/Cell = 10, specialized journals = 6-7
+- Citations: 1000+ = seminal (10), fewer than 10 = new or niche (4-6)
+- Recency: last 2 years = 1.0, older than 10 years = 0.5
+- Credibility = journal (40%) + citations (40%) + recency (20%)
+
+USAGE EXAMPLE:
+    from agents.academic_scoring import credibility_breakdown
+
+    scores = credibility_breakdown(journal="Nature", citation_count=2400, year=2021)
+    print(scores["credibility_score"])   # 9.6
+"""
+
+from typing import Any, Dict, Optional
+from datetime import datetime
+import re
+
+
+def score_journal_tier(journal: str) -> float:
+    """
+    Score the quality tier of the journal.
+
+    Top-tier journals like Nature, Science = 10
+    High-tier specialized journals = 9
+    Peer-reviewed journals = 7
+    Unknown or lower-tier = 6
+
+    Args:
+        journal: Journal name
+
+    Returns:
+        Quality score 0-10
+    """
+    journal_lower = (journal or "").lower()
+
+    # Check against known journal tiers
+    if any(top in journal_lower for top in ["nature", "science", "cell"]):
+        return 10.0
+    elif any(high in journal_lower for high in ["physical review", "jama", "lancet", "pnas"]):
+        return 9.0
+    elif "journal" in journal_lower or "review" in journal_lower:
+        # Likely peer-reviewed journal
+        return 7.0
+    else:
+        # Unknown or lower-tier
+        return 6.0
+
+
+def score_citations(citation_count: int) -> float:
+    """
+    Score based on how many times the paper has been cited.
+
+    1000+ citations = 10 (seminal work)
+    100-999 = 8-10 (highly influential)
+    10-99 = 6-8 (recognized work)
+    0-9 = 4-6 (new or niche)
+
+    Args:
+        citation_count: Number of citations
+
+    Returns:
+        Citation score 0-10
+    """
+    if citation_count >= 1000:
+        return 10.0
+    elif citation_count >= 100:
+        return 8.0 + (min(citation_count - 100, 900) / 900) * 2  # 8-10 range
+    elif citation_count >= 10:
+        return 6.0 + (min(citation_count - 10, 90) / 90) * 2  # 6-8 range
+    else:
+        return 4.0 + (citation_count / 10) * 2  # 4-6 range
+
+
+def recency_weight(year: int, current_year: Optional[int] = None) -> float:
+    """
+    Weight a paper by age: newer research counts slightly more.
+
+    Args:
+        year: Publication year
+        current_year: Year to measure age from (default: this year)
+
+    Returns:
+        Weight between 0.5 and 1.0
+    """
+    age = (current_year or datetime.now().year) - year
+
+    if age <= 2:
+        return 1.0
+    elif age <= 5:
+        return 0.9
+    elif age <= 10:
+        return 0.7
+    else:
+        return 0.5
+
+
+def parse_year(value: Any, default: int = 2020) -> int:
+    """Pull a 4-digit year out of "2019", "2019-05-01", 2019, etc."""
+    match = re.search(r"\d{4}", str(value or ""))
+    return int(match.group()) if match else default
+
+
+def credibility_breakdown(
+    journal: str,
+    citation_count: int,
+    year: int,
+    current_year: Optional[int] = None
+) -> Dict[str, float]:
+    """
+    Compute the full local credibility score for one paper.
+
+    Weighted average: journal (40%), citations (40%), recency (20%)
+
+    Args:
+        journal: Journal name
+        citation_count: Number of citations
+        year: Publication year
+        current_year: Year to measure age from (default: this year)
+
+    Returns:
+        Dictionary with credibility_score and its components
+    """
+    journal_score = score_journal_tier(journal)
+    citation_score = score_citations(citation_count)
+    weight = recency_weight(year, current_year)
+
+    credibility_score = (
+        journal_score * 0.4 +
+        citation_score * 0.4 +
+        (weight * 10) * 0.2
+    )
+
+    return {
+        "credibility_score": round(credibility_score, 1),
+        "journal_score": journal_score,
+        "citation_score": citation_score,
+        "recency_weight": weight
+    }
@@ -15,11 +15,17 @@ INHERITANCE EXAMPLE:
         # Now has access to all BaseAgent methods!
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
 from datetime import datetime
+import asyncio
+import json
 import logging
 import os
-from anthropic import Anthropic
+
+from agents.client_registry import get_client, get_async_client, run_coroutine
+from agents.rate_limiter import LLMCallError
+from agents.response_cache import acached_message, cached_message
+from agents.streaming import stream_message
 
 # Configure logging
 # This sets up colored console output so you can see what's happening
@@ -94,7 +100,7 @@ class BaseAgent:
         
         This method:
         1. Gets your API key from environment variables
-        2. Creates an Anthropic client object
+        2. Fetches the shared Anthropic client (created once per process)
         3. Handles errors if API key is missing
         
         SECURITY NOTE: Never hardcode API keys in your code!
@@ -105,19 +111,25 @@ class BaseAgent:
             # os.getenv() reads from .env file (loaded by python-dotenv)
             api_key = os.getenv("ANTHROPIC_API_KEY")
             
+            # Keep the key so async calls can fetch the shared async client later
+            self.api_key = api_key
+            
             if not api_key:
                 # No API key found - this will cause problems
                 self.log("WARNING: ANTHROPIC_API_KEY not found in environment variables", "WARNING")
                 self.log("Set it in .env file or agent will fail on API calls", "WARNING")
                 self.client = None
             else:
-                # Create Anthropic client with your API key
-                self.client = Anthropic(api_key=api_key)
+                # Get the SHARED Anthropic client for this API key
+                # All agents reuse one pooled set of HTTP connections
+                # (see agents/client_registry.py)
+                self.client = get_client(api_key)
                 self.log("Anthropic client initialized successfully", "DEBUG")
                 
         except Exception as e:
             # Something went wrong during initialization
             self.log(f"Failed to initialize Anthropic client: {str(e)}", "ERROR")
+            self.api_key = None
             self.client = None
     
     def log(self, message: str, level: str = "INFO"):
@@ -184,7 +196,8 @@ class BaseAgent:
             Claude's response as a string
             
         Raises:
-            Exception: If API call fails or client not initialized
+            LLMCallError: If the API call fails (after retrying temporary failures)
+            Exception: If the client is not initialized
         """
         # Check if client is initialized
         if not self.client:
@@ -201,24 +214,21 @@ class BaseAgent:
             self.log(f"Calling Claude API ({model})...", "DEBUG")
             
             # Make the API call
-            # This sends your request to Claude and waits for response
-            message = self.client.messages.create(
+            # This sends your request to Claude and waits for response.
+            # cached_message() (agents/response_cache.py) answers identical
+            # requests from the on-disk cache, and otherwise goes through the
+            # shared rate limiter, which waits for request/token budget and
+            # retries temporary failures (rate limits, overload, network)
+            response_text = cached_message(
+                self.client,
                 model=model,
                 max_tokens=max_tokens,
                 temperature=temperature,
                 system=system_prompt,  # System instructions
-                messages=[
-                    {
-                        "role": "user",  # Who is sending the message
-                        "content": user_message  # The actual message
-                    }
-                ]
+                user_message=user_message,  # The actual message
+                description=f"{self.name} Claude call"
             )
             
-            # Extract text from response
-            # Claude's response is in message.content[0].text
-            response_text = message.content[0].text
-            
             # Log success (truncate long responses for readability)
             preview = response_text[:100] + "..." if len(response_text) > 100 else response_text
             self.log(f"API call successful. Response preview: {preview}", "DEBUG")
@@ -226,10 +236,225 @@ class BaseAgent:
             return response_text
             
         except Exception as e:
-            # Something went wrong with the API call
-            error_msg = f"Claude API call failed: {str(e)}"
+            # Something went wrong with the API call (retries already used up)
+            raise self._call_failed(e)
+    
+    def _call_failed(self, error: Exception) -> LLMCallError:
+        """
+        Log a failed Claude call and turn it into an LLMCallError.
+        
+        Keeps the status code and attempt count the rate limiter recorded,
+        so callers can tell "retries ran out" from "bad request".
+        
+        Args:
+            error: What the API call raised
+        
+        Returns:
+            The LLMCallError to raise
+        """
+        error_msg = f"Claude API call failed: {str(error)}"
+        self.log(error_msg, "ERROR")
+        
+        failed = LLMCallError(
+            error_msg,
+            status_code=getattr(error, "status_code", None),
+            attempts=getattr(error, "attempts", 1),
+            retryable=getattr(error, "retryable", False)
+        )
+        failed.__cause__ = error
+        return failed
+    
+    def stream_claude(
+        self,
+        system_prompt: str,  # System instructions for Claude
+        user_message: str,  # The user's query/request
+        override_model: Optional[str] = None,  # Optional: use different model
+        override_max_tokens: Optional[int] = None,  # Optional: different token limit
+        override_temperature: Optional[float] = None  # Optional: different creativity
+    ) -> Iterator[str]:
+        """
+        Streaming version of call_claude() - yields the response as it arrives.
+        
+        WHY STREAM?
+        call_claude() returns nothing until Claude has written the very last
+        word. stream_claude() hands over small pieces of text ("deltas") as
+        they are generated, so the caller can start working on the first
+        part of a long answer while the rest is still being written.
+        
+        EXAMPLE:
+            from agents.streaming import consume_stream
+            
+            full_text = consume_stream(
+                self.stream_claude(system_prompt, "Write the script"),
+                [section_consumer]  # Sees each finished section right away
+            )
+        
+        Args:
+            system_prompt: Instructions defining Claude's role and behavior
+            user_message: The actual query or request
+            override_model: Optional different model to use (defaults to self.model)
+            override_max_tokens: Optional different token limit
+            override_temperature: Optional different creativity level
+        
+        Yields:
+            Text deltas, in order (one single delta when served from cache)
+            
+        Raises:
+            LLMCallError: If the API call fails (after retrying temporary failures)
+            Exception: If the client is not initialized
+        """
+        # Same API key check as call_claude()
+        if not self.client:
+            error_msg = "Anthropic client not initialized. Check API key in .env file."
+            self.log(error_msg, "ERROR")
+            raise Exception(error_msg)
+        
+        # Use provided values or fall back to instance defaults
+        model = override_model or self.model
+        max_tokens = override_max_tokens or self.max_tokens
+        temperature = override_temperature or self.temperature
+        
+        try:
+            self.log(f"Streaming Claude API ({model})...", "DEBUG")
+            
+            # Same cache and rate limiter as call_claude() - a cache hit
+            # arrives as one piece, and only a COMPLETE answer is cached
+            # (see agents/streaming.py)
+            pieces = []
+            for delta in stream_message(
+                self.client,
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                system=system_prompt,
+                user_message=user_message,
+                description=f"{self.name} Claude stream"
+            ):
+                pieces.append(delta)
+                yield delta
+            
+            response_text = "".join(pieces)
+            
+            preview = response_text[:100] + "..." if len(response_text) > 100 else response_text
+            self.log(f"Streaming API call successful. Response preview: {preview}", "DEBUG")
+            
+        except GeneratorExit:
+            # The caller stopped reading early - nothing to report
+            raise
+        except Exception as e:
+            raise self._call_failed(e)
+    
+    async def acall_claude(
+        self,
+        system_prompt: str,  # System instructions for Claude
+        user_message: str,  # The user's query/request
+        override_model: Optional[str] = None,  # Optional: use different model
+        override_max_tokens: Optional[int] = None,  # Optional: different token limit
+        override_temperature: Optional[float] = None  # Optional: different creativity
+    ) -> str:
+        """
+        Async version of call_claude() - same inputs, same output.
+        
+        WHY ASYNC?
+        call_claude() blocks until Claude answers, so ten calls take ten
+        round-trips back to back. acall_claude() lets the program start
+        other calls while this one waits, so ten calls take roughly as long
+        as the slowest one.
+        
+        All agents share ONE pooled async client per event loop
+        (see agents/client_registry.py), so concurrent calls reuse warm
+        HTTP connections instead of opening new ones.
+        
+        EXAMPLE (inside an async function):
+            hooks, patterns = await asyncio.gather(
+                self.acall_claude(system_prompt, "Generate hooks"),
+                self.acall_claude(system_prompt, "Analyze patterns")
+            )
+        
+        Args:
+            system_prompt: Instructions defining Claude's role and behavior
+            user_message: The actual query or request
+            override_model: Optional different model to use (defaults to self.model)
+            override_max_tokens: Optional different token limit
+            override_temperature: Optional different creativity level
+        
+        Returns:
+            Claude's response as a string
+            
+        Raises:
+            LLMCallError: If the API call fails (after retrying temporary failures)
+            Exception: If the client is not initialized
+        """
+        # Same API key check as call_claude()
+        if not self.client:
+            error_msg = "Anthropic client not initialized. Check API key in .env file."
             self.log(error_msg, "ERROR")
             raise Exception(error_msg)
+        
+        # Use provided values or fall back to instance defaults
+        model = override_model or self.model
+        max_tokens = override_max_tokens or self.max_tokens
+        temperature = override_temperature or self.temperature
+        
+        try:
+            self.log(f"Calling Claude API async ({model})...", "DEBUG")
+            
+            # Shared client for the running event loop (pooled connections)
+            async_client = get_async_client(self.api_key)
+            
+            # "await" hands control back to the event loop while we wait,
+            # so other calls can make progress in the meantime
+            # (waiting for rate budget and retry backoff don't block it either).
+            # Same cache and rate limiter as call_claude()
+            response_text = await acached_message(
+                async_client,
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                system=system_prompt,
+                user_message=user_message,
+                description=f"{self.name} Claude call"
+            )
+            
+            preview = response_text[:100] + "..." if len(response_text) > 100 else response_text
+            self.log(f"Async API call successful. Response preview: {preview}", "DEBUG")
+            
+            return response_text
+            
+        except Exception as e:
+            raise self._call_failed(e)
+    
+    def gather_claude(self, calls: List[Dict[str, Any]]) -> List[str]:
+        """
+        Run several Claude calls at the same time from synchronous code.
+        
+        Each item in calls is a dictionary of acall_claude() arguments.
+        Results come back in the SAME ORDER as the calls.
+        
+        EXAMPLE:
+            responses = self.gather_claude([
+                {"system_prompt": prompt, "user_message": "Question 1"},
+                {"system_prompt": prompt, "user_message": "Question 2"}
+            ])
+        
+        NOTE: The calls run on the shared background event loop (see
+        run_coroutine() in agents/client_registry.py), so every call reuses
+        the same async client and its warm connections. Call it from normal
+        (non-async) code. Inside async code, use asyncio.gather() directly.
+        
+        Args:
+            calls: List of keyword-argument dictionaries for acall_claude()
+        
+        Returns:
+            List of Claude responses, one per call, in input order
+        
+        Raises:
+            Exception: If any of the calls fails
+        """
+        async def _run_all() -> List[str]:
+            return await asyncio.gather(*(self.acall_claude(**call) for call in calls))
+        
+        return list(run_coroutine(_run_all()))
     
     def execute(self, state: Dict) -> Dict:
         """
@@ -314,6 +539,38 @@ class BaseAgent:
         """
         return dictionary.get(key, default)
     
+    def extract_json_array(self, response: str) -> List[Any]:
+        """
+        Pull a JSON array out of a Claude response.
+        
+        Batched prompts ask for "ONLY a JSON array", but Claude sometimes
+        wraps it in text or ```json fences. Everything from the first "["
+        to the last "]" is parsed.
+        
+        EXAMPLE:
+            items = self.extract_json_array('Here you go:\n```json\n[{"index": 0}]\n```')
+            # -> [{"index": 0}]
+        
+        Args:
+            response: Raw Claude response
+        
+        Returns:
+            The parsed list
+        
+        Raises:
+            ValueError: If there is no JSON array in the response
+                (json.JSONDecodeError is a ValueError too)
+        """
+        start = response.find("[")
+        end = response.rfind("]")
+        if start == -1 or end <= start:
+            raise ValueError("No JSON array in response")
+        
+        items = json.loads(response[start:end + 1])
+        if not isinstance(items, list):
+            raise ValueError("Response JSON is not an array")
+        return items
+    
     def merge_state(self, state: Dict, updates: Dict) -> Dict:
         """
         Merge updates into state and return new state.
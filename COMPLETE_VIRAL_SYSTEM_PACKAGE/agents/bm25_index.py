@@ -0,0 +1,335 @@
+"""
+BM25 Index - Keyword Search Over the Technique Library
+
+Vector (embedding) search finds techniques with a similar MEANING, but it
+is weak at exact names: a query mentioning "Open Loop" or "Contrarian
+Hook" may rank the technique with that very name below vaguely related
+ones. Classic keyword search is strong exactly there.
+
+EXPLANATION FOR BEGINNERS:
+- BM25 is the standard keyword ranking formula (used by search engines):
+  a document scores higher when it contains the query's words often,
+  especially RARE words, and long documents don't win just by being long
+- The index is an "inverted index": for every word, which documents
+  contain it and how often. Two-word phrases ("open loop") are indexed
+  too, so exact technique names get an extra boost
+- The index mirrors the viral_techniques collection. Writers in this
+  process (TechniqueWriter, add_technique) hand it the documents they
+  just wrote, so only those are re-indexed. Any other change (a new
+  version number from agents/query_cache.py that the index wasn't told
+  about, or a different document count) makes it rebuild from the
+  collection
+- reciprocal_rank_fusion() merges the keyword ranking with the vector
+  ranking: each list gives a document 1 / (k + rank) points, so a
+  technique ranked well by EITHER search rises to the top, and one
+  ranked well by BOTH rises highest
+
+USAGE EXAMPLE:
+    from agents.bm25_index import get_collection_index, reciprocal_rank_fusion
+
+    keyword_ids = [doc_id for doc_id, _ in get_collection_index(collection).search(query, 20)]
+    fused = reciprocal_rank_fusion([vector_ids, keyword_ids])
+"""
+
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import math
+import re
+import threading
+
+from agents.query_cache import collection_key, collection_version
+
+# BM25 tuning: k1 = how fast repeated words stop adding score,
+# b = how strongly long documents are penalized
+DEFAULT_K1 = 1.5
+DEFAULT_B = 0.75
+
+# Reciprocal rank fusion constant (60 is the value from the original paper)
+DEFAULT_RRF_K = 60
+
+# Documents fetched per page when (re)building from a collection
+SYNC_PAGE_SIZE = 500
+
+# Words too common to say anything about a document
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how",
+    "in", "is", "it", "its", "of", "on", "or", "that", "the", "this", "to",
+    "was", "what", "when", "which", "who", "why", "will", "with", "you", "your"
+}
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into index terms: words plus adjacent word pairs.
+
+    "The Open Loop technique" -> ["open", "loop", "technique",
+    "open_loop", "loop_technique"]
+    """
+    words = [word for word in _WORD_PATTERN.findall(str(text).lower()) if word not in STOPWORDS]
+    return words + [f"{first}_{second}" for first, second in zip(words, words[1:])]
+
+
+class BM25Index:
+    """
+    In-memory BM25 inverted index over documents identified by ID.
+
+    Only term statistics are kept - not the document text - so the index
+    stays small. Safe to share between threads.
+    """
+
+    def __init__(self, k1: float = DEFAULT_K1, b: float = DEFAULT_B):
+        """
+        Args:
+            k1: Term frequency saturation
+            b: Document length normalization (0 = none, 1 = full)
+        """
+        self.k1 = k1
+        self.b = b
+
+        # term -> {doc_id: term count}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        # doc_id -> number of terms in the document
+        self._lengths: Dict[str, int] = {}
+        # doc_id -> its distinct terms (so remove() only touches those)
+        self._doc_terms: Dict[str, List[str]] = {}
+        self._total_length = 0
+
+        # (collection version, document count) the index was built from
+        self._synced = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add(self, doc_id: str, text: str):
+        """Index a document (replaces an earlier document with the same ID)."""
+        with self._lock:
+            self.remove(doc_id)
+
+            terms = Counter(tokenize(text))
+            for term, count in terms.items():
+                self._postings.setdefault(term, {})[doc_id] = count
+
+            length = sum(terms.values())
+            self._lengths[doc_id] = length
+            self._doc_terms[doc_id] = list(terms)
+            self._total_length += length
+
+    def remove(self, doc_id: str):
+        """Drop a document from the index (no-op if it isn't there)."""
+        with self._lock:
+            if doc_id not in self._lengths:
+                return
+
+            self._total_length -= self._lengths.pop(doc_id)
+            for term in self._doc_terms.pop(doc_id):
+                postings = self._postings[term]
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+
+    def clear(self):
+        """Drop every document."""
+        with self._lock:
+            self._postings.clear()
+            self._lengths.clear()
+            self._doc_terms.clear()
+            self._total_length = 0
+            self._synced = None
+
+    def search(self, query: str, n_results: int = 10) -> List[Tuple[str, float]]:
+        """
+        Rank documents by BM25 score for the query.
+
+        Args:
+            query: Search text
+            n_results: Maximum number of results
+
+        Returns:
+            [(doc_id, score), ...] best first (only documents sharing at
+            least one term with the query)
+        """
+        with self._lock:
+            total_docs = len(self._lengths)
+            if not total_docs:
+                return []
+
+            average_length = self._total_length / total_docs or 1.0
+            scores: Dict[str, float] = {}
+
+            # Each distinct query term counts once
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+
+                # Rare terms are worth more (inverse document frequency)
+                idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+
+                for doc_id, count in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / average_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * count * (self.k1 + 1) / (count + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:n_results]
+
+    def sync(self, collection: Any):
+        """
+        Make the index mirror a Chroma collection.
+
+        Rebuilds from the collection (page by page) only when it changed
+        since the last sync: its version was bumped by a write in this
+        process, or its document count differs (a write elsewhere).
+
+        Args:
+            collection: ChromaDB collection
+        """
+        state = (collection_version(collection), collection.count())
+
+        with self._lock:
+            if self._synced == state:
+                return
+
+            self.clear()
+            offset = 0
+            while True:
+                page = collection.get(include=["documents"], limit=SYNC_PAGE_SIZE, offset=offset)
+                ids = page.get("ids") or []
+                for doc_id, document in zip(ids, page.get("documents") or []):
+                    self.add(doc_id, document or "")
+
+                if len(ids) < SYNC_PAGE_SIZE:
+                    break
+                offset += len(ids)
+
+            self._synced = state
+
+    def apply_write(
+        self,
+        collection: Any,
+        version: int,
+        upserted: Dict[str, str],
+        removed: Iterable[str] = ()
+    ) -> bool:
+        """
+        Update the index for one write to the collection, without a rebuild.
+
+        Only applies when the index was in sync right before this write
+        (version - 1) and the collection holds exactly the documents this
+        write explains. Otherwise the index is left alone and the next
+        sync() rebuilds it.
+
+        Args:
+            collection: ChromaDB collection that was written to
+            version: Collection version returned by bump_collection_version()
+                for this write
+            upserted: {doc_id: document text} added or updated
+            removed: IDs deleted
+
+        Returns:
+            True if the index was updated in place
+        """
+        with self._lock:
+            if self._synced is None or self._synced[0] != version - 1:
+                return False
+
+            removed = [doc_id for doc_id in removed if doc_id not in upserted]
+            expected_count = (
+                self._synced[1]
+                + sum(1 for doc_id in upserted if doc_id not in self._lengths)
+                - sum(1 for doc_id in removed if doc_id in self._lengths)
+            )
+            count = collection.count()
+            if count != expected_count:
+                # Someone else wrote too - the next sync() rebuilds
+                return False
+
+            for doc_id in removed:
+                self.remove(doc_id)
+            for doc_id, document in upserted.items():
+                self.add(doc_id, document or "")
+
+            self._synced = (version, count)
+            return True
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[str]],
+    k: int = DEFAULT_RRF_K
+) -> List[Tuple[str, float]]:
+    """
+    Merge several rankings of the same documents into one.
+
+    Every ranking gives each of its documents 1 / (k + rank) points
+    (rank starts at 1); points are added up across rankings.
+
+    Args:
+        rankings: Lists of document IDs, each best first
+        k: Dampens the advantage of the very top ranks
+
+    Returns:
+        [(doc_id, fused score), ...] best first
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, 1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+# =================================================================
+# ONE INDEX PER COLLECTION (shared by every agent in the process)
+# =================================================================
+
+_indexes: Dict[str, BM25Index] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_collection_index(collection: Any) -> BM25Index:
+    """
+    Get the keyword index for a collection, synced with its current contents.
+
+    Args:
+        collection: ChromaDB collection
+
+    Returns:
+        The collection's BM25Index
+    """
+    key = collection_key(collection)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = BM25Index()
+
+    index.sync(collection)
+    return index
+
+
+def update_collection_index(
+    collection: Any,
+    version: int,
+    upserted: Dict[str, str],
+    removed: Iterable[str] = ()
+) -> Optional[bool]:
+    """
+    Tell a collection's keyword index about a write (call right after it).
+
+    Args:
+        collection: ChromaDB collection that was written to
+        version: Version returned by bump_collection_version() for this write
+        upserted: {doc_id: document text} added or updated
+        removed: IDs deleted
+
+    Returns:
+        True if the index was updated in place, False if it will rebuild on
+        its next search, None if no index exists for the collection yet
+    """
+    with _indexes_lock:
+        index = _indexes.get(collection_key(collection))
+
+    if index is None:
+        return None
+    return index.apply_write(collection, version, upserted, removed)
@@ -25,6 +25,10 @@ import json
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from agents.base_agent import BaseAgent
+from agents.context_packer import pack_research
+
+# How much research (in tokens) goes into the synthesis prompt
+RESEARCH_TOKEN_BUDGET = 6000
 
 
 class ContentSynthesisGatekeeper(BaseAgent):
@@ -229,11 +233,11 @@ TARGET SPECIFICATIONS:
 - Audience: {target_audience}
 - Style: Documentary with viral optimization
 
-RESEARCH FINDINGS TO INCORPORATE:
-{json.dumps(research_findings, indent=2)}
+RESEARCH FINDINGS TO INCORPORATE (best first):
+{pack_research(research_findings, RESEARCH_TOKEN_BUDGET)}
 
 VIRAL OPTIMIZATION TO APPLY:
-{json.dumps(viral_analysis, indent=2)}
+{json.dumps(viral_analysis, separators=(",", ":"), ensure_ascii=False)}
 
 DELIVERABLES:
 1. Complete script with timecodes
@@ -18,8 +18,8 @@ IMPROVEMENTS OVER BASIC VERSION:
 """
 
 from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
 import json
-import requests
 from datetime import datetime
 import sys
 import os
@@ -28,8 +28,15 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from agents.base_agent import BaseAgent
+from agents.jstor_client import get_jstor_client
+from agents.academic_cache import get_academic_cache, compound_query
+from agents.research_dedup import deduplicate_findings
+from agents.academic_scoring import credibility_breakdown, parse_year
 from config.settings import settings
 
+# Score dimensions returned by every research scorer (single and batched)
+SCORE_DIMENSIONS = ["credibility", "uniqueness", "narrative_value", "visual_potential", "relevance", "overall"]
+
 
 class ResearchGatekeeper(BaseAgent):
     """
@@ -91,6 +98,23 @@ class ResearchGatekeeper(BaseAgent):
             }
         }
         
+        # Batch scoring configuration
+        # Findings are scored N at a time in ONE Claude call instead of one call each
+        # (set RESEARCH_SCORING_BATCH_SIZE=1 to go back to one call per finding)
+        self.scoring_batch_size = int(os.getenv("RESEARCH_SCORING_BATCH_SIZE", 10))
+        
+        # Local pre-scoring band (0-10 credibility from journal/citations/recency)
+        # - At or above ACCEPT: clearly credible, scored locally (no Claude call)
+        # - At or below REJECT: clearly weak, dropped before scoring
+        # - In between: borderline, sent to Claude for full scoring
+        # The lowest possible credibility is 5.0 (unknown venue, no citations,
+        # 10+ years old), so REJECT must sit above it to drop anything. At 5.5
+        # only old, barely cited papers go: an unknown venue with 0-1 citations
+        # after 6-10 years (0-6 after 10+), or an ordinary journal with 0-1
+        # citations after 10+ years
+        self.prescore_accept_threshold = float(os.getenv("RESEARCH_PRESCORE_ACCEPT", 8.5))
+        self.prescore_reject_threshold = float(os.getenv("RESEARCH_PRESCORE_REJECT", 5.5))
+        
         self.log("Research Gatekeeper initialized with JSTOR integration", "SUCCESS")
     
     def _get_system_prompt(self) -> str:
@@ -191,7 +215,8 @@ Remember: Your goal is to make the content creator look like an EXPERT who knows
         4. Performs interdisciplinary research
         5. Mines historical context
         6. Identifies contrarian viewpoints
-        7. Scores and validates all findings
+        (steps 3-6 run concurrently; contrarian search starts once JSTOR is done)
+        7. Removes duplicate findings, then scores and validates the rest
         8. Compiles comprehensive research report
         
         Args:
@@ -227,21 +252,49 @@ Remember: Your goal is to make the content creator look like an EXPERT who knows
         research_strategy = self._develop_research_strategy(topic, target_audience, video_style)
         self.log(f"Research strategy developed with {len(research_strategy.get('search_queries', []))} search queries", "SUCCESS")
         
-        # STEP 2: Execute JSTOR academic research (PRIMARY SOURCE)
-        jstor_findings = self._search_jstor(research_strategy.get("search_queries", []), topic)
-        self.log(f"JSTOR search completed: {len(jstor_findings)} academic sources found", "SUCCESS")
-        
-        # STEP 3: Interdisciplinary research
-        interdisciplinary_findings = self._interdisciplinary_research(topic, research_strategy)
-        self.log(f"Interdisciplinary research completed: {len(interdisciplinary_findings)} connections found", "SUCCESS")
-        
-        # STEP 4: Historical context mining
-        historical_findings = self._mine_historical_context(topic)
-        self.log(f"Historical research completed: {len(historical_findings)} historical insights found", "SUCCESS")
+        # STEPS 2-5: Run the research branches concurrently
+        # Only the contrarian search depends on another branch (it needs the
+        # JSTOR findings), so interdisciplinary and historical research run
+        # alongside JSTOR. Total time ~= the longest branch, not the sum.
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            # STEP 2: JSTOR academic research (PRIMARY SOURCE)
+            jstor_future = executor.submit(
+                self._search_jstor, research_strategy.get("search_queries", []), topic
+            )
+            
+            # STEP 3: Interdisciplinary research (independent)
+            interdisciplinary_future = executor.submit(
+                self._interdisciplinary_research, topic, research_strategy
+            )
+            
+            # STEP 4: Historical context mining (independent)
+            historical_future = executor.submit(self._mine_historical_context, topic)
+            
+            jstor_findings = jstor_future.result()
+            self.log(f"JSTOR search completed: {len(jstor_findings)} academic sources found", "SUCCESS")
+            
+            # STEP 5: Contrarian viewpoint discovery (waits for JSTOR)
+            contrarian_future = executor.submit(
+                self._find_contrarian_viewpoints, topic, jstor_findings
+            )
+            
+            interdisciplinary_findings = interdisciplinary_future.result()
+            self.log(f"Interdisciplinary research completed: {len(interdisciplinary_findings)} connections found", "SUCCESS")
+            
+            historical_findings = historical_future.result()
+            self.log(f"Historical research completed: {len(historical_findings)} historical insights found", "SUCCESS")
+            
+            contrarian_findings = contrarian_future.result()
+            self.log(f"Contrarian research completed: {len(contrarian_findings)} alternative perspectives found", "SUCCESS")
         
-        # STEP 5: Contrarian viewpoint discovery
-        contrarian_findings = self._find_contrarian_viewpoints(topic, jstor_findings)
-        self.log(f"Contrarian research completed: {len(contrarian_findings)} alternative perspectives found", "SUCCESS")
+        # Remove findings that several research branches found independently
+        # (every duplicate dropped here is one less scoring call)
+        jstor_findings, interdisciplinary_findings, historical_findings, contrarian_findings = self._deduplicate_findings(
+            jstor_findings,
+            interdisciplinary_findings,
+            historical_findings,
+            contrarian_findings
+        )
         
         # STEP 6: Score and validate all findings
         validated_findings = self._validate_and_score_research(
@@ -357,8 +410,8 @@ Remember: We want insights that will make viewers think "Wow, I never knew that!
         1. Register for JSTOR API access
         2. Implement OAuth authentication
         3. Use their search API endpoints
-        4. Handle pagination for large result sets
-        5. Cache results to avoid redundant API calls
+        Connection pooling, concurrency, pagination, rate limiting and result
+        caching are handled by the shared client in agents/jstor_client.py.
         
         Args:
             queries: List of search queries developed in strategy phase
@@ -375,65 +428,46 @@ Remember: We want insights that will make viewers think "Wow, I never knew that!
             # Fallback: Use Claude to synthesize academic knowledge
             return self._claude_academic_synthesis(queries, topic)
         
-        # Execute each search query
-        for query in queries[:10]:  # Limit to top 10 queries to manage API costs
-            try:
-                self.log(f"Executing JSTOR search: {query}", "INFO")
-                
-                # JSTOR API request structure
-                # This is a TEMPLATE - actual JSTOR API may have different parameters
-                params = {
-                    "q": query,  # Search query
-                    "filter": "article_type:research-article",  # Research articles only
-                    "sort": "relevance",  # Most relevant first
-                    "limit": 10,  # Results per query
-                    "access": "open",  # Prioritize open access when possible
-                }
-                
-                headers = {
-                    "Authorization": f"Bearer {self.jstor_api_key}",
-                    "Content-Type": "application/json"
-                }
-                
-                # Make API request
-                # In production, add retry logic, rate limiting, error handling
-                response = requests.get(
-                    self.jstor_base_url,
-                    params=params,
-                    headers=headers,
-                    timeout=30  # 30 second timeout
-                )
-                
-                if response.status_code == 200:
-                    results = response.json()
-                    
-                    # Process each result
-                    for item in results.get("items", [])[:5]:  # Top 5 per query
-                        finding = {
-                            "source": "JSTOR",
-                            "title": item.get("title", ""),
-                            "authors": item.get("authors", []),
-                            "publication_date": item.get("publication_date", ""),
-                            "journal": item.get("journal_name", ""),
-                            "abstract": item.get("abstract", ""),
-                            "url": item.get("url", ""),
-                            "doi": item.get("doi", ""),
-                            "citation_count": item.get("citation_count", 0),
-                            "query_used": query,
-                            "relevance_score": item.get("relevance_score", 0.0)
-                        }
-                        findings.append(finding)
-                        
-                    self.log(f"Found {len(results.get('items', []))} results for query: {query}", "SUCCESS")
-                else:
-                    self.log(f"JSTOR API error: {response.status_code}", "WARNING")
-                    
-            except requests.exceptions.RequestException as e:
-                self.log(f"Network error accessing JSTOR: {str(e)}", "ERROR")
-                continue
-            except Exception as e:
-                self.log(f"Error processing JSTOR results: {str(e)}", "ERROR")
+        # Limit to top 10 queries to manage API costs
+        queries = queries[:10]
+        self.log(f"Executing {len(queries)} JSTOR searches concurrently", "INFO")
+        
+        # JSTOR API request structure
+        # This is a TEMPLATE - actual JSTOR API may have different parameters
+        params = {
+            "filter": "article_type:research-article",  # Research articles only
+            "sort": "relevance",  # Most relevant first
+            "access": "open",  # Prioritize open access when possible
+        }
+        
+        # Shared pooled client: concurrent queries, pagination, rate limiting
+        client = get_jstor_client(self.jstor_api_key, self.jstor_base_url)
+        
+        for result in client.search_many(queries, params, max_results_per_query=5):  # Top 5 per query
+            query = result["query"]
+            
+            if result["error"]:
+                self.log(f"JSTOR search failed for '{query}': {result['error']}", "ERROR")
                 continue
+            
+            # Process each result
+            for item in result["items"]:
+                finding = {
+                    "source": "JSTOR",
+                    "title": item.get("title", ""),
+                    "authors": item.get("authors", []),
+                    "publication_date": item.get("publication_date", ""),
+                    "journal": item.get("journal_name", ""),
+                    "abstract": item.get("abstract", ""),
+                    "url": item.get("url", ""),
+                    "doi": item.get("doi", ""),
+                    "citation_count": item.get("citation_count"),  # None = unknown
+                    "query_used": query,
+                    "relevance_score": item.get("relevance_score", 0.0)
+                }
+                findings.append(finding)
+            
+            self.log(f"Found {len(result['items'])} results for query: {query}", "SUCCESS")
         
         self.log(f"JSTOR search completed: {len(findings)} total findings", "SUCCESS")
         return findings
@@ -466,6 +500,15 @@ Remember: We want insights that will make viewers think "Wow, I never knew that!
         """
         self.log("Using Claude academic synthesis (JSTOR API unavailable)", "INFO")
         
+        # Check the academic cache first - neighbouring topics reuse the same queries
+        cache = get_academic_cache()
+        cache_query = compound_query(topic, queries)
+        if cache is not None:
+            cached = cache.get_query("claude_synthesis", cache_query)
+            if cached is not None:
+                self.log(f"Academic synthesis loaded from cache: {len(cached)} findings", "SUCCESS")
+                return cached
+        
         prompt = f"""Act as a research librarian with access to academic databases. 
 
 TOPIC: {topic}
@@ -512,6 +555,9 @@ Provide at least 15-20 high-quality findings."""
         findings = result.get("findings", [])
         self.log(f"Claude academic synthesis completed: {len(findings)} findings", "SUCCESS")
         
+        if cache is not None and findings:
+            cache.put_query("claude_synthesis", cache_query, findings)
+        
         return findings
     
     def _interdisciplinary_research(self, topic: str, strategy: Dict) -> List[Dict]:
@@ -780,6 +826,32 @@ Focus on viewpoints that add DEPTH and NUANCE, not controversy for its own sake.
         self.log(f"Contrarian research completed: {len(findings)} alternative perspectives", "SUCCESS")
         return findings
     
+    def _deduplicate_findings(self, *finding_lists: List[Dict]) -> tuple:
+        """
+        Merge duplicate findings across all research branches.
+        
+        Exact DOI/URL matches and near-identical titles are merged (see
+        agents/research_dedup.py). The richest record of each duplicate
+        group survives and stays in its own branch's list.
+        
+        Args:
+            *finding_lists: One list of findings per research branch
+        
+        Returns:
+            Tuple with the deduplicated lists, in the same order
+        """
+        combined = [finding for findings in finding_lists for finding in findings]
+        unique_ids = {id(finding) for finding in deduplicate_findings(combined)}
+        
+        removed = len(combined) - len(unique_ids)
+        if removed:
+            self.log(f"Deduplication removed {removed} duplicate findings", "SUCCESS")
+        
+        return tuple(
+            [finding for finding in findings if id(finding) in unique_ids]
+            for findings in finding_lists
+        )
+    
     def _validate_and_score_research(
         self,
         jstor_findings: List[Dict],
@@ -823,33 +895,53 @@ Focus on viewpoints that add DEPTH and NUANCE, not controversy for its own sake.
             "quality_metrics": {}
         }
         
-        # Score JSTOR/academic findings
-        for finding in jstor_findings:
-            score = self._score_research_finding(finding, "academic")
-            finding["quality_score"] = score
-            finding["validated"] = True
-            validated["academic_sources"].append(finding)
-        
-        # Score interdisciplinary findings
-        for finding in interdisciplinary_findings:
-            score = self._score_research_finding(finding, "interdisciplinary")
-            finding["quality_score"] = score
-            finding["validated"] = True
-            validated["interdisciplinary_connections"].append(finding)
-        
-        # Score historical findings
-        for finding in historical_findings:
-            score = self._score_research_finding(finding, "historical")
+        # Collect every finding with its type and destination category
+        # so they can all be scored together in a few batched calls
+        categorized = [
+            ("academic_sources", "academic", jstor_findings),
+            ("interdisciplinary_connections", "interdisciplinary", interdisciplinary_findings),
+            ("historical_context", "historical", historical_findings),
+            ("contrarian_perspectives", "contrarian", contrarian_findings)
+        ]
+        
+        typed_findings = []
+        destinations = []
+        for category, finding_type, findings in categorized:
+            for finding in findings:
+                typed_findings.append((finding, finding_type))
+                destinations.append(category)
+        
+        # Pre-score locally: clear winners get a local score, clear losers
+        # are dropped, only borderline findings go to Claude
+        prescores = [self._prescore_finding(finding) for finding, _ in typed_findings]
+        
+        to_score = [
+            typed for typed, prescore in zip(typed_findings, prescores)
+            if prescore is None
+        ]
+        llm_scores = iter(self._score_findings(to_score))  # Batched - see _score_findings
+        
+        accepted_locally = 0
+        rejected_locally = 0
+        for (finding, _), category, prescore in zip(typed_findings, destinations, prescores):
+            if prescore is None:
+                score = next(llm_scores)
+            elif prescore == "reject":
+                rejected_locally += 1
+                continue
+            else:
+                score = prescore
+                accepted_locally += 1
+            
             finding["quality_score"] = score
             finding["validated"] = True
-            validated["historical_context"].append(finding)
+            validated[category].append(finding)
         
-        # Score contrarian findings
-        for finding in contrarian_findings:
-            score = self._score_research_finding(finding, "contrarian")
-            finding["quality_score"] = score
-            finding["validated"] = True
-            validated["contrarian_perspectives"].append(finding)
+        self.log(
+            f"Pre-scoring: {accepted_locally} accepted and {rejected_locally} rejected locally, "
+            f"{len(to_score)} sent to Claude",
+            "INFO"
+        )
         
         # Calculate overall quality metrics
         all_scores = []
@@ -858,17 +950,73 @@ Focus on viewpoints that add DEPTH and NUANCE, not controversy for its own sake.
             all_scores.extend(category_scores)
         
         if all_scores:
+            # Pre-scored findings only have a real credibility score
+            judged_scores = [s for s in all_scores if not s.get("prescored")] or all_scores
             validated["quality_metrics"] = {
                 "average_credibility": sum(s.get("credibility", 0) for s in all_scores) / len(all_scores),
-                "average_uniqueness": sum(s.get("uniqueness", 0) for s in all_scores) / len(all_scores),
-                "average_narrative_value": sum(s.get("narrative_value", 0) for s in all_scores) / len(all_scores),
+                "average_uniqueness": sum(s.get("uniqueness", 0) for s in judged_scores) / len(judged_scores),
+                "average_narrative_value": sum(s.get("narrative_value", 0) for s in judged_scores) / len(judged_scores),
                 "total_findings": len(all_scores),
-                "high_quality_count": sum(1 for s in all_scores if s.get("overall", 0) >= 8)
+                # Pre-scored "overall" is credibility alone (always >= the accept
+                # threshold) - counting it here would inflate research confidence
+                "high_quality_count": sum(1 for s in judged_scores if not s.get("prescored") and s.get("overall", 0) >= 8),
+                "prescored_accepted": accepted_locally,
+                "prescored_rejected": rejected_locally
             }
         
         self.log(f"Validation completed: {len(all_scores)} findings scored", "SUCCESS")
         return validated
     
+    def _prescore_finding(self, finding: Dict):
+        """
+        Score a finding locally from its metadata, if the answer is obvious.
+        
+        Only findings with academic metadata (a journal AND a citation count,
+        like JSTOR results) can be pre-scored. The same journal-tier, citation
+        and recency scorers as the Academic Depth Specialist are used
+        (agents/academic_scoring.py).
+        
+        Args:
+            finding: Research finding
+        
+        Returns:
+            - A score dictionary if the finding is clearly credible
+              ("overall" = its credibility score)
+            - "reject" if it is clearly weak
+            - None if it needs full scoring by Claude
+        """
+        if not finding.get("journal") or not isinstance(finding.get("citation_count"), (int, float)):
+            return None
+        
+        year = parse_year(finding.get("year") or finding.get("publication_date"))
+        credibility = credibility_breakdown(
+            finding["journal"], finding["citation_count"], year
+        )["credibility_score"]
+        
+        if credibility <= self.prescore_reject_threshold:
+            return "reject"
+        
+        if credibility < self.prescore_accept_threshold:
+            return None  # Borderline - let Claude decide
+        
+        # Clear winner. Only credibility was actually judged, so it alone
+        # decides "overall" - averaging it with neutral placeholders would
+        # rank these findings BELOW borderline ones Claude scored. The other
+        # dimensions get the neutral default the LLM scorer uses for missing
+        # values and are left out of the quality averages
+        relevance = finding.get("relevance_score", 0.0)
+        score_summary = {
+            "credibility": credibility,
+            "uniqueness": 5,
+            "narrative_value": 5,
+            "visual_potential": 5,
+            "relevance": round(relevance * 10, 1) if 0 < relevance <= 1 else 5,
+            "overall": round(credibility, 1),
+            "prescored": True
+        }
+        
+        return score_summary
+    
     def _score_research_finding(self, finding: Dict, finding_type: str) -> Dict:
         """
         Score individual research finding across multiple dimensions.
@@ -973,6 +1121,131 @@ Return as JSON:
         
         return score_summary
     
+    def _score_findings(self, typed_findings: List[tuple]) -> List[Dict]:
+        """
+        Score many findings using as few Claude calls as possible.
+        
+        Findings are sent in chunks of self.scoring_batch_size, so 50 findings
+        with a chunk size of 10 cost 5 calls instead of 50.
+        
+        Args:
+            typed_findings: List of (finding, finding_type) tuples
+        
+        Returns:
+            List of score dictionaries, in the same order as typed_findings
+        """
+        batch_size = self.scoring_batch_size
+        
+        # Batching disabled - one call per finding (original behavior)
+        if batch_size <= 1:
+            return [self._score_research_finding(finding, finding_type) for finding, finding_type in typed_findings]
+        
+        scores = []
+        for start in range(0, len(typed_findings), batch_size):
+            chunk = typed_findings[start:start + batch_size]
+            scores.extend(self._score_research_batch(chunk))
+        
+        return scores
+    
+    def _score_research_batch(self, chunk: List[tuple]) -> List[Dict]:
+        """
+        Score a chunk of findings in ONE Claude call.
+        
+        Claude returns a JSON array with one score object per finding.
+        Any finding whose scores are missing or malformed (or every finding,
+        if the whole response fails to parse) falls back to
+        _score_research_finding() individually.
+        
+        Args:
+            chunk: List of (finding, finding_type) tuples
+        
+        Returns:
+            List of score dictionaries, in the same order as chunk
+        """
+        numbered = [
+            {"index": i, "finding_type": finding_type, "finding": finding}
+            for i, (finding, finding_type) in enumerate(chunk)
+        ]
+        
+        prompt = f"""Score each of these {len(chunk)} research findings across multiple quality dimensions.
+
+Use the same 0-10 rubric for every finding:
+1. CREDIBILITY: How trustworthy is this source?
+2. UNIQUENESS: How rare/unexpected is this insight?
+3. NARRATIVE VALUE: How interesting for storytelling?
+4. VISUAL POTENTIAL: How well can this be visualized?
+5. RELEVANCE: How well does it support the topic?
+Plus an OVERALL score.
+
+FINDINGS:
+{json.dumps(numbered, indent=2)}
+
+Return ONLY a JSON array with exactly one object per finding, in the same order:
+[
+    {{
+        "index": 0,
+        "credibility": 0-10,
+        "uniqueness": 0-10,
+        "narrative_value": 0-10,
+        "visual_potential": 0-10,
+        "relevance": 0-10,
+        "overall": 0-10
+    }}
+]"""
+        
+        try:
+            response = self.invoke_llm(prompt, use_json=True)
+            parsed = self._parse_batch_scores(response, len(chunk))
+        except Exception as e:
+            self.log(f"Batch scoring failed, scoring {len(chunk)} findings individually: {e}", "WARNING")
+            parsed = [None] * len(chunk)
+        
+        scores = []
+        for (finding, finding_type), score in zip(chunk, parsed):
+            if score is None:
+                # Per-item fallback for anything the batch didn't score cleanly
+                score = self._score_research_finding(finding, finding_type)
+            scores.append(score)
+        
+        return scores
+    
+    def _parse_batch_scores(self, response: str, expected: int) -> List[Optional[Dict]]:
+        """
+        Parse a batched scoring response into one score dictionary per finding.
+        
+        Args:
+            response: Raw Claude response (should contain a JSON array)
+            expected: Number of findings in the batch
+        
+        Returns:
+            List of length `expected`; entries are None where the response
+            had no valid scores for that finding
+        """
+        items = self.extract_json_array(response)
+        
+        results: List[Optional[Dict]] = [None] * expected
+        for position, item in enumerate(items):
+            if not isinstance(item, dict):
+                continue
+            
+            # Prefer the explicit index; fall back to array position
+            index = item.get("index", position)
+            if not isinstance(index, int) or not 0 <= index < expected:
+                continue
+            
+            try:
+                score_summary = {
+                    dimension: float(item[dimension])
+                    for dimension in SCORE_DIMENSIONS
+                }
+            except (KeyError, TypeError, ValueError):
+                continue
+            
+            if all(0 <= value <= 10 for value in score_summary.values()):
+                results[index] = score_summary
+        
+        return results
+    
     def _compile_research_report(
         self,
         topic: str,
@@ -13,16 +13,54 @@ This gatekeeper coordinates:
 - Hook Generator: Creates attention-grabbing openings
 - Engagement Optimizer: Maximizes watch time and retention
 - Psychology Trigger Detector: Identifies and applies triggers
+
+MODES:
+- "single" (default): One large Claude call covers all four areas
+- "fanout": The four sub-agents run AT THE SAME TIME, each on its own copy
+  of state, and their results are merged back in a fixed order.
+  Total time ~= the slowest sub-agent instead of one very long call.
+Choose with VIRAL_ANALYST_MODE=fanout or state["viral_analysis_mode"].
 """
 
 import sys
 import os
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from typing import Dict, List, Optional
 
 # Add parent directories to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from agents.base_agent import BaseAgent
+from agents.agent_pool import get_agent_pool
+from agents.context_packer import pack_research
+from agents.viral_subagents.pattern_analyzer import PatternAnalyzer
+from agents.viral_subagents.hook_generator import HookGenerator
+from agents.viral_subagents.engagement_optimizer import EngagementOptimizer
+from agents.viral_subagents.psychology_trigger_detector import PsychologyTriggerDetector
+
+# Sub-agents used in "fanout" mode, in MERGE ORDER
+# (if two sub-agents ever wrote the same key, the later one here wins)
+# Each entry: (name, class, method, output key, failure prefix). The
+# sub-agents catch their own errors and write "<prefix>: <error>" into
+# their output key instead of raising
+VIRAL_SUBAGENTS = [
+    ("pattern_analyzer", PatternAnalyzer, "analyze_patterns",
+     "viral_patterns", "Pattern analysis failed"),
+    ("hook_generator", HookGenerator, "generate_hooks",
+     "viral_hooks", "Hook generation failed"),
+    ("engagement_optimizer", EngagementOptimizer, "optimize_engagement",
+     "engagement_strategy", "Optimization failed"),
+    ("psychology_trigger_detector", PsychologyTriggerDetector, "detect_triggers",
+     "psychology_triggers", "Trigger analysis failed"),
+]
+
+# Confidence is capped here when any fan-out sub-agent failed
+FAILED_SUBAGENT_MAX_CONFIDENCE = 0.5
+
+# How much research (in tokens) goes into the single-call analysis prompt
+RESEARCH_TOKEN_BUDGET = 4000
 
 
 class ViralAnalystGatekeeper(BaseAgent):
@@ -46,6 +84,9 @@ class ViralAnalystGatekeeper(BaseAgent):
             temperature=0.5  # Balanced: creative but strategic
         )
         
+        # "single" = one large call, "fanout" = four sub-agents concurrently
+        self.mode = os.getenv("VIRAL_ANALYST_MODE", "single")
+        
         self.log("Viral Analyst Gatekeeper initialized", "INFO")
     
     def _create_system_prompt(self) -> str:
@@ -185,6 +226,9 @@ systematic application of proven patterns and psychological principles."""
                 "errors": state.get("errors", []) + ["Missing topic for viral analysis"]
             })
         
+        if state.get("viral_analysis_mode", self.mode) == "fanout":
+            return self._execute_fanout(state)
+        
         topic = state.get("topic", "")
         research_findings = state.get("research_findings", {})
         target_audience = state.get("target_audience", "General audience")
@@ -195,7 +239,7 @@ systematic application of proven patterns and psychological principles."""
 TARGET AUDIENCE: {target_audience}
 
 RESEARCH FINDINGS AVAILABLE:
-{json.dumps(research_findings, indent=2) if research_findings else "No research findings yet"}
+{pack_research(research_findings, RESEARCH_TOKEN_BUDGET, "No research findings yet")}
 
 TASK:
 1. Analyze viral patterns from successful videos on this topic
@@ -215,8 +259,10 @@ Provide actionable viral optimization recommendations."""
             
             # Parse response (in production, would parse JSON properly)
             # For now, return structured response
+            # (same keys as the fan-out mode - see _execute_fanout)
             viral_analysis = {
                 "analysis_complete": True,
+                "mode": "single",
                 "raw_analysis": response,
                 "timestamp": datetime.now().isoformat()
             }
@@ -240,6 +286,105 @@ Provide actionable viral optimization recommendations."""
                 "errors": state.get("errors", []) + [f"Viral analysis error: {str(e)}"]
             })
     
+    def _execute_fanout(self, state: Dict) -> Dict:
+        """
+        Run the four viral sub-agents concurrently and merge their results.
+        
+        HOW IT WORKS:
+        1. Each sub-agent gets its OWN deep copy of state, so their in-place
+           changes can't collide
+        2. All four run at the same time on a thread pool
+        3. Each sub-agent's new/changed keys (compared by VALUE with an
+           untouched copy, so in-place edits count too) are merged back in
+           the fixed VIRAL_SUBAGENTS order - same inputs always give the
+           same state
+        4. A sub-agent whose output is its failure message is logged as an
+           error, left out of the analysis text, and caps the confidence
+        
+        viral_analysis has the same keys as in "single" mode; raw_analysis
+        joins the four sub-agents' outputs under headings.
+        
+        Trade-off: because they run side by side, sub-agents don't see each
+        other's output (e.g. hooks are written without the pattern analysis).
+        
+        Args:
+            state: Current workflow state with research findings
+            
+        Returns:
+            Updated state with every sub-agent's keys plus viral_analysis
+        """
+        self.log(f"Fanning out to {len(VIRAL_SUBAGENTS)} viral sub-agents", "INFO")
+        
+        pool = get_agent_pool()
+        
+        # Untouched copy to detect what each sub-agent added or changed
+        original = copy.deepcopy(state)
+        
+        def run_subagent(entry):
+            name, agent_cls, method_name, output_key, failure_prefix = entry
+            isolated = copy.deepcopy(state)
+            try:
+                with pool.lease(agent_cls) as agent:
+                    result = getattr(agent, method_name)(isolated)
+            except Exception as e:
+                return {}, None, f"{name} failed: {str(e)}"
+            
+            # Keep only what the sub-agent added or changed
+            changed = {
+                key: value for key, value in result.items()
+                if key not in original or value != original[key]
+            }
+            
+            output = result.get(output_key)
+            if not isinstance(output, str) or not output or output.startswith(failure_prefix):
+                return changed, None, f"{name} failed: {output or 'no output'}"
+            return changed, output, None
+        
+        with ThreadPoolExecutor(max_workers=len(VIRAL_SUBAGENTS)) as executor:
+            outcomes = list(executor.map(run_subagent, VIRAL_SUBAGENTS))
+        
+        # Deterministic merge in VIRAL_SUBAGENTS order
+        updates = {}
+        errors = list(state.get("errors", []))
+        sections = []
+        failed = []
+        for (name, *_), (changed, output, error) in zip(VIRAL_SUBAGENTS, outcomes):
+            if error:
+                self.log(error, "ERROR")
+                errors.append(f"Viral analysis error: {error}")
+                failed.append(name)
+            for key, value in changed.items():
+                if key == "errors":
+                    errors.extend(e for e in value if e not in errors)
+                else:
+                    updates[key] = value
+            if not error:
+                sections.append(f"=== {name.replace('_', ' ').upper()} ===\n{output}")
+        
+        combined_text = "\n\n".join(sections)
+        
+        viral_analysis = {
+            "analysis_complete": not failed,
+            "mode": "fanout",
+            "raw_analysis": combined_text,
+            "timestamp": datetime.now().isoformat()
+        }
+        
+        confidence = self._calculate_confidence(combined_text)
+        if failed:
+            # Don't claim full confidence on a partial analysis
+            confidence = min(confidence, FAILED_SUBAGENT_MAX_CONFIDENCE)
+        
+        self.log(f"Viral fan-out complete. Confidence: {confidence:.2f}", "INFO")
+        
+        return self.merge_state(state, {
+            **updates,
+            "viral_analysis": viral_analysis,
+            "viral_confidence": confidence,
+            "viral_optimization_ready": confidence >= 0.75,
+            "errors": errors
+        })
+    
     def _calculate_confidence(self, response: str) -> float:
         """
         Calculate confidence score based on response quality.
@@ -0,0 +1,38 @@
+"""
+Hashing - One Fingerprint Function for the Whole System
+
+Several parts of the system need a short, stable "fingerprint" of some
+inputs: the synthesis manifest (was this piece made from these inputs?),
+the embedding cache (have we encoded this text before?) and the
+technique writer (is this document already stored?). They all use
+content_hash() from here, so equal inputs always get equal fingerprints.
+
+EXPLANATION FOR BEGINNERS:
+- A hash turns any amount of text into a short fixed-length string
+- Same inputs -> same fingerprint, every time, on every machine
+- Different inputs -> different fingerprint (a collision is practically
+  impossible at this length)
+- Only use it for recognising inputs again - it is NOT a password hash
+
+USAGE EXAMPLE:
+    from agents.hashing import content_hash
+
+    key = content_hash(model_name, text)   # "3f9c0a..." (32 hex characters)
+"""
+
+from typing import Any
+import hashlib
+
+
+def content_hash(*parts: Any) -> str:
+    """
+    Fingerprint a list of inputs.
+
+    The parts are separated by a character that never appears in normal
+    text, so ("ab", "c") and ("a", "bc") get different fingerprints.
+
+    Returns:
+        32-character hex string
+    """
+    payload = "\x1f".join(str(part) for part in parts)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
@@ -0,0 +1,272 @@
+"""
+JSTOR Search Client - Pooled, Concurrent, Paginated Academic Search
+
+This file is the ONE place that talks to the JSTOR search API. Both the
+Research Gatekeeper and the Academic Depth Specialist use it.
+
+EXPLANATION FOR BEGINNERS:
+- A requests.Session keeps HTTP connections open between requests
+  (bare requests.get() opens and closes a new connection every time)
+- Queries run at the same time on a small thread pool, so 10 slow queries
+  take about as long as the slowest one - not the sum of all ten
+- Results come back in "pages"; we only fetch the next page when we still
+  need more results ("streaming pagination")
+- A rate limiter spaces out requests to the same host so we never hammer
+  the API, no matter how many queries run in parallel
+- Results are stored in the academic cache (agents/academic_cache.py), so a
+  query searched recently by ANY agent is answered without a network call
+
+CONFIGURATION (environment variables, all optional):
+- JSTOR_MAX_CONCURRENCY: Queries searched at the same time (default: 4)
+- JSTOR_REQUESTS_PER_SECOND: Request rate per host (default: 2)
+
+USAGE EXAMPLE:
+    from agents.jstor_client import get_jstor_client
+
+    client = get_jstor_client(api_key, "https://www.jstor.org/api/search")
+    for result in client.search_many(queries, {"sort": "relevance"}, max_results_per_query=5):
+        if result["error"]:
+            print(result["error"])
+        for item in result["items"]:
+            print(item["title"])
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from urllib.parse import urlparse
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from agents.academic_cache import get_academic_cache
+
+# Defaults (overridable with the environment variables listed above)
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("JSTOR_MAX_CONCURRENCY", 4))
+DEFAULT_REQUESTS_PER_SECOND = float(os.getenv("JSTOR_REQUESTS_PER_SECOND", 2.0))
+DEFAULT_PAGE_SIZE = 10
+DEFAULT_MAX_PAGES = 3
+DEFAULT_TIMEOUT_SECONDS = 30
+
+
+class HostRateLimiter:
+    """
+    Spaces out requests so each host sees at most N requests per second.
+
+    Every thread calls wait(url) right before its request. Each call
+    reserves the next free time slot for that host and sleeps until it.
+    """
+
+    def __init__(self, requests_per_second: float):
+        """
+        Args:
+            requests_per_second: Allowed request rate per host (0 = unlimited)
+        """
+        self.min_interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str):
+        """Block until it's this caller's turn to hit the URL's host."""
+        if not self.min_interval:
+            return
+
+        host = urlparse(url).netloc
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class JSTORSearchClient:
+    """
+    Thread-safe JSTOR search client built on one pooled requests.Session.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        max_pages: int = DEFAULT_MAX_PAGES,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS
+    ):
+        """
+        Create the client and its connection pool.
+
+        Args:
+            api_key: JSTOR API key
+            base_url: JSTOR search endpoint
+            max_concurrency: Queries searched at the same time
+            requests_per_second: Request rate per host
+            page_size: Results requested per page
+            max_pages: Most pages fetched for a single query
+            timeout: Seconds to wait for each page
+        """
+        self.base_url = base_url
+        self.max_concurrency = max(1, max_concurrency)
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self.rate_limiter = HostRateLimiter(requests_per_second)
+
+        # One session = one reusable pool of keep-alive connections
+        # pool_maxsize matches our concurrency so no thread waits on a connection
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        })
+
+    def iter_results(self, query: str, params: Optional[Dict[str, Any]] = None) -> Iterator[Dict]:
+        """
+        Yield search results for one query, fetching pages only as needed.
+
+        Stops when a page comes back short (no more results), or after
+        max_pages. Stop iterating early and no further pages are requested.
+
+        Args:
+            query: Search query
+            params: Extra API parameters (filter, sort, access, ...)
+
+        Yields:
+            Raw result items from the API
+
+        Raises:
+            requests.exceptions.RequestException: On network or HTTP errors
+        """
+        for page in range(self.max_pages):
+            page_params = {
+                **(params or {}),
+                "q": query,
+                "limit": self.page_size,
+                "offset": page * self.page_size
+            }
+
+            self.rate_limiter.wait(self.base_url)
+            response = self.session.get(self.base_url, params=page_params, timeout=self.timeout)
+            response.raise_for_status()
+
+            items = response.json().get("items", [])
+            yield from items
+
+            # A short page means there is nothing left to fetch
+            if len(items) < self.page_size:
+                return
+
+    def search(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        max_results: int = DEFAULT_PAGE_SIZE
+    ) -> List[Dict]:
+        """
+        Get up to max_results items for one query.
+
+        Args:
+            query: Search query
+            params: Extra API parameters
+            max_results: Most results to return
+
+        Returns:
+            List of raw result items (from the academic cache when fresh)
+        """
+        # Same query + same parameters + same result count = same cache entry
+        cache = get_academic_cache()
+        namespace = "jstor:" + json.dumps(params or {}, sort_keys=True) + f":{max_results}"
+
+        if cache is not None:
+            cached = cache.get_query(namespace, query, source="jstor")
+            if cached is not None:
+                return cached
+
+        items = list(islice(self.iter_results(query, params), max_results))
+
+        if cache is not None:
+            cache.put_query(namespace, query, items, source="jstor")
+
+        return items
+
+    def search_many(
+        self,
+        queries: List[str],
+        params: Optional[Dict[str, Any]] = None,
+        max_results_per_query: int = DEFAULT_PAGE_SIZE
+    ) -> List[Dict[str, Any]]:
+        """
+        Search several queries concurrently.
+
+        One failing query never affects the others - its error is reported
+        in its own result instead of being raised.
+
+        Args:
+            queries: Search queries
+            params: Extra API parameters (shared by every query)
+            max_results_per_query: Most results to return per query
+
+        Returns:
+            One dictionary per query, in the same order as queries:
+            {"query": str, "items": List[Dict], "error": Optional[str]}
+        """
+        def run(query: str) -> Tuple[List[Dict], Optional[str]]:
+            try:
+                return self.search(query, params, max_results_per_query), None
+            except requests.exceptions.RequestException as e:
+                return [], f"Network error: {str(e)}"
+            except Exception as e:
+                return [], f"Error processing results: {str(e)}"
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            outcomes = list(executor.map(run, queries))
+
+        return [
+            {"query": query, "items": items, "error": error}
+            for query, (items, error) in zip(queries, outcomes)
+        ]
+
+
+# =================================================================
+# PROCESS-WIDE SHARED CLIENTS
+# =================================================================
+
+_clients: Dict[Tuple[str, str], JSTORSearchClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_jstor_client(api_key: str, base_url: str) -> JSTORSearchClient:
+    """
+    Get the shared JSTOR client for this API key and endpoint.
+
+    Sharing one client means every agent reuses the same connection pool
+    AND the same rate limiter (so two agents can't double the request rate).
+
+    Args:
+        api_key: JSTOR API key
+        base_url: JSTOR search endpoint
+
+    Returns:
+        Shared JSTORSearchClient
+    """
+    key = (api_key, base_url)
+
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = JSTORSearchClient(api_key, base_url)
+            _clients[key] = client
+
+    return client
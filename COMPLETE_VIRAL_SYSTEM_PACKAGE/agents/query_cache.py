@@ -0,0 +1,226 @@
+"""
+Query Cache - Remember Recent Technique Searches
+
+Content synthesis often asks the technique library the SAME question
+several times per topic (and batches ask it again for every topic). Each
+search embeds the query and scans the collection, even though nothing in
+the collection has changed since the last identical search.
+
+EXPLANATION FOR BEGINNERS:
+- Search results are kept in memory, keyed by
+  (collection, collection version, normalized query, n_results, filters)
+- "Normalized" means lower-cased with extra spaces removed, so
+  "Procrastination  Hooks" and "procrastination hooks" share one entry
+- Every collection has a VERSION number. Anything that writes to the
+  collection (TechniqueWriter, add_technique) bumps it, so results
+  cached before the write are never served again
+- The cache is "LRU" (least recently used): when it is full, the entry
+  that has gone unused the longest is dropped
+
+The cache lives in this process only. Writes made by ANOTHER process are
+not seen until this process restarts (or calls clear()).
+
+CONFIGURATION (environment variables, all optional):
+- QUERY_CACHE_ENABLED: "0" / "false" turns the cache off (default: on)
+- QUERY_CACHE_MAX_ENTRIES: Searches remembered (default: 256)
+
+USAGE EXAMPLE:
+    from agents.query_cache import get_query_cache
+
+    cache = get_query_cache()
+    results = cache.get(collection, query, n_results, where)
+    if results is None:
+        results = collection.query(...)
+        cache.put(collection, query, n_results, where, results)
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import copy
+import json
+import os
+import threading
+
+# Defaults (overridable with the environment variables listed above)
+DEFAULT_MAX_ENTRIES = 256
+
+# collection key -> version number (bumped on every write)
+_collection_versions: Dict[str, int] = {}
+_versions_lock = threading.Lock()
+
+
+def collection_key(collection: Any) -> str:
+    """
+    Identify a collection across the objects that point at it.
+
+    Chroma gives each collection a persistent id, so two clients opened
+    on the same database share one key (and therefore one version).
+    """
+    return str(getattr(collection, "id", None) or id(collection))
+
+
+def collection_version(collection: Any) -> int:
+    """Current version of a collection (0 until its first write)."""
+    with _versions_lock:
+        return _collection_versions.get(collection_key(collection), 0)
+
+
+def bump_collection_version(collection: Any) -> int:
+    """
+    Mark a collection as changed - cached searches on it become stale.
+
+    Call after every add/upsert/delete.
+
+    Returns:
+        The new version
+    """
+    key = collection_key(collection)
+    with _versions_lock:
+        _collection_versions[key] = _collection_versions.get(key, 0) + 1
+        return _collection_versions[key]
+
+
+def normalize_query(query: str) -> str:
+    """Lower-case and collapse whitespace so trivially different queries match."""
+    return " ".join(str(query).lower().split())
+
+
+class QueryCache:
+    """
+    In-memory LRU cache of search results, invalidated by collection version.
+
+    Stored and returned results are copies, so callers may change what
+    they get back without affecting the cache.
+
+    Safe to share between threads (all access goes through one lock).
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Args:
+            max_entries: Searches remembered before the least recently
+                used one is dropped
+        """
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(collection: Any, query: str, n_results: int, filters: Optional[Dict[str, Any]]) -> Tuple:
+        """Build the cache key for one search (includes the collection version)."""
+        return (
+            collection_key(collection),
+            collection_version(collection),
+            normalize_query(query),
+            int(n_results),
+            json.dumps(filters or {}, sort_keys=True, default=str)
+        )
+
+    def get(
+        self,
+        collection: Any,
+        query: str,
+        n_results: int,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Optional[Any]:
+        """
+        Look up the results of an earlier identical search.
+
+        Args:
+            collection: Collection that was searched
+            query: Search text
+            n_results: Number of results asked for
+            filters: Metadata filter ("where") used, if any
+
+        Returns:
+            A copy of the cached results, or None on a miss
+        """
+        key = self.make_key(collection, query, n_results, filters)
+
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+
+            # Mark as most recently used
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(self._entries[key])
+
+    def put(
+        self,
+        collection: Any,
+        query: str,
+        n_results: int,
+        filters: Optional[Dict[str, Any]],
+        results: Any
+    ) -> None:
+        """
+        Remember the results of a search.
+
+        Args:
+            collection: Collection that was searched
+            query: Search text
+            n_results: Number of results asked for
+            filters: Metadata filter ("where") used, if any
+            results: What the search returned
+        """
+        key = self.make_key(collection, query, n_results, filters)
+
+        with self._lock:
+            self._entries[key] = copy.deepcopy(results)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Forget every cached search."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return basic cache statistics.
+
+        Returns:
+            Dictionary with entry count, limit, hits and misses
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+# =================================================================
+# PROCESS-WIDE DEFAULT CACHE
+# =================================================================
+
+_default_cache: Optional[QueryCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_query_cache() -> Optional[QueryCache]:
+    """
+    Get the search cache shared by all agents (created on first use).
+
+    Returns:
+        The shared QueryCache, or None if caching is disabled
+        via QUERY_CACHE_ENABLED=0
+    """
+    global _default_cache
+
+    if os.getenv("QUERY_CACHE_ENABLED", "1").strip().lower() in ("0", "false", "no", "off"):
+        return None
+
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = QueryCache(int(os.getenv("QUERY_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)))
+
+    return _default_cache
@@ -0,0 +1,528 @@
+"""
+Rate Limiter - One Shared Gate for Every Claude Call
+
+The Anthropic API limits how many requests (and how many prompt tokens) an
+account may send per minute. Once research, viral analysis and batch video
+analysis all run in parallel, we blow through those limits quickly - and a
+single "429 Too Many Requests" used to throw away a whole stage.
+
+EXPLANATION FOR BEGINNERS:
+Every Claude call in the system goes through ONE shared RateLimiter, which:
+- Keeps two "token buckets": one for requests per minute, one for prompt
+  tokens per minute. A bucket refills steadily; each call takes from it,
+  and when it runs dry the next call WAITS instead of failing
+- Caps how many calls are in flight at once (a global concurrency cap)
+- RETRIES failures that are worth retrying (rate limited, overloaded,
+  server errors, dropped connections) with "exponential backoff":
+  wait ~1s, then ~2s, ~4s, ... with random jitter so parallel callers
+  don't all retry at the same instant
+- Honors the server's "retry-after" header when it sends one
+- ADAPTS: when the API says "slow down" (429/529) every caller pauses and
+  the request rate drops; each success slowly raises it back
+- Gives up with an LLMCallError (not a bare Exception) when a failure is
+  permanent (bad request, bad API key) or retries run out
+
+CONFIGURATION (environment variables, all optional):
+- LLM_REQUESTS_PER_MINUTE: Request budget (default: 50)
+- LLM_TOKENS_PER_MINUTE: Prompt-token budget (default: 40000)
+- LLM_MAX_CONCURRENCY: Calls in flight at once (default: 8)
+- LLM_MAX_RETRIES: Retries after the first attempt (default: 5)
+- LLM_BACKOFF_BASE_SECONDS: First backoff step (default: 1.0)
+- LLM_BACKOFF_MAX_SECONDS: Longest backoff step (default: 60)
+Or call configure_rate_limiter() in code before the first call.
+
+USAGE EXAMPLE:
+    from agents.rate_limiter import get_rate_limiter
+
+    response = get_rate_limiter().call(
+        lambda: client.messages.create(model=..., messages=[...]),
+        estimated_tokens=prompt_tokens
+    )
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, ContextManager, Dict, Iterator, Optional
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+
+from anthropic import APIConnectionError
+
+logger = logging.getLogger(__name__)
+
+# Defaults (overridable with the environment variables listed above)
+DEFAULT_REQUESTS_PER_MINUTE = 50
+DEFAULT_TOKENS_PER_MINUTE = 40_000
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF_BASE_SECONDS = 1.0
+DEFAULT_BACKOFF_MAX_SECONDS = 60.0
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limits, server errors
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+# Statuses that mean "the whole account is going too fast" (429) or
+# "the API is overloaded" (529) - these slow EVERY caller down
+THROTTLE_STATUS_CODES = {429, 529}
+
+# Adaptive rate: halve on throttling, never below this share of the budget,
+# and win back this share of the budget with every success
+MIN_RATE_FACTOR = 0.25
+RATE_RECOVERY_STEP = 0.05
+
+
+class LLMCallError(Exception):
+    """
+    A Claude call failed for good (permanent error, or retries used up).
+
+    Attributes:
+        status_code: HTTP status of the last failure (None for network errors)
+        attempts: How many attempts were made
+        retryable: True if the last failure was temporary (retries ran out)
+    """
+
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        attempts: int = 1,
+        retryable: bool = False
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.attempts = attempts
+        self.retryable = retryable
+
+
+class TokenBucket:
+    """
+    A budget that refills continuously ("X per minute").
+
+    Callers RESERVE what they need and are told how long to wait before
+    using it. The balance may go negative: later callers then wait behind
+    earlier ones, so the bucket also acts as a fair first-come queue.
+    """
+
+    def __init__(self, per_minute: float):
+        """
+        Args:
+            per_minute: Budget per minute (also the most the bucket holds)
+        """
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        """Add what has trickled in since the last update."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float) -> float:
+        """
+        Take amount from the bucket.
+
+        Args:
+            amount: Budget needed (more than the capacity counts as the capacity)
+
+        Returns:
+            Seconds to wait before the reserved budget is really available
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= min(amount, self.capacity)
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def refund(self, amount: float):
+        """Give back budget (a negative amount charges extra)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+    def set_rate(self, per_minute: float):
+        """Change how fast the bucket refills (capacity stays the same)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = per_minute / 60.0
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    """HTTP status carried by an API error, if any."""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is None and "overloaded" in str(error).lower():
+        # Overload reported inside a stream has no HTTP status of its own
+        status = 529
+    return status if isinstance(status, int) else None
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """Read the server's retry-after hint (seconds, milliseconds or HTTP date)."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+
+    try:
+        if headers.get("retry-after-ms"):
+            return max(0.0, float(headers["retry-after-ms"]) / 1000)
+        if headers.get("retry-after"):
+            value = headers["retry-after"]
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """True if trying the same call again later could succeed."""
+    status = _status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES or status >= 500
+    return isinstance(error, (APIConnectionError, ConnectionError, TimeoutError))
+
+
+class RateLimiter:
+    """
+    Shared gate for Claude calls: rate budgets, concurrency cap and retries.
+
+    Three ways in, one per calling style:
+    - call(request)         normal code; request() returns the response
+    - acall(request)        async code; request() returns an awaitable
+    - stream(open_stream)   streaming; open_stream() returns the SDK's
+                            stream context manager, text deltas are yielded
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+        tokens_per_minute: float = DEFAULT_TOKENS_PER_MINUTE,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base: float = DEFAULT_BACKOFF_BASE_SECONDS,
+        backoff_max: float = DEFAULT_BACKOFF_MAX_SECONDS
+    ):
+        """
+        Args:
+            requests_per_minute: Request budget
+            tokens_per_minute: Prompt-token budget
+            max_concurrency: Calls in flight at once
+            max_retries: Retries after the first attempt
+            backoff_base: First backoff step in seconds
+            backoff_max: Longest backoff step in seconds
+        """
+        self.requests_per_minute = float(requests_per_minute)
+        self.tokens_per_minute = float(tokens_per_minute)
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.max_retries = max(0, int(max_retries))
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.requests = TokenBucket(self.requests_per_minute)
+        self.tokens = TokenBucket(self.tokens_per_minute)
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+
+        # Async callers wait for a slot on these threads, not the event
+        # loop's default executor (so waiting never starves other work)
+        self._slot_waiters = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix="llm-slot-wait"
+        )
+
+        # Adaptive state: current share of the configured rate, and a
+        # "nobody calls before" time set by the server's retry-after
+        self._lock = threading.Lock()
+        self._rate_factor = 1.0
+        self._paused_until = 0.0
+
+    # ------------------------------------------------------------------
+    # Shared bookkeeping
+    # ------------------------------------------------------------------
+
+    def _admission_delay(self, estimated_tokens: int) -> float:
+        """Reserve budget for one attempt; return how long to wait first."""
+        wait = max(self.requests.reserve(1), self.tokens.reserve(max(0, estimated_tokens)))
+        with self._lock:
+            pause = self._paused_until - time.monotonic()
+        return max(wait, pause, 0.0)
+
+    def _set_rate_factor(self, factor: float):
+        """Apply a new share of the configured rate to both buckets."""
+        self._rate_factor = factor
+        self.requests.set_rate(self.requests_per_minute * factor)
+        self.tokens.set_rate(self.tokens_per_minute * factor)
+
+    def _record_success(self, response: Any, estimated_tokens: int):
+        """Recover the rate a little and settle the real prompt size."""
+        with self._lock:
+            if self._rate_factor < 1.0:
+                self._set_rate_factor(min(1.0, self._rate_factor + RATE_RECOVERY_STEP))
+
+        # The API reports the real prompt size - correct our estimate
+        input_tokens = getattr(getattr(response, "usage", None), "input_tokens", None)
+        if isinstance(input_tokens, int) and estimated_tokens:
+            self.tokens.refund(estimated_tokens - input_tokens)
+
+    def _retry_delay(self, error: Exception, attempt: int, description: str) -> float:
+        """
+        Decide what happens after a failed attempt.
+
+        Returns:
+            Seconds to wait before the next attempt
+
+        Raises:
+            LLMCallError: If the failure is permanent or retries are used up
+        """
+        status = _status_code(error)
+        retryable = is_retryable(error)
+
+        if not retryable or attempt >= self.max_retries:
+            raise LLMCallError(
+                f"{description} failed after {attempt + 1} attempt(s): {error}",
+                status_code=status,
+                attempts=attempt + 1,
+                retryable=retryable
+            ) from error
+
+        retry_after = _retry_after_seconds(error)
+        if retry_after is not None:
+            # The server told us when - wait that long (plus a little jitter)
+            delay = retry_after + random.uniform(0, self.backoff_base)
+        else:
+            # "Full jitter": anywhere between 0 and the exponential step
+            delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+        if status in THROTTLE_STATUS_CODES:
+            # Account-wide problem: slow everyone down, not just this caller
+            with self._lock:
+                self._set_rate_factor(max(MIN_RATE_FACTOR, self._rate_factor / 2))
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+
+        logger.warning(
+            "%s failed (%s), retry %d/%d in %.1fs",
+            description, status or type(error).__name__, attempt + 1, self.max_retries, delay
+        )
+        return delay
+
+    async def _acquire_slot(self):
+        """Take a concurrency slot without blocking the event loop."""
+        if self._slots.acquire(blocking=False):
+            return
+
+        # Block on the semaphore in a worker thread; the event loop is
+        # woken the moment a slot frees up (no polling)
+        waiter = asyncio.get_running_loop().run_in_executor(self._slot_waiters, self._slots.acquire)
+        try:
+            await asyncio.shield(waiter)
+        except asyncio.CancelledError:
+            # The worker still gets the slot - hand it straight back
+            waiter.add_done_callback(lambda _: self._slots.release())
+            raise
+
+    # ------------------------------------------------------------------
+    # Entry points
+    # ------------------------------------------------------------------
+
+    def call(
+        self,
+        request: Callable[[], Any],
+        estimated_tokens: int = 0,
+        description: str = "Claude call"
+    ) -> Any:
+        """
+        Run a blocking API call under the limits, retrying temporary failures.
+
+        Args:
+            request: Makes the API call and returns its response
+            estimated_tokens: Prompt size (see agents/token_estimator.py)
+            description: Name used in log and error messages
+
+        Returns:
+            Whatever request() returned
+
+        Raises:
+            LLMCallError: If the call failed for good
+        """
+        attempt = 0
+        while True:
+            delay = self._admission_delay(estimated_tokens)
+            if delay:
+                time.sleep(delay)
+
+            with self._slots:
+                try:
+                    response = request()
+                except Exception as error:
+                    delay = self._retry_delay(error, attempt, description)
+                else:
+                    self._record_success(response, estimated_tokens)
+                    return response
+
+            # Back off OUTSIDE the slot so waiting calls don't block others
+            time.sleep(delay)
+            attempt += 1
+
+    async def acall(
+        self,
+        request: Callable[[], Awaitable[Any]],
+        estimated_tokens: int = 0,
+        description: str = "Claude call"
+    ) -> Any:
+        """
+        Async version of call() - waits without blocking the event loop.
+
+        Shares the same budgets and concurrency cap as call(), so sync and
+        async callers are limited together.
+
+        Args:
+            request: Starts the API call and returns an awaitable response
+            estimated_tokens: Prompt size (see agents/token_estimator.py)
+            description: Name used in log and error messages
+
+        Returns:
+            The awaited response
+
+        Raises:
+            LLMCallError: If the call failed for good
+        """
+        attempt = 0
+        while True:
+            delay = self._admission_delay(estimated_tokens)
+            if delay:
+                await asyncio.sleep(delay)
+
+            await self._acquire_slot()
+
+            try:
+                response = await request()
+            except Exception as error:
+                delay = self._retry_delay(error, attempt, description)
+            else:
+                self._record_success(response, estimated_tokens)
+                return response
+            finally:
+                self._slots.release()
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def stream(
+        self,
+        open_stream: Callable[[], ContextManager],
+        estimated_tokens: int = 0,
+        description: str = "Claude stream"
+    ) -> Iterator[str]:
+        """
+        Stream text deltas under the limits.
+
+        A stream is only retried if it failed BEFORE its first delta -
+        once text has been handed to the caller, starting over would
+        repeat it, so a later failure is raised as an LLMCallError.
+
+        Args:
+            open_stream: Returns the SDK stream context manager
+                (e.g. lambda: client.messages.stream(...))
+            estimated_tokens: Prompt size (see agents/token_estimator.py)
+            description: Name used in log and error messages
+
+        Yields:
+            Text deltas, in order
+
+        Raises:
+            LLMCallError: If the stream failed for good
+        """
+        attempt = 0
+        while True:
+            delay = self._admission_delay(estimated_tokens)
+            if delay:
+                time.sleep(delay)
+
+            started = False
+            with self._slots:
+                try:
+                    with open_stream() as stream:
+                        for delta in stream.text_stream:
+                            started = True
+                            yield delta
+                except GeneratorExit:
+                    # The caller stopped reading early - nothing to retry
+                    raise
+                except Exception as error:
+                    if started:
+                        raise LLMCallError(
+                            f"{description} failed mid-stream: {error}",
+                            status_code=_status_code(error),
+                            attempts=attempt + 1
+                        ) from error
+                    delay = self._retry_delay(error, attempt, description)
+                else:
+                    self._record_success(None, estimated_tokens)
+                    return
+
+            time.sleep(delay)
+            attempt += 1
+
+
+# Shared limiter used by all agents (created on first use)
+_default_limiter: Optional[RateLimiter] = None
+_default_limiter_lock = threading.Lock()
+
+
+def _settings_from_env() -> Dict[str, Any]:
+    """RateLimiter() keyword arguments from the environment variables above."""
+    return {
+        "requests_per_minute": float(os.getenv("LLM_REQUESTS_PER_MINUTE", DEFAULT_REQUESTS_PER_MINUTE)),
+        "tokens_per_minute": float(os.getenv("LLM_TOKENS_PER_MINUTE", DEFAULT_TOKENS_PER_MINUTE)),
+        "max_concurrency": int(os.getenv("LLM_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)),
+        "max_retries": int(os.getenv("LLM_MAX_RETRIES", DEFAULT_MAX_RETRIES)),
+        "backoff_base": float(os.getenv("LLM_BACKOFF_BASE_SECONDS", DEFAULT_BACKOFF_BASE_SECONDS)),
+        "backoff_max": float(os.getenv("LLM_BACKOFF_MAX_SECONDS", DEFAULT_BACKOFF_MAX_SECONDS))
+    }
+
+
+def configure_rate_limiter(**settings: Any) -> RateLimiter:
+    """
+    Replace the shared limiter with one built from these settings.
+
+    Any setting left out comes from the environment (or the default).
+    Call this before the first Claude call - calls already waiting keep
+    the old limiter.
+
+    Args:
+        **settings: RateLimiter() keyword arguments
+
+    Returns:
+        The new shared RateLimiter
+    """
+    global _default_limiter
+
+    options = _settings_from_env()
+    options.update(settings)
+
+    with _default_limiter_lock:
+        _default_limiter = RateLimiter(**options)
+    return _default_limiter
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Get the limiter shared by every Claude call (created on first use).
+
+    Returns:
+        The shared RateLimiter
+    """
+    global _default_limiter
+
+    with _default_limiter_lock:
+        if _default_limiter is None:
+            _default_limiter = RateLimiter(**_settings_from_env())
+
+    return _default_limiter
@@ -0,0 +1,159 @@
+"""
+Research Dedup - Remove Duplicate Findings Across Research Sources
+
+JSTOR, interdisciplinary, historical and contrarian research often turn up
+the SAME paper. Every duplicate costs a scoring call and bloats the report
+sent to every later gatekeeper, so we merge duplicates before scoring.
+
+EXPLANATION FOR BEGINNERS:
+Two findings are duplicates when:
+1. They have the same DOI or the same URL (exact match), OR
+2. Their titles are nearly identical ("near-duplicate")
+
+For near-duplicates we use SimHash:
+- Turn each title into a 64-bit "fingerprint"
+- Similar titles get fingerprints that differ in only a few bits
+- "The Dopamine Hypothesis, Revisited" and "The dopamine hypothesis revisited."
+  end up with (almost) the same fingerprint
+- We count differing bits (the "Hamming distance"); a small number = duplicate
+
+From each group of duplicates we keep the RICHEST record (the one with the
+most filled-in fields), fill any of its empty fields from the others
+(so a DOI is never lost), and drop the rest.
+
+USAGE EXAMPLE:
+    from agents.research_dedup import deduplicate_findings
+
+    unique = deduplicate_findings(all_findings)
+"""
+
+from typing import Dict, List
+import hashlib
+import re
+
+# Fingerprints differing in this many bits (or fewer) count as the same title
+DEFAULT_MAX_DISTANCE = 3
+
+# Titles shorter than this (in words) must match exactly - SimHash is too
+# forgiving on very short strings
+MIN_WORDS_FOR_SIMHASH = 4
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase a title and strip punctuation: "The Mind, Revisited!" -> "the mind revisited"."""
+    return " ".join(re.findall(r"[a-z0-9]+", str(title or "").lower()))
+
+
+def _normalize_url(url: str) -> str:
+    """Make trivially different URLs compare equal (scheme, case, trailing slash)."""
+    url = str(url or "").strip().lower()
+    url = re.sub(r"^https?://(www\.)?", "", url)
+    return url.rstrip("/")
+
+
+def simhash(text: str) -> int:
+    """
+    Compute a 64-bit SimHash fingerprint of a (normalized) title.
+
+    Features are the title's words plus character 3-grams, so both word
+    changes and small spelling differences move only a few bits.
+    """
+    words = text.split()
+    features = words + [text[i:i + 3] for i in range(max(len(text) - 2, 0))]
+
+    weights = [0] * 64
+    for feature in features:
+        digest = int.from_bytes(hashlib.md5(feature.encode("utf-8")).digest()[:8], "big")
+        for bit in range(64):
+            weights[bit] += 1 if digest >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit in range(64):
+        if weights[bit] > 0:
+            fingerprint |= 1 << bit
+
+    return fingerprint
+
+
+def _richness(finding: Dict) -> tuple:
+    """Rank records: more non-empty fields first, then more total text."""
+    filled = [value for value in finding.values() if value not in (None, "", [], {}, 0)]
+    return (len(filled), sum(len(str(value)) for value in filled))
+
+
+def deduplicate_findings(findings: List[Dict], max_distance: int = DEFAULT_MAX_DISTANCE) -> List[Dict]:
+    """
+    Merge duplicate findings, keeping the richest record of each group.
+
+    Args:
+        findings: Findings from any mix of research sources
+        max_distance: Max differing SimHash bits for two titles to match
+
+    Returns:
+        The surviving findings, in their original order
+    """
+    count = len(findings)
+
+    # Union-find: every finding starts in its own group
+    parent = list(range(count))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(a: int, b: int):
+        parent[find(a)] = find(b)
+
+    # Pass 1: exact DOI / URL matches
+    seen: Dict[str, int] = {}
+    for i, finding in enumerate(findings):
+        doi = str(finding.get("doi") or "").strip().lower()
+        url = _normalize_url(finding.get("url", ""))
+        for key in (f"doi:{doi}" if doi else "", f"url:{url}" if url else ""):
+            if not key:
+                continue
+            if key in seen:
+                union(i, seen[key])
+            else:
+                seen[key] = i
+
+    # Pass 2: near-duplicate titles (pairwise - a topic has ~100 findings at most)
+    titles = [normalize_title(finding.get("title", "")) for finding in findings]
+    fingerprints = [
+        simhash(title) if len(title.split()) >= MIN_WORDS_FOR_SIMHASH else None
+        for title in titles
+    ]
+
+    for i in range(count):
+        if not titles[i]:
+            continue
+        for j in range(i + 1, count):
+            if not titles[j] or find(i) == find(j):
+                continue
+            if fingerprints[i] is None or fingerprints[j] is None:
+                if titles[i] == titles[j]:
+                    union(i, j)
+            elif bin(fingerprints[i] ^ fingerprints[j]).count("1") <= max_distance:
+                union(i, j)
+
+    # Keep the richest record from each group
+    best: Dict[int, int] = {}
+    for i, finding in enumerate(findings):
+        root = find(i)
+        if root not in best or _richness(finding) > _richness(findings[best[root]]):
+            best[root] = i
+
+    # Fill gaps in each kept record from its dropped duplicates
+    # (e.g. keep the DOI that only the shorter record had)
+    for i, finding in enumerate(findings):
+        winner = findings[best[find(i)]]
+        if winner is finding:
+            continue
+        for key, value in finding.items():
+            if winner.get(key) in (None, "", [], {}) and value not in (None, "", [], {}):
+                winner[key] = value
+
+    keep = set(best.values())
+    return [finding for i, finding in enumerate(findings) if i in keep]
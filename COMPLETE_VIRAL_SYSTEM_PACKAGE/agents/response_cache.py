@@ -0,0 +1,434 @@
+"""
+Response Cache - Persistent On-Disk Cache for Claude Responses
+
+This file stores Claude's answers in a small SQLite database so that the
+SAME request never has to be paid for twice.
+
+EXPLANATION FOR BEGINNERS:
+- Every request is turned into a "fingerprint" (a SHA-256 hash) built from
+  model + system prompt + user message + temperature + max_tokens
+- Same fingerprint = same request = we can reuse the stored answer
+- Answers are kept on disk, so they survive crashes and restarts
+- Old answers expire after a TTL ("time to live")
+- If the cache grows too big, the least-recently-used answers are deleted first
+
+WHY THIS MATTERS:
+Re-running a topic after a crash, or re-running with only one downstream
+stage changed, would otherwise re-pay for every upstream Claude call.
+
+CONFIGURATION (environment variables, all optional):
+- LLM_CACHE_ENABLED: "0" / "false" turns the cache off (default: on)
+- LLM_CACHE_PATH: SQLite file location (default: ./cache/llm_responses.sqlite3)
+- LLM_CACHE_TTL_HOURS: How long answers stay valid (default: 24)
+- LLM_CACHE_MAX_MB: Maximum total size of stored answers (default: 500)
+
+USAGE EXAMPLE:
+    from agents.response_cache import cached_message
+
+    text = cached_message(
+        client,
+        model="claude-sonnet-4-20250514",
+        max_tokens=4000,
+        temperature=0.7,
+        system="You are...",
+        user_message="Analyze..."
+    )
+"""
+
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from agents.rate_limiter import get_rate_limiter
+from agents.token_estimator import estimate_message_tokens, fit_max_tokens
+
+logger = logging.getLogger(__name__)
+
+# Defaults (overridable with the environment variables listed above)
+DEFAULT_CACHE_PATH = os.path.join(".", "cache", "llm_responses.sqlite3")
+DEFAULT_TTL_HOURS = 24
+DEFAULT_MAX_MB = 500
+
+
+class ResponseCache:
+    """
+    Content-addressed SQLite cache for Claude responses.
+
+    Each row holds one response, keyed by the hash of the request that
+    produced it. Reads refresh the row's "last used" time so eviction can
+    drop the least-recently-used rows first.
+
+    Safe to share between threads (all access goes through one lock).
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        ttl_seconds: float = DEFAULT_TTL_HOURS * 3600,
+        max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024
+    ):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: SQLite file location
+            ttl_seconds: How long a stored response stays valid
+            max_bytes: Maximum total size of stored responses before eviction
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        # Create the folder for the database file if needed
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # check_same_thread=False: the lock above makes cross-thread use safe
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_accessed REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_last_accessed ON responses (last_accessed)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(
+        model: str,
+        system_prompt: str,
+        user_message: str,
+        temperature: float,
+        max_tokens: int
+    ) -> str:
+        """
+        Build the content-addressed key for a request.
+
+        The parts are JSON-encoded before hashing so that, for example,
+        ("ab", "c") and ("a", "bc") can never produce the same key.
+
+        Returns:
+            Hex SHA-256 digest identifying the request
+        """
+        payload = json.dumps(
+            [model, system_prompt or "", user_message, float(temperature), int(max_tokens)],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a stored response.
+
+        Expired rows are deleted on sight and reported as a miss.
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            The stored response text, or None on a miss
+        """
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            response, created_at = row
+
+            if now - created_at > self.ttl_seconds:
+                # Too old - forget it
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+
+            # Mark as recently used (protects it from LRU eviction)
+            self._conn.execute(
+                "UPDATE responses SET last_accessed = ? WHERE key = ?",
+                (now, key)
+            )
+            self._conn.commit()
+            return response
+
+    def set(self, key: str, response: str, model: str = "") -> None:
+        """
+        Store a response, then evict old rows if the cache is over budget.
+
+        Args:
+            key: Key from make_key()
+            response: Claude's response text
+            model: Model name (stored for inspection/debugging only)
+        """
+        now = time.time()
+        size = len(response.encode("utf-8"))
+
+        with self._lock:
+            self._conn.execute(
+                """INSERT OR REPLACE INTO responses
+                   (key, model, response, size, created_at, last_accessed)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (key, model, response, size, now, now)
+            )
+            self._evict_locked(now)
+            self._conn.commit()
+
+    def _evict_locked(self, now: float) -> None:
+        """
+        Remove expired rows, then least-recently-used rows until under max_bytes.
+
+        Caller must hold self._lock.
+        """
+        # Step 1: Drop everything past its TTL
+        self._conn.execute(
+            "DELETE FROM responses WHERE created_at < ?",
+            (now - self.ttl_seconds,)
+        )
+
+        # Step 2: Drop least-recently-used rows until we fit the size budget
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_accessed ASC"
+        ).fetchall()
+
+        stale_keys = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale_keys.append((key,))
+            total -= size
+
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", stale_keys)
+
+    def clear(self) -> None:
+        """Delete every stored response."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return basic cache statistics.
+
+        Returns:
+            Dictionary with entry count, total bytes and the configured limits
+        """
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+
+        return {
+            "path": self.path,
+            "entries": count,
+            "total_bytes": total,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+
+# =================================================================
+# PROCESS-WIDE DEFAULT CACHE
+# =================================================================
+
+_default_cache: Optional[ResponseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Get the shared cache used by all agents (created on first use).
+
+    Returns:
+        The shared ResponseCache, or None if caching is disabled
+        via LLM_CACHE_ENABLED=0
+    """
+    global _default_cache
+
+    if os.getenv("LLM_CACHE_ENABLED", "1").strip().lower() in ("0", "false", "no", "off"):
+        return None
+
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache(
+                path=os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH),
+                ttl_seconds=float(os.getenv("LLM_CACHE_TTL_HOURS", DEFAULT_TTL_HOURS)) * 3600,
+                max_bytes=int(float(os.getenv("LLM_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024)
+            )
+
+    return _default_cache
+
+
+def request_kwargs(
+    model: str,
+    max_tokens: int,
+    temperature: float,
+    system: str,
+    user_message: str
+) -> Dict[str, Any]:
+    """Keyword arguments for client.messages.create() / .stream() (one user turn)."""
+    return {
+        "model": model,
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+        "system": system,
+        "messages": [
+            {
+                "role": "user",
+                "content": user_message
+            }
+        ]
+    }
+
+
+def prepare_request(
+    model: str,
+    max_tokens: int,
+    temperature: float,
+    system: str,
+    user_message: str
+) -> Tuple[int, int, Optional[str], Optional[str]]:
+    """
+    First step of every Claude call: size the prompt, then check the cache.
+
+    Shared by cached_message(), acached_message() and
+    agents/streaming.stream_message(), so all three fingerprint a request
+    the same way.
+
+    Returns:
+        (prompt_tokens, max_tokens, cache_key, cached_text):
+        - max_tokens is shrunk so the answer fits next to the prompt
+        - cache_key is None when caching is disabled
+        - cached_text is None on a miss
+    """
+    # Size the prompt locally and leave the answer room to fit next to it
+    prompt_tokens = estimate_message_tokens(system, user_message)
+    max_tokens = fit_max_tokens(prompt_tokens, max_tokens)
+    logger.debug("Claude request (%s): ~%d prompt tokens, max_tokens %d", model, prompt_tokens, max_tokens)
+
+    cache = get_response_cache()
+    if cache is None:
+        return prompt_tokens, max_tokens, None, None
+
+    key = ResponseCache.make_key(model, system, user_message, temperature, max_tokens)
+    cached = cache.get(key)
+    if cached is not None:
+        logger.debug("Claude request (%s) served from cache", model)
+    return prompt_tokens, max_tokens, key, cached
+
+
+def store_response(key: Optional[str], text: str, model: str) -> None:
+    """Save a fresh response under the key from prepare_request() (no-op when caching is off)."""
+    cache = get_response_cache()
+    if cache is not None and key is not None:
+        cache.set(key, text, model=model)
+
+
+def cached_message(
+    client: Any,
+    model: str,
+    max_tokens: int,
+    temperature: float,
+    system: str,
+    user_message: str,
+    description: Optional[str] = None
+) -> str:
+    """
+    Call client.messages.create() through the shared response cache.
+
+    This is a drop-in replacement for the usual pattern:
+
+        response = client.messages.create(model=..., system=..., messages=[...])
+        text = response.content[0].text
+
+    Args:
+        client: Anthropic client
+        model: Claude model identifier
+        max_tokens: Maximum response length
+        temperature: Response creativity (0.0-1.0)
+        system: System prompt
+        user_message: The user's request
+        description: Name used in rate limiter logs and errors
+
+    Returns:
+        Claude's response text (from cache when available)
+
+    Raises:
+        LLMCallError: If the call failed for good (see agents/rate_limiter.py)
+    """
+    prompt_tokens, max_tokens, key, cached = prepare_request(model, max_tokens, temperature, system, user_message)
+    if cached is not None:
+        return cached
+
+    # Cache miss (or cache disabled) - ask Claude through the shared
+    # rate limiter (waits for budget, retries temporary failures)
+    kwargs = request_kwargs(model, max_tokens, temperature, system, user_message)
+    response = get_rate_limiter().call(
+        lambda: client.messages.create(**kwargs),
+        estimated_tokens=prompt_tokens,
+        description=description or f"Claude request ({model})"
+    )
+    text = response.content[0].text
+
+    store_response(key, text, model)
+    return text
+
+
+async def acached_message(
+    async_client: Any,
+    model: str,
+    max_tokens: int,
+    temperature: float,
+    system: str,
+    user_message: str,
+    description: Optional[str] = None
+) -> str:
+    """
+    Async version of cached_message() - for an AsyncAnthropic client.
+
+    Same cache and same rate limiter, so sync and async callers share
+    stored answers and budgets. Waiting (for budget, a concurrency slot
+    or retry backoff) never blocks the event loop.
+
+    Args:
+        async_client: AsyncAnthropic client
+        (other arguments and result as cached_message())
+
+    Raises:
+        LLMCallError: If the call failed for good (see agents/rate_limiter.py)
+    """
+    prompt_tokens, max_tokens, key, cached = prepare_request(model, max_tokens, temperature, system, user_message)
+    if cached is not None:
+        return cached
+
+    kwargs = request_kwargs(model, max_tokens, temperature, system, user_message)
+    response = await get_rate_limiter().acall(
+        lambda: async_client.messages.create(**kwargs),
+        estimated_tokens=prompt_tokens,
+        description=description or f"Claude request ({model})"
+    )
+    text = response.content[0].text
+
+    store_response(key, text, model)
+    return text
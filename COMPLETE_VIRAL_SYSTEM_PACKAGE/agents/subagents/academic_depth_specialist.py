@@ -19,13 +19,14 @@ This subagent is called by the Research Gatekeeper and specializes in:
 from typing import Dict, List, Optional
 import sys
 import os
-import requests
-import json
 
 # Add parent directories to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from agents.base_agent import BaseAgent
+from agents.jstor_client import get_jstor_client
+from agents.academic_cache import get_academic_cache, compound_query
+from agents.academic_scoring import credibility_breakdown, score_citations, score_journal_tier
 from config.settings import settings
 
 
@@ -291,63 +292,43 @@ Remember: You are the CREDIBILITY FOUNDATION. Other subagents will make the cont
         """
         findings = []
         
-        for query in queries[:8]:  # Limit to 8 queries to manage API costs
-            self.log(f"JSTOR query: {query}", "INFO")
+        # Limit to 8 queries to manage API costs
+        queries = queries[:8]
+        self.log(f"Running {len(queries)} JSTOR queries concurrently", "INFO")
+        
+        params = {
+            "filter": "article_type:research-article",  # Research papers only
+            "sort": "relevance",
+            "access": "all"  # Include both open and restricted access
+        }
+        
+        # Shared pooled client: concurrent queries, pagination, rate limiting
+        client = get_jstor_client(self.jstor_api_key, self.jstor_base_url)
+        
+        for result in client.search_many(queries, params, max_results_per_query=5):  # Top 5 per query
+            if result["error"]:
+                self.log(f"JSTOR query '{result['query']}' failed: {result['error']}", "ERROR")
+                continue
             
-            try:
-                # JSTOR API request
-                params = {
-                    "q": query,
-                    "filter": "article_type:research-article",  # Research papers only
-                    "sort": "relevance",
-                    "limit": 10,
-                    "access": "all"  # Include both open and restricted access
+            for item in result["items"]:
+                # Extract academic metadata
+                finding = {
+                    "source": "JSTOR",
+                    "title": item.get("title", ""),
+                    "authors": item.get("authors", []),
+                    "year": item.get("publication_date", "")[:4],  # Extract year
+                    "journal": item.get("journal_name", ""),
+                    "volume": item.get("volume", ""),
+                    "issue": item.get("issue", ""),
+                    "pages": item.get("pages", ""),
+                    "doi": item.get("doi", ""),
+                    "url": item.get("url", ""),
+                    "abstract": item.get("abstract", ""),
+                    "citation_count": item.get("citation_count", 0),
+                    "query_used": result["query"],
+                    "relevance_score": item.get("relevance_score", 0.0)
                 }
-                
-                headers = {
-                    "Authorization": f"Bearer {self.jstor_api_key}",
-                    "Content-Type": "application/json"
-                }
-                
-                response = requests.get(
-                    self.jstor_base_url,
-                    params=params,
-                    headers=headers,
-                    timeout=30
-                )
-                
-                if response.status_code == 200:
-                    results = response.json()
-                    
-                    for item in results.get("items", [])[:5]:  # Top 5 per query
-                        # Extract academic metadata
-                        finding = {
-                            "source": "JSTOR",
-                            "title": item.get("title", ""),
-                            "authors": item.get("authors", []),
-                            "year": item.get("publication_date", "")[:4],  # Extract year
-                            "journal": item.get("journal_name", ""),
-                            "volume": item.get("volume", ""),
-                            "issue": item.get("issue", ""),
-                            "pages": item.get("pages", ""),
-                            "doi": item.get("doi", ""),
-                            "url": item.get("url", ""),
-                            "abstract": item.get("abstract", ""),
-                            "citation_count": item.get("citation_count", 0),
-                            "query_used": query,
-                            "relevance_score": item.get("relevance_score", 0.0)
-                        }
-                        findings.append(finding)
-                        
-                else:
-                    self.log(f"JSTOR API error: {response.status_code}", "WARNING")
-                    
-            except requests.exceptions.RequestException as e:
-                self.log(f"Network error: {str(e)}", "ERROR")
-                continue
-            except Exception as e:
-                self.log(f"Error processing results: {str(e)}", "ERROR")
-                continue
+                findings.append(finding)
         
         return findings
     
@@ -374,6 +355,15 @@ Remember: You are the CREDIBILITY FOUNDATION. Other subagents will make the cont
         """
         self.log("Using Claude academic synthesis (JSTOR unavailable)", "INFO")
         
+        # Check the academic cache first - neighbouring topics reuse the same queries
+        cache = get_academic_cache()
+        cache_query = compound_query(topic, queries)
+        if cache is not None:
+            cached = cache.get_query("claude_academic_search", cache_query)
+            if cached is not None:
+                self.log(f"Academic search loaded from cache: {len(cached)} papers", "SUCCESS")
+                return cached
+        
         prompt = f"""As an academic research specialist, find peer-reviewed papers for this topic.
 
 TOPIC: {topic}
@@ -423,6 +413,9 @@ Provide at least 15-20 high-quality academic sources."""
             finding["source"] = "Claude Academic Knowledge"
             finding["relevance_score"] = 0.85  # Default high relevance
         
+        if cache is not None and findings:
+            cache.put_query("claude_academic_search", cache_query, findings)
+        
         return findings
     
     def _assess_academic_quality(self, findings: List[Dict]) -> List[Dict]:
@@ -449,36 +442,9 @@ Provide at least 15-20 high-quality academic sources."""
             year = int(finding.get("year", 2020))
             current_year = 2025
             
-            # Score 1: Journal Tier (0-10)
-            journal_score = self._score_journal_tier(journal)
-            
-            # Score 2: Citation Impact (0-10)
-            citation_score = self._score_citations(citation_count)
-            
-            # Score 3: Recency Weight (0.5-1.0)
-            age = current_year - year
-            if age <= 2:
-                recency_weight = 1.0
-            elif age <= 5:
-                recency_weight = 0.9
-            elif age <= 10:
-                recency_weight = 0.7
-            else:
-                recency_weight = 0.5
-            
-            # Calculate overall credibility score
-            # Weighted average: journal (40%), citations (40%), recency (20%)
-            credibility_score = (
-                journal_score * 0.4 +
-                citation_score * 0.4 +
-                (recency_weight * 10) * 0.2
-            )
-            
-            # Add scores to finding
-            finding["credibility_score"] = round(credibility_score, 1)
-            finding["journal_score"] = journal_score
-            finding["citation_score"] = citation_score
-            finding["recency_weight"] = recency_weight
+            # Journal tier (40%), citation impact (40%), recency (20%)
+            # (shared with the Research Gatekeeper - see agents/academic_scoring.py)
+            finding.update(credibility_breakdown(journal, citation_count, year, current_year))
             
             # Generate APA citation
             finding["citation_apa"] = self._format_apa_citation(finding)
@@ -500,19 +466,7 @@ Provide at least 15-20 high-quality academic sources."""
         Returns:
             Quality score 0-10
         """
-        journal_lower = journal.lower()
-        
-        # Check against known journal tiers
-        if any(top in journal_lower for top in ["nature", "science", "cell"]):
-            return 10.0
-        elif any(high in journal_lower for high in ["physical review", "jama", "lancet", "pnas"]):
-            return 9.0
-        elif "journal" in journal_lower or "review" in journal_lower:
-            # Likely peer-reviewed journal
-            return 7.0
-        else:
-            # Unknown or lower-tier
-            return 6.0
+        return score_journal_tier(journal)
     
     def _score_citations(self, citation_count: int) -> float:
         """
@@ -529,14 +483,7 @@ Provide at least 15-20 high-quality academic sources."""
         Returns:
             Citation score 0-10
         """
-        if citation_count >= 1000:
-            return 10.0
-        elif citation_count >= 100:
-            return 8.0 + (min(citation_count - 100, 900) / 900) * 2  # 8-10 range
-        elif citation_count >= 10:
-            return 6.0 + (min(citation_count - 10, 90) / 90) * 2  # 6-8 range
-        else:
-            return 4.0 + (citation_count / 10) * 2  # 4-6 range
+        return score_citations(citation_count)
     
     def _format_apa_citation(self, finding: Dict) -> str:
         """
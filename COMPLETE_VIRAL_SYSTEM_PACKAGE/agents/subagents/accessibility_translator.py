@@ -17,14 +17,46 @@ This subagent is called by the Research Gatekeeper and specializes in:
 """
 
 from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+import json
 import sys
 import os
+import threading
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from agents.base_agent import BaseAgent
 from config.settings import settings
 
+# JSON shape of one translation (used by single and batched prompts)
+TRANSLATION_JSON_STRUCTURE = """{
+    "original_finding": "Brief summary of academic finding",
+    "accessible_version": "Translated version (2-3 sentences, conversational)",
+    "hook": {
+        "type": "counterintuitive_finding/surprising_scale/personal_relevance/etc",
+        "hook_text": "The opening line that grabs attention",
+        "why_engaging": "Why this hook works"
+    },
+    "analogies": [
+        {
+            "concept": "What's being explained",
+            "analogy": "What it's compared to",
+            "effectiveness": 8.5
+        }
+    ],
+    "key_quotes": [
+        "Memorable, shareable phrases"
+    ],
+    "complexity_score": 3,
+    "engagement_score": 9,
+    "viral_potential": 8,
+    "narrative_value": 9,
+    "personal_relevance": 7,
+    "visual_suggestions": [
+        "Ideas for visual representation"
+    ]
+}"""
+
 
 class AccessibilityTranslator(BaseAgent):
     """
@@ -98,6 +130,17 @@ class AccessibilityTranslator(BaseAgent):
             "future_impact"  # "This could change how we..."
         ]
         
+        # Translation modes (override per run with assignment["translation_mode"])
+        # - "serial": one prompt per finding, one at a time (default)
+        # - "batch": several findings per prompt, Claude returns a JSON array
+        # - "concurrent": one prompt per finding, several prompts in flight at once
+        self.translation_mode = os.getenv("TRANSLATION_MODE", "serial")
+        self.translation_batch_size = int(os.getenv("TRANSLATION_BATCH_SIZE", 5))
+        
+        # Caps translations in flight across ALL runs sharing this translator
+        self.translation_concurrency = int(os.getenv("TRANSLATION_MAX_CONCURRENCY", 4))
+        self._translation_slots = threading.BoundedSemaphore(self.translation_concurrency)
+        
         self.log("Accessibility Translator initialized", "SUCCESS")
     
     def _get_system_prompt(self) -> str:
@@ -279,11 +322,17 @@ Remember: You're the bridge between academic credibility (which another subagent
         
         self.log(f"Translating {len(academic_findings)} findings for {target_audience}", "INFO")
         
-        # Translate each finding
-        translations = []
-        for finding in academic_findings:
-            translation = self._translate_finding(finding, target_audience, engagement_threshold)
-            translations.append(translation)
+        # Translate all findings (results always come back in input order)
+        mode = assignment.get("translation_mode", self.translation_mode)
+        if mode == "batch":
+            translations = self._translate_batched(academic_findings, target_audience, engagement_threshold)
+        elif mode == "concurrent":
+            translations = self._translate_concurrently(academic_findings, target_audience, engagement_threshold)
+        else:
+            translations = [
+                self._translate_finding(finding, target_audience, engagement_threshold)
+                for finding in academic_findings
+            ]
         
         self.log(f"Translation complete: {len(translations)} findings translated", "SUCCESS")
         
@@ -329,17 +378,8 @@ Remember: You're the bridge between academic credibility (which another subagent
         Returns:
             Translated finding with engagement scores
         """
-        # Extract key info from academic finding
-        title = finding.get("title", "")
-        abstract = finding.get("abstract", "")
-        key_findings = finding.get("key_findings", [])
-        
-        # Combine into context for Claude
-        academic_content = f"""
-Title: {title}
-Abstract: {abstract}
-Key Findings: {', '.join(key_findings) if key_findings else 'Not specified'}
-"""
+        # Combine key info from the academic finding into context for Claude
+        academic_content = self._format_academic_content(finding)
         
         prompt = f"""Translate this academic finding into accessible, engaging content.
 
@@ -356,33 +396,7 @@ Create a translation that:
 5. Maintains complete accuracy
 
 Return as JSON with this structure:
-{{
-    "original_finding": "Brief summary of academic finding",
-    "accessible_version": "Translated version (2-3 sentences, conversational)",
-    "hook": {{
-        "type": "counterintuitive_finding/surprising_scale/personal_relevance/etc",
-        "hook_text": "The opening line that grabs attention",
-        "why_engaging": "Why this hook works"
-    }},
-    "analogies": [
-        {{
-            "concept": "What's being explained",
-            "analogy": "What it's compared to",
-            "effectiveness": 8.5
-        }}
-    ],
-    "key_quotes": [
-        "Memorable, shareable phrases"
-    ],
-    "complexity_score": 3,
-    "engagement_score": 9,
-    "viral_potential": 8,
-    "narrative_value": 9,
-    "personal_relevance": 7,
-    "visual_suggestions": [
-        "Ideas for visual representation"
-    ]
-}}
+{TRANSLATION_JSON_STRUCTURE}
 
 Focus on creating WOW moments while maintaining accuracy!"""
 
@@ -390,14 +404,147 @@ Focus on creating WOW moments while maintaining accuracy!"""
         translation = self.extract_json(response)
         
         # Add original finding reference
+        return self._attach_source(translation, finding)
+    
+    def _format_academic_content(self, finding: Dict) -> str:
+        """Format the key info from an academic finding as prompt context."""
+        key_findings = finding.get("key_findings", [])
+        
+        return f"""
+Title: {finding.get("title", "")}
+Abstract: {finding.get("abstract", "")}
+Key Findings: {', '.join(key_findings) if key_findings else 'Not specified'}
+"""
+    
+    def _attach_source(self, translation: Dict, finding: Dict) -> Dict:
+        """Add the original finding reference to a translation."""
         translation["source_finding"] = {
-            "title": title,
+            "title": finding.get("title", ""),
             "authors": finding.get("authors", []),
             "journal": finding.get("journal", "")
         }
-        
         return translation
     
+    def _translate_concurrently(self, findings: List[Dict], target_audience: str, engagement_threshold: float) -> List[Dict]:
+        """
+        Translate findings one per prompt, several prompts at a time.
+        
+        At most self.translation_concurrency translations are in flight
+        (enforced by a semaphore shared by every run on this translator).
+        A finding whose translation fails is retried once on its own.
+        
+        Args:
+            findings: Academic findings to translate
+            target_audience: Target audience description
+            engagement_threshold: Minimum engagement score
+        
+        Returns:
+            Translations in the same order as findings
+        """
+        def translate(finding: Dict) -> Optional[Dict]:
+            with self._translation_slots:
+                try:
+                    return self._translate_finding(finding, target_audience, engagement_threshold)
+                except Exception as e:
+                    self.log(f"Translation failed for '{finding.get('title', '')}', will retry: {e}", "WARNING")
+                    return None
+        
+        with ThreadPoolExecutor(max_workers=self.translation_concurrency) as executor:
+            translations = list(executor.map(translate, findings))
+        
+        # Individual retry for anything that failed
+        return [
+            translation if translation is not None
+            else self._translate_finding(finding, target_audience, engagement_threshold)
+            for finding, translation in zip(findings, translations)
+        ]
+    
+    def _translate_batched(self, findings: List[Dict], target_audience: str, engagement_threshold: float) -> List[Dict]:
+        """
+        Translate findings several per prompt.
+        
+        Findings go to Claude in chunks of self.translation_batch_size; each
+        chunk returns a JSON array with one translation per finding. Any
+        finding missing from the array (or the whole chunk, if the response
+        fails to parse) is retried individually with _translate_finding().
+        
+        Args:
+            findings: Academic findings to translate
+            target_audience: Target audience description
+            engagement_threshold: Minimum engagement score
+        
+        Returns:
+            Translations in the same order as findings
+        """
+        translations = []
+        batch_size = max(1, self.translation_batch_size)
+        
+        for start in range(0, len(findings), batch_size):
+            chunk = findings[start:start + batch_size]
+            
+            try:
+                parsed = self._translate_chunk(chunk, target_audience)
+            except Exception as e:
+                self.log(f"Batch translation failed, translating {len(chunk)} findings individually: {e}", "WARNING")
+                parsed = [None] * len(chunk)
+            
+            for finding, translation in zip(chunk, parsed):
+                if translation is None:
+                    translation = self._translate_finding(finding, target_audience, engagement_threshold)
+                else:
+                    translation = self._attach_source(translation, finding)
+                translations.append(translation)
+        
+        return translations
+    
+    def _translate_chunk(self, chunk: List[Dict], target_audience: str) -> List[Optional[Dict]]:
+        """
+        Translate a chunk of findings in ONE Claude call.
+        
+        Args:
+            chunk: Academic findings to translate
+            target_audience: Target audience description
+        
+        Returns:
+            One translation per finding (None where Claude's answer was unusable)
+        """
+        numbered_findings = "\n".join(
+            f"FINDING {i}:{self._format_academic_content(finding)}"
+            for i, finding in enumerate(chunk)
+        )
+        
+        prompt = f"""Translate each of these {len(chunk)} academic findings into accessible, engaging content.
+
+ACADEMIC FINDINGS:
+{numbered_findings}
+
+TARGET AUDIENCE: {target_audience}
+
+For EACH finding, create a translation that:
+1. Makes the finding understandable to the target audience
+2. Identifies the most engaging hook
+3. Creates 2-3 effective analogies
+4. Generates memorable quotes
+5. Maintains complete accuracy
+
+Return ONLY a JSON array with exactly one object per finding, in the same order.
+Each object has an "index" field (the FINDING number) plus this structure:
+{TRANSLATION_JSON_STRUCTURE}
+
+Focus on creating WOW moments while maintaining accuracy!"""
+
+        response = self.invoke_llm(prompt, use_json=True)
+        
+        results: List[Optional[Dict]] = [None] * len(chunk)
+        for position, item in enumerate(self.extract_json_array(response)):
+            if not isinstance(item, dict) or not item.get("accessible_version"):
+                continue
+            index = item.pop("index", position)
+            if isinstance(index, int) and 0 <= index < len(chunk):
+                results[index] = item
+        
+        return results
+    
     def _calculate_confidence(self, translations: List[Dict], total_findings: int) -> float:
         """
         Calculate confidence in translation quality.
@@ -14,8 +14,25 @@ Created: 2024
 """
 
 import os
+import sys
 from typing import Dict, List, Any, Optional
 
+# Add parent directories to path so shared agent modules can be imported
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from agents.bm25_index import get_collection_index, reciprocal_rank_fusion, update_collection_index
+from agents.context_packer import pack_research
+from agents.embeddings import chroma_embedding_kwargs
+from agents.query_cache import bump_collection_version, get_query_cache
+
+# How much research (in tokens) is added to the search query
+RESEARCH_TOKEN_BUDGET = 125
+
+# Hybrid retrieval: how many techniques go into the context, and how many
+# candidates each search (vector and keyword) contributes to the fusion
+RETRIEVAL_N_RESULTS = int(os.getenv("RETRIEVAL_N_RESULTS", 5))
+RETRIEVAL_CANDIDATES = int(os.getenv("RETRIEVAL_CANDIDATES", 20))
+
 # ChromaDB imports - vector database for semantic search
 try:
     import chromadb
@@ -80,9 +97,12 @@ class ContextRetrievalAgent:
             # Get or create the viral techniques collection
             # A collection is like a table in a traditional database
             # It stores documents with their embeddings for semantic search
+            # Embeddings come from the shared, cached embedder
+            # (agents/embeddings.py) - repeated queries are not re-encoded
             self.collection = self.client.get_or_create_collection(
                 name="viral_techniques",
-                metadata={"description": "Library of analyzed viral content techniques"}
+                metadata={"description": "Library of analyzed viral content techniques"},
+                **chroma_embedding_kwargs()
             )
             
             print(f"✅ Context Retrieval Agent: Connected to database")
@@ -95,7 +115,10 @@ class ContextRetrievalAgent:
             self.client = None
             self.collection = None
     
-    def search_techniques(self, query: str, n_results: int = 5) -> Dict[str, Any]:
+    def search_techniques(self,
+                          query: str,
+                          n_results: int = 5,
+                          where: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         SEARCH TECHNIQUES - Semantic search for relevant viral techniques
         
@@ -108,12 +131,17 @@ class ContextRetrievalAgent:
         3. Returns the most semantically similar techniques
         4. Similarity is measured by cosine distance in embedding space
         
+        Repeated searches are answered from an in-memory cache
+        (agents/query_cache.py) until the collection is written to.
+        
         Parameters:
         -----------
         query : str
             Search query (topic, theme, or concept)
         n_results : int
             Number of results to return (default: 5)
+        where : Dict[str, Any], optional
+            Metadata filter, e.g. {"category": "hook"}
         
         Returns:
         --------
@@ -129,16 +157,26 @@ class ContextRetrievalAgent:
             }
         
         try:
-            # Perform semantic search
-            # ChromaDB automatically:
-            # 1. Converts query to embedding
-            # 2. Compares to all stored embeddings
-            # 3. Returns most similar documents
-            results = self.collection.query(
-                query_texts=[query],  # Can search multiple queries at once
-                n_results=n_results,  # How many results to return
-                include=["documents", "metadatas", "distances"]  # What to include
-            )
+            # Same search since the last write? Reuse its results
+            cache = get_query_cache()
+            results = cache.get(self.collection, query, n_results, where) if cache else None
+            
+            if results is None:
+                # Perform semantic search
+                # ChromaDB automatically:
+                # 1. Converts query to embedding
+                # 2. Compares to all stored embeddings
+                # 3. Returns most similar documents
+                query_options = {"where": where} if where else {}
+                results = self.collection.query(
+                    query_texts=[query],  # Can search multiple queries at once
+                    n_results=n_results,  # How many results to return
+                    include=["documents", "metadatas", "distances"],  # What to include
+                    **query_options
+                )
+                
+                if cache:
+                    cache.put(self.collection, query, n_results, where, results)
             
             # Format results for easy use
             formatted_results = []
@@ -148,6 +186,7 @@ class ContextRetrievalAgent:
             if results["documents"] and len(results["documents"][0]) > 0:
                 for i in range(len(results["documents"][0])):
                     formatted_results.append({
+                        "id": results["ids"][0][i] if results.get("ids") else None,
                         "technique": results["documents"][0][i],
                         "metadata": results["metadatas"][0][i] if results["metadatas"] else {},
                         "similarity": 1.0 - results["distances"][0][i] if results["distances"] else 0.0  # Convert distance to similarity
@@ -166,6 +205,90 @@ class ContextRetrievalAgent:
                 "count": 0
             }
     
+    def hybrid_search(self,
+                      query: str,
+                      n_results: int = RETRIEVAL_N_RESULTS,
+                      where: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        HYBRID SEARCH - Meaning search + keyword search, fused into one ranking
+        
+        Embedding similarity alone often misses exact technique names
+        ("Open Loop", "Contrarian Hook"). This runs BOTH searches and merges
+        them with reciprocal rank fusion (see agents/bm25_index.py):
+        
+        HOW IT WORKS:
+        1. Vector search (search_techniques) returns its top candidates
+        2. BM25 keyword search over the same collection returns its top
+           candidates (the keyword index stays in sync with the collection)
+        3. Each technique gets 1 / (60 + rank) points from each list
+        4. The n_results best-scoring techniques are returned
+        
+        Because the techniques that matter now rank well even when only one
+        of the two searches finds them, fewer results are needed.
+        
+        Parameters:
+        -----------
+        query : str
+            Search query (topic, theme, or concept)
+        n_results : int
+            Number of results to return (default: RETRIEVAL_N_RESULTS)
+        where : Dict[str, Any], optional
+            Metadata filter, e.g. {"category": "hook"}
+        
+        Returns:
+        --------
+        Dict[str, Any]
+            Same shape as search_techniques(). Each result also has
+            "match" ("vector", "keyword" or "both") and "fusion_score";
+            keyword-only results have "similarity": None
+        """
+        
+        candidates = max(n_results, RETRIEVAL_CANDIDATES)
+        vector_results = self.search_techniques(query, n_results=candidates, where=where)
+        
+        if vector_results.get("error"):
+            return vector_results
+        
+        try:
+            keyword_ids = [doc_id for doc_id, _ in get_collection_index(self.collection).search(query, candidates)]
+        except Exception as e:
+            # Keyword search is an extra - fall back to vector results alone
+            print(f"⚠️  Keyword search unavailable: {str(e)}")
+            vector_results["results"] = vector_results["results"][:n_results]
+            vector_results["count"] = len(vector_results["results"])
+            return vector_results
+        
+        by_id = {result["id"]: result for result in vector_results["results"]}
+        vector_ids = list(by_id)
+        
+        # Keyword hits the vector search didn't return: fetch their text.
+        # The filter is applied HERE, before fusion, so a hit that "where"
+        # rules out can't take one of the n_results places
+        missing = [doc_id for doc_id in keyword_ids if doc_id not in by_id]
+        if missing:
+            get_options = {"where": where} if where else {}
+            fetched = self.collection.get(ids=missing, include=["documents", "metadatas"], **get_options)
+            for doc_id, document, metadata in zip(
+                fetched.get("ids") or [], fetched.get("documents") or [], fetched.get("metadatas") or []
+            ):
+                by_id[doc_id] = {"id": doc_id, "technique": document, "metadata": metadata or {}, "similarity": None}
+        keyword_ids = [doc_id for doc_id in keyword_ids if doc_id in by_id]
+        
+        keyword_set = set(keyword_ids)
+        formatted_results = []
+        for doc_id, score in reciprocal_rank_fusion([vector_ids, keyword_ids])[:n_results]:
+            result = dict(by_id[doc_id])
+            in_vector = doc_id in vector_ids
+            result["match"] = "both" if in_vector and doc_id in keyword_set else ("vector" if in_vector else "keyword")
+            result["fusion_score"] = score
+            formatted_results.append(result)
+        
+        return {
+            "query": query,
+            "results": formatted_results,
+            "count": len(formatted_results)
+        }
+    
     def retrieve_context(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """
         MAIN RETRIEVAL METHOD - Get relevant context for current documentary
@@ -197,7 +320,7 @@ class ContextRetrievalAgent:
         
         # Extract search parameters from state
         topic = state.get("topic", "")
-        research = state.get("research_findings", "")[:500]  # First 500 chars
+        research = pack_research(state.get("research_findings"), RESEARCH_TOKEN_BUDGET, "")  # Top findings only
         audience = state.get("target_audience", "")
         
         # Build comprehensive search query
@@ -211,8 +334,8 @@ class ContextRetrievalAgent:
         if audience:
             search_query += f" targeting {audience}"
         
-        # Search for relevant techniques
-        search_results = self.search_techniques(search_query, n_results=8)
+        # Search for relevant techniques (meaning + exact keyword matches)
+        search_results = self.hybrid_search(search_query)
         
         if search_results.get("error"):
             print(f"❌ Search error: {search_results['error']}")
@@ -226,8 +349,10 @@ class ContextRetrievalAgent:
             context_text = "RELEVANT VIRAL TECHNIQUES FROM DATABASE:\n\n"
             
             for i, result in enumerate(search_results["results"], 1):
-                similarity_pct = result["similarity"] * 100
-                context_text += f"{i}. (Similarity: {similarity_pct:.1f}%)\n"
+                if result["similarity"] is None:
+                    context_text += f"{i}. (Keyword match)\n"
+                else:
+                    context_text += f"{i}. (Similarity: {result['similarity'] * 100:.1f}%)\n"
                 context_text += f"{result['technique']}\n"
                 
                 # Add metadata if available
@@ -242,8 +367,9 @@ class ContextRetrievalAgent:
             state["retrieval_success"] = True
             state["retrieval_results"] = search_results["results"]  # Raw results for further processing
             
-            # Calculate average similarity
-            avg_similarity = sum(r["similarity"] for r in search_results["results"]) / len(search_results["results"])
+            # Calculate average similarity (keyword-only matches have none)
+            similarities = [r["similarity"] for r in search_results["results"] if r["similarity"] is not None]
+            avg_similarity = sum(similarities) / len(similarities) if similarities else 0.0
             state["retrieval_avg_similarity"] = avg_similarity
             
             print(f"✅ Context Retrieval Agent: Found {search_results['count']} relevant techniques")
@@ -287,14 +413,19 @@ class ContextRetrievalAgent:
             return False
         
         try:
-            # Add to collection
-            # ChromaDB automatically generates embeddings
-            self.collection.add(
+            # Add to collection (upsert: re-adding the same ID updates it
+            # instead of failing). ChromaDB automatically generates embeddings
+            self.collection.upsert(
                 documents=[technique_text],
                 ids=[technique_id],
                 metadatas=[metadata] if metadata else None
             )
             
+            # Cached search results no longer reflect the collection;
+            # the keyword index only re-indexes this technique
+            version = bump_collection_version(self.collection)
+            update_collection_index(self.collection, version, {technique_id: technique_text})
+            
             print(f"✅ Added technique: {technique_id}")
             return True
             
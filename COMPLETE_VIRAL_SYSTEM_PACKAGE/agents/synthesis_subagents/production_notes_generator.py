@@ -12,10 +12,21 @@ Author: Advanced Multi-Agent System
 Created: 2024
 """
 
-import anthropic
 import os
+import sys
 from typing import Dict, List, Any
 
+# Add parent directories to path so shared agent modules can be imported
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from agents.client_registry import get_client
+from agents.response_cache import cached_message
+from agents.context_packer import pack_research
+from agents.token_estimator import truncate_to_tokens
+
+# How much research (in tokens) goes into the exported citations file
+EXPORT_RESEARCH_TOKEN_BUDGET = 1250
+
 class ProductionNotesGenerator:
     """
     PRODUCTION NOTES GENERATOR - Production Management Specialist
@@ -48,7 +59,8 @@ class ProductionNotesGenerator:
             )
         
         # Initialize client
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        # (shared by every agent - see agents/client_registry.py)
+        self.client = get_client(self.api_key)
         
         # Model
         self.model = "claude-sonnet-4-20250514"
@@ -125,8 +137,8 @@ Create detailed production notes that ensure smooth execution from filming to de
         print("\n📋 Production Notes Generator: Creating production documentation...")
         
         # Extract information
-        script = state.get("documentary_script", "No script")[:3000]
-        visuals = state.get("visual_architecture", "No visuals")[:3000]
+        script = truncate_to_tokens(state.get("documentary_script", "No script"), 750)
+        visuals = truncate_to_tokens(state.get("visual_architecture", "No visuals"), 750)
         topic = state.get("topic", "Unknown")
         duration = state.get("duration_minutes", 30)
         
@@ -324,72 +336,17 @@ Provide actionable, specific production guidance."""
         
         try:
             # Generate production notes
-            response = self.client.messages.create(
+            production_notes = cached_message(
+                self.client,
                 model=self.model,
                 max_tokens=6000,
                 temperature=0.6,  # More structured, less creative
                 system=self.agent_role,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": notes_prompt
-                    }
-                ]
+                user_message=notes_prompt
             )
             
-            # Extract notes
-            production_notes = response.content[0].text
-            
-            # Count elements
-            music_cues = production_notes.upper().count("MUSIC CUE") or production_notes.count("CUE:")
-            graphics_count = production_notes.upper().count("GRAPHIC") + production_notes.upper().count("ANIMATION")
-            sfx_count = production_notes.upper().count("SFX") or production_notes.upper().count("SOUND EFFECT")
-            
-            # Check for completeness
-            has_budget = "$" in production_notes or "BUDGET" in production_notes.upper()
-            has_timeline = "TIMELINE" in production_notes.upper() or "DAYS" in production_notes.upper()
-            has_equipment = "EQUIPMENT" in production_notes.upper() or "GEAR" in production_notes.upper()
-            has_technical = "RESOLUTION" in production_notes.upper() or "TECHNICAL" in production_notes.upper()
-            
-            # Calculate completeness score
-            completeness_score = 0.0
-            
-            if music_cues >= 5:
-                completeness_score += 2.5
-            elif music_cues > 0:
-                completeness_score += 1.0
-            
-            if graphics_count >= 5:
-                completeness_score += 2.0
-            elif graphics_count > 0:
-                completeness_score += 1.0
-            
-            if has_budget:
-                completeness_score += 1.5
-            if has_timeline:
-                completeness_score += 1.5
-            if has_equipment:
-                completeness_score += 1.5
-            if has_technical:
-                completeness_score += 1.0
-            
-            completeness_score = min(10.0, completeness_score)
-            
-            # Add to state
-            state["production_notes"] = production_notes
-            state["music_cue_count"] = music_cues
-            state["graphics_requirement_count"] = graphics_count
-            state["sfx_count"] = sfx_count
-            state["production_completeness_score"] = completeness_score
-            state["has_budget_estimate"] = has_budget
-            state["has_production_timeline"] = has_timeline
-            
-            # Success
-            print(f"✅ Production Notes Generator: Documentation created")
-            print(f"   Music Cues: {music_cues}")
-            print(f"   Graphics: {graphics_count}")
-            print(f"   SFX: {sfx_count}")
-            print(f"   Completeness: {completeness_score:.1f}/10")
+            # Score the notes and record them in state
+            self.record_production_notes(state, production_notes)
             
             return state
             
@@ -401,6 +358,210 @@ Provide actionable, specific production guidance."""
             
             return state
     
+    def generate_section_notes(self, section: Dict[str, Any], section_visuals: str, context: Dict[str, Any]) -> str:
+        """
+        SECTION NOTES - Music, sound and graphics cues for ONE script section
+        
+        Used by the pipelined synthesis mode, right after the section's
+        visual direction is ready.
+        
+        Parameters:
+        -----------
+        section : Dict[str, Any]
+            Finished script section: {"index", "title", "text"}
+        section_visuals : str
+            Visual direction for the same section
+        context : Dict[str, Any]
+            Shared state: topic, duration_minutes
+        
+        Returns:
+        --------
+        str
+            Production cues for this section
+        """
+        
+        topic = context.get("topic", "Unknown")
+        duration = context.get("duration_minutes", 30)
+        
+        section_prompt = f"""GENERATE PRODUCTION CUES FOR ONE SCRIPT SECTION
+
+PROJECT:
+Topic: {topic}
+Duration: {duration} minutes
+
+SCRIPT SECTION ({section["title"]}):
+{truncate_to_tokens(section["text"], 500)}
+
+VISUAL DIRECTION FOR THIS SECTION:
+{truncate_to_tokens(section_visuals, 500)}
+
+YOUR TASK:
+Write production cues for THIS SECTION ONLY, in this format:
+
+{section["title"]}
+MUSIC CUE: [Descriptive name]
+MOOD/STYLE: [Specific description]
+TEMPO: [BPM range or Fast/Medium/Slow]
+INSTRUMENTATION: [What instruments/sounds]
+INTENSITY: [1-10]
+PURPOSE: [What this music accomplishes]
+LICENSING NOTES: [Royalty-free/Licensed/Original]
+
+SOUND EFFECTS:
+[Timecode]: [Specific SFX] - [Purpose]
+
+GRAPHICS:
+[Timecode]: [Lower third / data visualization / animation / text overlay] - [Style notes]
+
+AUDIO TRANSITIONS:
+- [Where and why]"""
+        
+        return cached_message(
+            self.client,
+            model=self.model,
+            max_tokens=1200,  # One section only
+            temperature=0.6,  # More structured, less creative
+            system=self.agent_role,
+            user_message=section_prompt
+        )
+    
+    def generate_project_notes(self, context: Dict[str, Any]) -> str:
+        """
+        PROJECT NOTES - The parts of the production notes that cover the whole film
+        
+        Technical specs, equipment, timeline, budget, post-production
+        workflow, quality checkpoints and distribution don't depend on any
+        single section, so the pipelined synthesis mode requests them once,
+        in parallel with the script itself.
+        
+        Parameters:
+        -----------
+        context : Dict[str, Any]
+            Shared state: topic, duration_minutes
+        
+        Returns:
+        --------
+        str
+            Project-wide production notes
+        """
+        
+        topic = context.get("topic", "Unknown")
+        duration = context.get("duration_minutes", 30)
+        
+        project_prompt = f"""GENERATE PROJECT-WIDE PRODUCTION NOTES
+
+PROJECT:
+Topic: {topic}
+Duration: {duration} minutes
+
+(Per-section music, sound and graphics cues are written separately.)
+
+YOUR TASK:
+Create these production notes for the whole documentary:
+
+1. GRAPHIC STYLE GUIDE
+- Font family, color scheme, animation style, consistency notes
+
+2. TECHNICAL SPECIFICATIONS
+- VIDEO: resolution, frame rate, aspect ratio, color space, codec
+- AUDIO: sample rate, bit depth, channels, format
+- DELIVERY: export format, file size target, platform optimization
+
+3. EQUIPMENT LIST
+- Camera gear, audio gear, post-production tools
+
+4. PRODUCTION TIMELINE
+- Pre-production, production and post-production tasks in days
+- TOTAL TIMELINE: [Weeks]
+
+5. BUDGET ESTIMATES
+- Rough indie-production costs per phase, total, cost-saving tips
+
+6. POST-PRODUCTION WORKFLOW
+- Editing phases, color grading, sound mix levels (dB)
+
+7. QUALITY CHECKPOINTS
+
+8. DISTRIBUTION PREP
+- YouTube title, description, tags, thumbnail; other platforms
+
+Provide actionable, specific production guidance."""
+        
+        return cached_message(
+            self.client,
+            model=self.model,
+            max_tokens=3500,
+            temperature=0.6,  # More structured, less creative
+            system=self.agent_role,
+            user_message=project_prompt
+        )
+    
+    def record_production_notes(self, state: Dict[str, Any], production_notes: str):
+        """
+        SCORE AND STORE - Put finished production notes into state
+        
+        Shared by generate_production_notes() and the pipelined synthesis
+        mode (which stitches the notes together section by section).
+        
+        Parameters:
+        -----------
+        state : Dict[str, Any]
+            State to update (in place)
+        production_notes : str
+            Complete production notes document
+        """
+        
+        # Count elements
+        music_cues = production_notes.upper().count("MUSIC CUE") or production_notes.count("CUE:")
+        graphics_count = production_notes.upper().count("GRAPHIC") + production_notes.upper().count("ANIMATION")
+        sfx_count = production_notes.upper().count("SFX") or production_notes.upper().count("SOUND EFFECT")
+        
+        # Check for completeness
+        has_budget = "$" in production_notes or "BUDGET" in production_notes.upper()
+        has_timeline = "TIMELINE" in production_notes.upper() or "DAYS" in production_notes.upper()
+        has_equipment = "EQUIPMENT" in production_notes.upper() or "GEAR" in production_notes.upper()
+        has_technical = "RESOLUTION" in production_notes.upper() or "TECHNICAL" in production_notes.upper()
+        
+        # Calculate completeness score
+        completeness_score = 0.0
+        
+        if music_cues >= 5:
+            completeness_score += 2.5
+        elif music_cues > 0:
+            completeness_score += 1.0
+        
+        if graphics_count >= 5:
+            completeness_score += 2.0
+        elif graphics_count > 0:
+            completeness_score += 1.0
+        
+        if has_budget:
+            completeness_score += 1.5
+        if has_timeline:
+            completeness_score += 1.5
+        if has_equipment:
+            completeness_score += 1.5
+        if has_technical:
+            completeness_score += 1.0
+        
+        completeness_score = min(10.0, completeness_score)
+        
+        # Add to state
+        state["production_notes"] = production_notes
+        state["music_cue_count"] = music_cues
+        state["graphics_requirement_count"] = graphics_count
+        state["sfx_count"] = sfx_count
+        state["production_completeness_score"] = completeness_score
+        state["has_budget_estimate"] = has_budget
+        state["has_production_timeline"] = has_timeline
+        
+        # Success
+        print(f"✅ Production Notes Generator: Documentation created")
+        print(f"   Music Cues: {music_cues}")
+        print(f"   Graphics: {graphics_count}")
+        print(f"   SFX: {sfx_count}")
+        print(f"   Completeness: {completeness_score:.1f}/10")
+    
     def export_production_package(self, state: Dict[str, Any], output_dir: str = "/home/claude/production_package") -> Dict[str, str]:
         """
         EXPORT PRODUCTION PACKAGE - Save all production files
@@ -461,7 +622,7 @@ Provide actionable, specific production guidance."""
             with open(research_path, 'w') as f:
                 f.write(f"RESEARCH CITATIONS\n")
                 f.write(f"=" * 70 + "\n\n")
-                f.write(state["research_findings"][:5000])  # First 5000 chars
+                f.write(pack_research(state["research_findings"], EXPORT_RESEARCH_TOKEN_BUDGET))  # Best findings first
             files_created["research"] = research_path
         
         # Create README
@@ -12,10 +12,43 @@ Author: Advanced Multi-Agent System
 Created: 2024
 """
 
-import anthropic
 import os
+import re
+import sys
 from typing import Dict, List, Any
 
+# Add parent directories to path so shared agent modules can be imported
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from agents.client_registry import get_client
+from agents.response_cache import cached_message
+from agents.context_packer import pack_research
+from agents.token_estimator import truncate_to_tokens
+from agents.section_extractor import DocumentSpec, SectionRule, extract
+
+# How much research (in tokens) goes into the strategy prompt
+RESEARCH_TOKEN_BUDGET = 500
+
+# Layout of an engagement strategy - parsed ONCE per strategy text
+# (see agents/section_extractor.py)
+ENGAGEMENT_STRATEGY_SPEC = DocumentSpec(
+    "engagement_strategy",
+    sections={
+        # "CHECKPOINT 1: 2:30" ... until the next checkpoint
+        "checkpoint": SectionRule(header=re.compile(r"(?i)CHECKPOINT")),
+        # "[MINUTES 0-2: Opening & Hook]" with a "PACING: Fast" line (only
+        # the bracketed form - not "MINUTE-BY-MINUTE" or "every minute")
+        "segment": SectionRule(
+            header=re.compile(r"(?i)^\s*\[MINUTES?\s+\d"),
+            fields={"pacing": re.compile(r"(?i)PACING:(.*)")}
+        ),
+    },
+    values={
+        # The number right before the first "%" on any line mentioning retention
+        "retention_pct": re.compile(r"(?i)^(?=.*retention)[^%\n]*?(\d+(?:\.\d+)?)\s*%")
+    }
+)
+
 class EngagementOptimizer:
     """
     ENGAGEMENT OPTIMIZER - Watch Time & Retention Specialist
@@ -51,7 +84,8 @@ class EngagementOptimizer:
             )
         
         # Initialize Anthropic client
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        # (shared by every agent - see agents/client_registry.py)
+        self.client = get_client(self.api_key)
         
         # Use the most capable model
         self.model = "claude-sonnet-4-20250514"
@@ -127,9 +161,9 @@ You provide minute-by-minute engagement strategies with specific techniques."""
         # Extract state information
         topic = state.get("topic", "Unknown")
         duration = state.get("duration_minutes", 30)
-        research = state.get("research_findings", "No research")[:2000]
-        patterns = state.get("viral_patterns", "No patterns")[:1500]
-        hooks = state.get("viral_hooks", "No hooks")[:1500]
+        research = pack_research(state.get("research_findings"), RESEARCH_TOKEN_BUDGET, "No research")
+        patterns = truncate_to_tokens(state.get("viral_patterns", "No patterns"), 375)
+        hooks = truncate_to_tokens(state.get("viral_hooks", "No hooks"), 375)
         audience = state.get("target_audience", "General")
         
         # Build the optimization prompt
@@ -213,36 +247,23 @@ Provide actionable, timestamp-specific strategies."""
         
         try:
             # Call Claude for optimization strategy
-            response = self.client.messages.create(
+            strategy = cached_message(
+                self.client,
                 model=self.model,
                 max_tokens=5000,  # Long response for detailed breakdown
                 temperature=0.7,  # Balanced creativity
                 system=self.agent_role,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": optimization_prompt
-                    }
-                ]
+                user_message=optimization_prompt
             )
             
-            # Extract the strategy
-            strategy = response.content[0].text
+            # Parse key metrics (one pass, shared with the accessor methods)
+            index = extract(strategy, ENGAGEMENT_STRATEGY_SPEC)
             
-            # Parse key metrics if present
-            # Look for predicted retention percentage
-            predicted_retention = 0.0
-            if "%" in strategy:
-                # Try to find retention prediction
-                for line in strategy.split("\n"):
-                    if "retention" in line.lower() and "%" in line:
-                        try:
-                            # Extract percentage
-                            pct = float(''.join(filter(lambda x: x.isdigit() or x == '.', 
-                                                      line.split("%")[0].split()[-1])))
-                            predicted_retention = max(predicted_retention, pct)
-                        except:
-                            pass
+            # Highest retention percentage predicted anywhere in the strategy
+            predicted_retention = max(
+                (float(pct) for pct in index["values"]["retention_pct"]),
+                default=0.0
+            )
             
             # If no specific prediction found, estimate based on strategy quality
             if predicted_retention == 0.0:
@@ -307,32 +328,13 @@ Provide actionable, timestamp-specific strategies."""
         if not strategy:
             return []
         
-        checkpoints = []
-        
-        # Split into lines and look for CHECKPOINT markers
-        lines = strategy.split("\n")
-        current_checkpoint = {}
+        # Checkpoint sections come straight from the parsed index
+        index = extract(strategy, ENGAGEMENT_STRATEGY_SPEC)
         
-        for line in lines:
-            if "CHECKPOINT" in line.upper():
-                # Save previous checkpoint if exists
-                if current_checkpoint:
-                    checkpoints.append(current_checkpoint)
-                
-                # Start new checkpoint
-                current_checkpoint = {
-                    "line": line.strip(),
-                    "details": []
-                }
-            elif current_checkpoint and line.strip():
-                # Add details to current checkpoint
-                current_checkpoint["details"].append(line.strip())
-        
-        # Add last checkpoint
-        if current_checkpoint:
-            checkpoints.append(current_checkpoint)
-        
-        return checkpoints
+        return [
+            {"line": checkpoint["line"], "details": list(checkpoint["lines"])}
+            for checkpoint in index["sections"]["checkpoint"]
+        ]
     
     def get_pacing_breakdown(self, state: Dict[str, Any]) -> Dict[str, List[str]]:
         """
@@ -362,28 +364,19 @@ Provide actionable, timestamp-specific strategies."""
         if not strategy:
             return pacing
         
-        # Look for pacing indicators
-        lines = strategy.split("\n")
-        current_section = None
+        # Minute segments and their PACING lines come from the parsed index
+        index = extract(strategy, ENGAGEMENT_STRATEGY_SPEC)
         
-        for line in lines:
-            # Check for section headers (minutes)
-            if "MINUTES" in line.upper() or "MINUTE" in line.upper():
-                current_section = line.strip()
-            
-            # Check for pacing indicators
-            if "PACING:" in line.upper():
-                pace_line = line.upper()
+        for segment in index["sections"]["segment"]:
+            for pace in segment["fields"].get("pacing", []):
+                pace = pace.upper()
                 
-                if "FAST" in pace_line:
-                    if current_section:
-                        pacing["fast"].append(current_section)
-                elif "SLOW" in pace_line:
-                    if current_section:
-                        pacing["slow"].append(current_section)
-                elif "MEDIUM" in pace_line:
-                    if current_section:
-                        pacing["medium"].append(current_section)
+                if "FAST" in pace:
+                    pacing["fast"].append(segment["line"])
+                elif "SLOW" in pace:
+                    pacing["slow"].append(segment["line"])
+                elif "MEDIUM" in pace:
+                    pacing["medium"].append(segment["line"])
         
         return pacing
 
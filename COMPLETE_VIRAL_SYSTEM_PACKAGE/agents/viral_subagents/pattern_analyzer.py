@@ -12,10 +12,20 @@ Author: Advanced Multi-Agent System
 Created: 2024
 """
 
-import anthropic  # Anthropic's SDK for calling Claude AI
 import os         # For accessing environment variables (API keys)
+import sys        # For making the shared agent modules importable
 from typing import Dict, List, Any  # For type hints (helps with code clarity)
 
+# Add parent directories to path so shared agent modules can be imported
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from agents.client_registry import get_client  # Shared, pooled Anthropic client
+from agents.response_cache import cached_message  # Persistent cache for Claude responses
+from agents.context_packer import pack_research  # Best research first, within a token budget
+
+# How much research (in tokens) goes into the analysis prompt
+RESEARCH_TOKEN_BUDGET = 750
+
 class PatternAnalyzer:
     """
     PATTERN ANALYZER - Viral Video Pattern Detection Specialist
@@ -54,7 +64,8 @@ class PatternAnalyzer:
         
         # Create the Anthropic client
         # This is our connection to Claude AI - we'll use it to send requests
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        # (shared by every agent - see agents/client_registry.py)
+        self.client = get_client(self.api_key)
         
         # Set which Claude model to use
         # Claude Sonnet 4.5 is the smartest and most capable model
@@ -110,7 +121,8 @@ You provide data-driven insights based on real viral video patterns."""
         # Extract information from the state dictionary
         # We need to know what topic we're analyzing patterns for
         topic = state.get("topic", "Unknown topic")
-        research_findings = state.get("research_findings", "No research available")
+        # Best findings first, within this agent's token budget
+        research_context = pack_research(state.get("research_findings"), RESEARCH_TOKEN_BUDGET)
         target_audience = state.get("target_audience", "General audience")
         
         # Create a detailed prompt for Claude
@@ -121,7 +133,7 @@ TOPIC: {topic}
 TARGET AUDIENCE: {target_audience}
 
 RESEARCH CONTEXT:
-{research_findings[:3000]}  # First 3000 chars of research for context
+{research_context}
 
 YOUR TASK:
 Analyze successful viral videos in this niche and identify:
@@ -173,23 +185,15 @@ Provide 8-12 key patterns with high confidence scores."""
         try:
             # Call Claude AI to perform the analysis
             # We send our prompt and Claude responds with the analysis
-            response = self.client.messages.create(
+            pattern_analysis = cached_message(
+                self.client,
                 model=self.model,  # Use Claude Sonnet 4.5
                 max_tokens=4000,   # Allow up to 4000 tokens in response
                 temperature=0.7,   # Moderate creativity (0=deterministic, 1=creative)
                 system=self.agent_role,  # Tell Claude what role to play
-                messages=[
-                    {
-                        "role": "user",  # We're the user
-                        "content": analysis_prompt  # Our analysis request
-                    }
-                ]
+                user_message=analysis_prompt
             )
             
-            # Extract the text response from Claude's reply
-            # Claude's response is in a specific format, we need to extract the content
-            pattern_analysis = response.content[0].text
-            
             # Calculate a confidence score based on response length and quality
             # Longer, more detailed responses generally indicate higher confidence
             confidence = min(0.95, len(pattern_analysis) / 5000)  # Max 0.95
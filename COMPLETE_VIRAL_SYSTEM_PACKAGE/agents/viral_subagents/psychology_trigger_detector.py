@@ -13,10 +13,42 @@ Author: Advanced Multi-Agent System
 Created: 2024
 """
 
-import anthropic
 import os
+import re
+import sys
 from typing import Dict, List, Any
 
+# Add parent directories to path so shared agent modules can be imported
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from agents.client_registry import get_client
+from agents.response_cache import cached_message
+from agents.context_packer import pack_research
+from agents.token_estimator import truncate_to_tokens
+from agents.section_extractor import DocumentSpec, extract
+
+# How much research (in tokens) goes into the trigger prompt
+RESEARCH_TOKEN_BUDGET = 500
+
+# Layout of a trigger analysis - parsed ONCE per analysis text
+# (see agents/section_extractor.py)
+TRIGGER_ANALYSIS_SPEC = DocumentSpec(
+    "psychology_triggers",
+    values={
+        # "OVERALL VIRAL PSYCHOLOGY: 8.5/10"
+        "viral_psychology": re.compile(r"OVERALL VIRAL PSYCHOLOGY:[^\d\n/]*(\d+(?:\.\d+)?)"),
+        # "Effectiveness: 9/10"
+        "effectiveness": re.compile(r"Effectiveness:[^\d\n/]*(\d+(?:\.\d+)?)(?=[^\n]*/10)")
+    },
+    spans={
+        "sharing_psychology": re.compile(r"SHARING PSYCHOLOGY")
+    },
+    paragraph_fields={
+        "name": re.compile(r"^([^:]*):"),
+        "effectiveness": re.compile(r"Effectiveness:[^\d\n/]*(\d+(?:\.\d+)?)")
+    }
+)
+
 class PsychologyTriggerDetector:
     """
     PSYCHOLOGY TRIGGER DETECTOR - Behavioral Psychology Specialist
@@ -56,7 +88,8 @@ class PsychologyTriggerDetector:
             )
         
         # Initialize the Anthropic client
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        # (shared by every agent - see agents/client_registry.py)
+        self.client = get_client(self.api_key)
         
         # Use the most advanced Claude model
         self.model = "claude-sonnet-4-20250514"
@@ -143,9 +176,9 @@ then create a trigger application strategy with specific placements and intensit
         # Extract information from state
         topic = state.get("topic", "Unknown")
         audience = state.get("target_audience", "General audience")
-        research = state.get("research_findings", "No research")[:2000]
-        hooks = state.get("viral_hooks", "No hooks")[:1500]
-        engagement = state.get("engagement_strategy", "No strategy")[:1500]
+        research = pack_research(state.get("research_findings"), RESEARCH_TOKEN_BUDGET, "No research")
+        hooks = truncate_to_tokens(state.get("viral_hooks", "No hooks"), 375)
+        engagement = truncate_to_tokens(state.get("engagement_strategy", "No strategy"), 375)
         duration = state.get("duration_minutes", 30)
         
         # Build the trigger analysis prompt
@@ -272,31 +305,21 @@ Provide research-backed, specific strategies."""
         
         try:
             # Call Claude to analyze psychological triggers
-            response = self.client.messages.create(
+            trigger_analysis = cached_message(
+                self.client,
                 model=self.model,
                 max_tokens=5000,  # Long, detailed response
                 temperature=0.6,  # Balanced - needs accuracy + creativity
                 system=self.agent_role,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": trigger_prompt
-                    }
-                ]
+                user_message=trigger_prompt
             )
             
-            # Extract the trigger analysis
-            trigger_analysis = response.content[0].text
+            # Parse scores (one pass, shared with the accessor methods)
+            index = extract(trigger_analysis, TRIGGER_ANALYSIS_SPEC)
             
-            # Parse out viral psychology score if present
-            viral_score = 7.0  # Default
-            if "OVERALL VIRAL PSYCHOLOGY:" in trigger_analysis:
-                try:
-                    score_section = trigger_analysis.split("OVERALL VIRAL PSYCHOLOGY:")[1].split("\n")[0]
-                    viral_score = float(''.join(filter(lambda x: x.isdigit() or x == '.', 
-                                                       score_section.split("/")[0])))
-                except:
-                    pass
+            # Viral psychology score, if present
+            viral_scores = index["values"]["viral_psychology"]
+            viral_score = float(viral_scores[0]) if viral_scores else 7.0  # Default
             
             # Count triggers identified
             trigger_count = (
@@ -304,16 +327,8 @@ Provide research-backed, specific strategies."""
                 trigger_analysis.upper().count("EFFECTIVENESS:")
             )
             
-            # Parse trigger effectiveness scores
-            effectiveness_scores = []
-            for line in trigger_analysis.split("\n"):
-                if "Effectiveness:" in line and "/10" in line:
-                    try:
-                        score = float(''.join(filter(lambda x: x.isdigit() or x == '.', 
-                                                    line.split("Effectiveness:")[1].split("/")[0])))
-                        effectiveness_scores.append(score)
-                    except:
-                        pass
+            # Trigger effectiveness scores
+            effectiveness_scores = [float(score) for score in index["values"]["effectiveness"]]
             
             avg_effectiveness = (sum(effectiveness_scores) / len(effectiveness_scores) 
                                 if effectiveness_scores else 7.5)
@@ -369,27 +384,24 @@ Provide research-backed, specific strategies."""
         """
         
         analysis = state.get("psychology_triggers", "")
-        scores = state.get("trigger_effectiveness_scores", [])
         
-        if not analysis or not scores:
+        if not analysis:
             return []
         
-        # This is a simplified parser
-        # In production, you might want more sophisticated parsing
-        triggers = []
+        # Trigger paragraphs (with their own effectiveness score) from the parsed index
+        index = extract(analysis, TRIGGER_ANALYSIS_SPEC)
         
-        # Look for trigger sections
-        sections = analysis.split("\n\n")
-        
-        for i, section in enumerate(sections):
-            if "Effectiveness:" in section and i < len(scores):
-                trigger_name = section.split(":")[0].strip() if ":" in section else f"Trigger {i+1}"
-                
-                triggers.append({
-                    "name": trigger_name,
-                    "effectiveness": scores[i] if i < len(scores) else 0.0,
-                    "description": section[:200] + "..."
-                })
+        triggers = []
+        for i, paragraph in enumerate(index["paragraphs"]):
+            fields = paragraph["fields"]
+            if "effectiveness" not in fields:
+                continue
+            
+            triggers.append({
+                "name": fields["name"].strip() if "name" in fields else f"Trigger {i+1}",
+                "effectiveness": float(fields["effectiveness"]),
+                "description": paragraph["text"][:200] + "..."
+            })
         
         # Sort by effectiveness
         triggers.sort(key=lambda x: x["effectiveness"], reverse=True)
@@ -415,19 +427,19 @@ Provide research-backed, specific strategies."""
         
         analysis = state.get("psychology_triggers", "")
         
-        if not analysis or "SHARING PSYCHOLOGY" not in analysis:
+        if not analysis:
             return {}
         
-        # Extract the sharing psychology section
-        if "SHARING PSYCHOLOGY" in analysis:
-            sharing_section = analysis.split("SHARING PSYCHOLOGY")[1].split("\n\n")[0]
-            
-            return {
-                "analysis": sharing_section,
-                "viral_score": state.get("viral_psychology_score", 0.0)
-            }
+        # The sharing psychology section comes from the parsed index
+        sharing_section = extract(analysis, TRIGGER_ANALYSIS_SPEC)["spans"]["sharing_psychology"]
+        
+        if sharing_section is None:
+            return {}
         
-        return {}
+        return {
+            "analysis": sharing_section,
+            "viral_score": state.get("viral_psychology_score", 0.0)
+        }
 
 
 # ==============================================================================
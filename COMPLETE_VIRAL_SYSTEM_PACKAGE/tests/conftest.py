@@ -0,0 +1,49 @@
+"""
+Shared test setup.
+
+Run from the package folder:
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+
+import pytest
+
+# Make "agents.*" importable the same way the agents import each other
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeCollection:
+    """Just enough of a ChromaDB collection for the write/search helpers."""
+
+    def __init__(self, collection_id: str):
+        self.id = collection_id
+        self.records = {}
+        self.upserts = []
+
+    def count(self):
+        return len(self.records)
+
+    def get(self, ids=None, include=None, limit=None, offset=0, where=None):
+        keys = list(self.records) if ids is None else [doc_id for doc_id in ids if doc_id in self.records]
+        if where:
+            # Equality filters only ({"category": "hook"})
+            keys = [key for key in keys if all(self.records[key][1].get(k) == v for k, v in where.items())]
+        keys = keys[offset:offset + limit if limit else None]
+        return {
+            "ids": keys,
+            "documents": [self.records[key][0] for key in keys],
+            "metadatas": [self.records[key][1] for key in keys],
+        }
+
+    def upsert(self, ids, documents, metadatas):
+        self.upserts.append(list(ids))
+        for doc_id, document, metadata in zip(ids, documents, metadatas):
+            self.records[doc_id] = (document, dict(metadata))
+
+
+@pytest.fixture
+def collection(request):
+    """An empty in-memory collection with an ID unique to the test."""
+    return FakeCollection(f"test-{request.node.nodeid}")
@@ -0,0 +1,64 @@
+import pytest
+
+from agents import academic_cache
+from agents.academic_cache import AcademicCache, compound_query, paper_id
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Control the time the cache sees."""
+    now = [1_000_000.0]
+    monkeypatch.setattr(academic_cache.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return AcademicCache(path=str(tmp_path / "academic.sqlite3"), ttl_seconds=3600)
+
+
+PAPERS = [
+    {"title": "Dopamine and reward", "doi": "10.1000/ABC"},
+    {"title": "Reward prediction", "url": "https://example.org/paper"},
+]
+
+
+def test_query_results_expire_after_the_ttl(cache, clock):
+    cache.put_query("jstor", "dopamine reward", PAPERS)
+
+    clock[0] += 3599
+    assert cache.get_query("jstor", "  Dopamine   REWARD ") == PAPERS
+
+    clock[0] += 2
+    assert cache.get_query("jstor", "dopamine reward") is None
+    # Papers outlive the query that found them
+    assert cache.get_paper("jstor", "10.1000/abc") == PAPERS[0]
+
+
+def test_namespaces_and_sources_never_share_entries(cache):
+    cache.put_query("jstor:open:5", "dopamine", PAPERS[:1], source="jstor")
+    cache.put_query("jstor:open:10", "dopamine", PAPERS, source="jstor")
+
+    assert cache.get_query("jstor:open:5", "dopamine", source="jstor") == PAPERS[:1]
+    assert cache.get_query("jstor:open:10", "dopamine", source="jstor") == PAPERS
+
+    # Same DOI filed by another source is a different record
+    cache.put_paper("claude_synthesis", {"title": "Synthesized", "doi": "10.1000/abc"})
+    assert cache.get_paper("jstor", "10.1000/abc")["title"] == "Dopamine and reward"
+    assert cache.get_paper("claude_synthesis", "10.1000/abc")["title"] == "Synthesized"
+
+
+def test_query_with_a_missing_paper_is_a_miss(cache):
+    cache.put_query("jstor", "dopamine", PAPERS)
+    cache._conn.execute("DELETE FROM papers WHERE paper_id = ?", (paper_id(PAPERS[1]),))
+
+    assert cache.get_query("jstor", "dopamine") is None
+
+
+def test_paper_ids_and_compound_queries():
+    assert paper_id({"doi": " 10.1000/ABC "}) == paper_id({"doi": "10.1000/abc", "url": "https://x"})
+    assert paper_id({"title": "A"}) != paper_id({"title": "B"})
+    assert paper_id({"title": "A", "year": 2020}) == paper_id({"year": 2020, "title": "A"})
+
+    assert compound_query("Sleep", ["b query", "A Query"]) == compound_query("sleep ", ["a query", "B  query"])
+    assert compound_query("sleep", ["a", "b"]) != compound_query("sleep", ["a b"])
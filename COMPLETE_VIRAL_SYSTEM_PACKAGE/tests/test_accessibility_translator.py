@@ -0,0 +1,96 @@
+import json
+import logging
+
+import pytest
+
+pytest.importorskip("anthropic")
+pytest.importorskip("config.settings")
+
+from agents.subagents.accessibility_translator import AccessibilityTranslator
+
+FINDINGS = [
+    {"title": "Neuroplasticity in adults", "journal": "Nature Neuroscience"},
+    {"title": "Sleep and memory", "journal": "Journal of Sleep Research"},
+    {"title": "Habit formation", "journal": "European Journal of Social Psychology"},
+]
+
+
+def translation(text, index=None):
+    item = {"accessible_version": text, "engagement_score": 8, "viral_potential": 7, "hook": {"type": "surprise"}}
+    if index is not None:
+        item["index"] = index
+    return item
+
+
+@pytest.fixture
+def translator(monkeypatch):
+    """A translator whose Claude calls are replaced by stubs."""
+    agent = object.__new__(AccessibilityTranslator)
+    agent.name = "AccessibilityTranslator"
+    agent.logger = logging.getLogger("test_accessibility_translator")
+    agent.translation_mode = "serial"
+    agent.translation_batch_size = 5
+    agent.prompts = []
+    agent.fallbacks = []
+
+    def translate_one(finding, target_audience, engagement_threshold):
+        agent.fallbacks.append(finding["title"])
+        return agent._attach_source(translation(f"single: {finding['title']}"), finding)
+
+    monkeypatch.setattr(agent, "_translate_finding", translate_one)
+    return agent
+
+
+def answer_with(translator, monkeypatch, response):
+    def invoke_llm(prompt, use_json=False):
+        translator.prompts.append(prompt)
+        return response
+
+    monkeypatch.setattr(translator, "invoke_llm", invoke_llm, raising=False)
+
+
+def run(translator, mode=None):
+    assignment = {"academic_findings": FINDINGS, "target_audience": "students", "engagement_threshold": 7.0}
+    if mode:
+        assignment["translation_mode"] = mode
+    return translator.execute({"translation_assignment": assignment})
+
+
+def test_default_mode_is_serial(translator):
+    result = run(translator)
+
+    assert translator.fallbacks == [finding["title"] for finding in FINDINGS]
+    assert len(result["all_translations"]) == 3
+
+
+def test_batch_mode_translates_a_chunk_in_one_call(translator, monkeypatch):
+    items = [translation(f"batch {index}", index) for index in (2, 0, 1)]
+    answer_with(translator, monkeypatch, "```json\n" + json.dumps(items) + "\n```")
+
+    result = run(translator, "batch")
+
+    assert len(translator.prompts) == 1
+    assert translator.fallbacks == []
+    assert [t["accessible_version"] for t in result["all_translations"]] == ["batch 0", "batch 1", "batch 2"]
+    assert result["all_translations"][1]["source_finding"]["title"] == "Sleep and memory"
+    assert "index" not in result["all_translations"][0]
+
+
+def test_batch_mode_retries_missing_findings_individually(translator, monkeypatch):
+    answer_with(translator, monkeypatch, json.dumps([translation("batch 0", 0), {"index": 1}]))
+
+    result = run(translator, "batch")
+
+    assert translator.fallbacks == ["Sleep and memory", "Habit formation"]
+    assert [t["accessible_version"] for t in result["all_translations"]] == [
+        "batch 0", "single: Sleep and memory", "single: Habit formation"
+    ]
+
+
+def test_unparseable_batch_falls_back_for_every_finding(translator, monkeypatch):
+    answer_with(translator, monkeypatch, "I can't answer in JSON")
+
+    result = run(translator, "batch")
+
+    assert translator.fallbacks == [finding["title"] for finding in FINDINGS]
+    assert len(result["all_translations"]) == 3
@@ -0,0 +1,129 @@
+from agents.bm25_index import (
+    BM25Index,
+    get_collection_index,
+    reciprocal_rank_fusion,
+    tokenize,
+    update_collection_index,
+)
+from agents.query_cache import bump_collection_version
+from agents.synthesis_subagents.context_retrieval_agent import ContextRetrievalAgent
+from agents.technique_writer import TechniqueWriter
+
+
+def test_tokenize_adds_word_pairs_and_drops_stopwords():
+    assert tokenize("The Open Loop technique") == [
+        "open", "loop", "technique", "open_loop", "loop_technique"
+    ]
+
+
+def test_exact_name_ranks_first():
+    index = BM25Index()
+    index.add("open_loop", "Open Loop: leave a question unanswered until the end")
+    index.add("curiosity", "Curiosity gap: hint at an answer, loop back to it later")
+    index.add("contrarian", "Contrarian hook: open with the opposite of common belief")
+
+    assert index.search("open loop", 3)[0][0] == "open_loop"
+
+
+def test_add_replaces_and_remove_forgets():
+    index = BM25Index()
+    index.add("doc", "dopamine reward")
+    index.add("doc", "cortisol stress")
+
+    assert len(index) == 1
+    assert index.search("dopamine") == []
+    assert index.search("cortisol")[0][0] == "doc"
+
+    index.remove("doc")
+    index.remove("doc")  # no-op the second time
+    assert len(index) == 0
+    assert index.search("cortisol") == []
+    assert index._postings == {}
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "d"]], k=60)
+
+    assert [doc_id for doc_id, _ in fused][:2] == ["b", "a"]
+    assert dict(fused)["b"] == 1 / 62 + 1 / 61
+
+
+def test_collection_index_resyncs_after_a_write(collection):
+    collection.upsert(ids=["hook"], documents=["pattern interrupt"], metadatas=[{}])
+    assert get_collection_index(collection).search("pattern interrupt")[0][0] == "hook"
+
+    collection.records["hook"] = ("open loop", {})
+    bump_collection_version(collection)
+
+    index = get_collection_index(collection)
+    assert index.search("pattern interrupt") == []
+    assert index.search("open loop")[0][0] == "hook"
+
+
+def count_rebuilds(collection):
+    """Count the paged full reads sync() makes when it rebuilds."""
+    reads = []
+    original_get = collection.get
+
+    def get(*args, **kwargs):
+        if kwargs.get("limit"):
+            reads.append(kwargs.get("offset", 0))
+        return original_get(*args, **kwargs)
+
+    collection.get = get
+    return reads
+
+
+def test_writes_update_the_index_without_a_rebuild(collection):
+    collection.upsert(ids=["hook"], documents=["pattern interrupt"], metadatas=[{}])
+    get_collection_index(collection)
+    rebuilds = count_rebuilds(collection)
+
+    writer = TechniqueWriter(collection)
+    writer.add("loop", "open loop", {})
+    writer.flush()
+
+    index = get_collection_index(collection)
+    assert index.search("open loop")[0][0] == "loop"
+    assert index.search("pattern interrupt")[0][0] == "hook"
+    assert rebuilds == []
+
+
+def test_missed_or_foreign_writes_fall_back_to_a_rebuild(collection):
+    collection.upsert(ids=["hook"], documents=["pattern interrupt"], metadatas=[{}])
+    get_collection_index(collection)
+
+    # Another process added a document: the count no longer adds up
+    collection.records["elsewhere"] = ("cold open", {})
+    collection.upsert(ids=["loop"], documents=["open loop"], metadatas=[{}])
+    assert update_collection_index(collection, bump_collection_version(collection), {"loop": "open loop"}) is False
+
+    # A write the index was never told about: versions no longer line up
+    bump_collection_version(collection)
+    collection.upsert(ids=["gap"], documents=["curiosity gap"], metadatas=[{}])
+    assert update_collection_index(collection, bump_collection_version(collection), {"gap": "curiosity gap"}) is False
+
+    index = get_collection_index(collection)
+    assert len(index) == 4
+    assert index.search("cold open")[0][0] == "elsewhere"
+
+
+def test_hybrid_search_filters_keyword_hits_before_fusion(collection, monkeypatch):
+    # The best keyword matches are all in the wrong category
+    for number in range(5):
+        collection.upsert(ids=[f"broll{number}"], documents=["open loop open loop"], metadatas=[{"category": "broll"}])
+    collection.upsert(ids=["hook1"], documents=["open loop question"], metadatas=[{"category": "hook"}])
+    collection.upsert(ids=["hook2"], documents=["open loop tease"], metadatas=[{"category": "hook"}])
+    bump_collection_version(collection)
+
+    agent = object.__new__(ContextRetrievalAgent)
+    agent.collection = collection
+    monkeypatch.setattr(agent, "search_techniques", lambda query, n_results, where: {
+        "query": query,
+        "results": [{"id": "hook1", "technique": "open loop question", "metadata": {"category": "hook"}, "similarity": 0.9}],
+        "count": 1,
+    })
+
+    results = agent.hybrid_search("open loop", n_results=2, where={"category": "hook"})["results"]
+
+    assert [(result["id"], result["match"]) for result in results] == [("hook1", "both"), ("hook2", "keyword")]
@@ -0,0 +1,63 @@
+from agents import synthesis_manifest
+from agents.embeddings import CachedEmbeddingFunction, EmbeddingCache
+from agents.hashing import content_hash
+
+
+def fake_encoder(function):
+    """Replace the model with one that records what it was asked to encode."""
+    calls = []
+
+    def encode(texts):
+        calls.append(list(texts))
+        return [[float(len(text)), float(ord(text[0]))] for text in texts]
+
+    function._encode = encode
+    return calls
+
+
+def test_repeated_texts_are_encoded_once_and_order_is_kept():
+    function = CachedEmbeddingFunction(model_name="fake")
+    calls = fake_encoder(function)
+
+    vectors = function(["hook", "loop", "hook", "b"])
+
+    assert calls == [["hook", "loop", "b"]]
+    assert vectors == [[4.0, 104.0], [4.0, 108.0], [4.0, 104.0], [1.0, 98.0]]
+    assert function.encoded == 3
+
+
+def test_cached_texts_are_not_encoded_again(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "embeddings.sqlite3"))
+    first = CachedEmbeddingFunction(model_name="fake", cache=cache)
+    fake_encoder(first)
+    first(["hook", "loop"])
+
+    # A fresh function (e.g. the next run) only encodes the new text
+    second = CachedEmbeddingFunction(model_name="fake", cache=cache)
+    calls = fake_encoder(second)
+    vectors = second(["loop", "tease", "hook"])
+
+    assert calls == [["tease"]]
+    assert vectors == [[4.0, 108.0], [5.0, 116.0], [4.0, 104.0]]
+    assert second.cache_hits == 2
+    assert cache.stats()["entries"] == 3
+
+
+def test_cache_keys_depend_on_the_model(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "embeddings.sqlite3"))
+    small = CachedEmbeddingFunction(model_name="small", cache=cache)
+    fake_encoder(small)
+    small(["hook"])
+
+    other = CachedEmbeddingFunction(model_name="large", cache=cache)
+    calls = fake_encoder(other)
+    other(["hook"])
+
+    assert calls == [["hook"]]
+    assert EmbeddingCache.make_key("small", "hook") != EmbeddingCache.make_key("large", "hook")
+
+
+def test_content_hash_separates_parts_and_is_re_exported():
+    assert content_hash("ab", "c") != content_hash("a", "bc")
+    assert content_hash("a", "b") == content_hash("a", "b")
+    assert synthesis_manifest.content_hash is content_hash
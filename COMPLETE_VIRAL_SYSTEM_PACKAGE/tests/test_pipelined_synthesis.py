@@ -0,0 +1,103 @@
+import threading
+
+import pytest
+
+pytest.importorskip("anthropic")
+
+from agents.streaming import consume_stream
+from agents.synthesis_subagents.pipelined_synthesis import PipelinedSynthesis
+from agents.synthesis_subagents.production_notes_generator import ProductionNotesGenerator
+from agents.synthesis_subagents.script_writer import ScriptWriter
+from agents.synthesis_subagents.visual_scene_architect import VisualSceneArchitect
+
+SCRIPT = """[00:00-01:00] COLD OPEN:
+NARRATOR: You'd think procrastination is laziness.
+
+[01:00-03:00] ACT 1:
+NARRATOR: For decades we blamed time management.
+
+[03:00-05:00] ACT 2:
+NARRATOR: Then a lab found something else.
+"""
+
+STATE = {"topic": "Procrastination", "duration_minutes": 5, "engagement_strategy": "Pattern interrupt"}
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    """A pipeline over the real agents with every Claude call stubbed out."""
+    calls = []
+    lock = threading.Lock()
+
+    def record(*call):
+        with lock:
+            calls.append(call)
+
+    writer = object.__new__(ScriptWriter)
+    architect = object.__new__(VisualSceneArchitect)
+    notes = object.__new__(ProductionNotesGenerator)
+
+    def write_script(state, stream_consumers=None):
+        record("script")
+        consume_stream([SCRIPT], stream_consumers or [])
+        return dict(state, documentary_script=SCRIPT)
+
+    def design_section_visuals(section, context, visual_strategy=None):
+        record("visuals", section["title"], visual_strategy)
+        return f"SCENE {section['index'] + 1}: {section['title']}\nSHOT 1: wide"
+
+    def design_visual_strategy(context):
+        record("strategy")
+        return "OVERALL VISUAL STRATEGY:\nCOLOR: warm"
+
+    def generate_section_notes(section, visuals, context):
+        record("notes", section["title"])
+        return f"{section['title']} MUSIC CUE: low strings"
+
+    def generate_project_notes(context):
+        record("project_notes")
+        return "EQUIPMENT: one camera\nBUDGET: $500"
+
+    monkeypatch.setattr(writer, "write_script", write_script)
+    monkeypatch.setattr(architect, "design_section_visuals", design_section_visuals)
+    monkeypatch.setattr(architect, "design_visual_strategy", design_visual_strategy)
+    monkeypatch.setattr(notes, "generate_section_notes", generate_section_notes)
+    monkeypatch.setattr(notes, "generate_project_notes", generate_project_notes)
+
+    synthesis = PipelinedSynthesis(writer, architect, notes, max_workers=2)
+    synthesis.calls = calls
+    return synthesis
+
+
+def test_run_stitches_sections_in_script_order(pipeline):
+    state = pipeline.run(dict(STATE))
+
+    architecture = state["visual_architecture"]
+    assert architecture.index("SCENE 1") < architecture.index("SCENE 2") < architecture.index("SCENE 3")
+    assert architecture.endswith("OVERALL VISUAL STRATEGY:\nCOLOR: warm")
+    assert state["production_notes"].endswith("EQUIPMENT: one camera\nBUDGET: $500")
+    assert state["scene_count"] == 3
+    assert state["pipelined_section_count"] == 3
+    assert state["regenerated_sections"] == ["[00:00-01:00]", "[01:00-03:00]", "[03:00-05:00]"]
+
+    # Every section was designed from the shared visual strategy
+    strategies = {call[2] for call in pipeline.calls if call[0] == "visuals"}
+    assert strategies == {"OVERALL VISUAL STRATEGY:\nCOLOR: warm"}
+
+
+def test_regenerate_redoes_only_edited_sections(pipeline):
+    state = pipeline.run(dict(STATE))
+    pipeline.calls.clear()
+
+    state["documentary_script"] = SCRIPT.replace("time management", "bad calendars")
+    state = pipeline.regenerate(state)
+
+    assert state["regenerated_sections"] == ["[01:00-03:00]"]
+    assert sorted(pipeline.calls) == [("notes", "[01:00-03:00]"), ("visuals", "[01:00-03:00]", "OVERALL VISUAL STRATEGY:\nCOLOR: warm")]
+    assert state["scene_count"] == 3
+
+    # Nothing changed since: everything is reused
+    pipeline.calls.clear()
+    state = pipeline.regenerate(state)
+    assert state["regenerated_sections"] == []
+    assert pipeline.calls == []
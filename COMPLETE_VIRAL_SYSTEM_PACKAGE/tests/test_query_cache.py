@@ -0,0 +1,43 @@
+from agents.query_cache import QueryCache, bump_collection_version, collection_version, normalize_query
+
+
+def test_query_cache_hit_for_normalized_query(collection):
+    cache = QueryCache()
+    cache.put(collection, "Procrastination  Hooks", 5, None, {"ids": [["a"]]})
+
+    assert cache.get(collection, "procrastination hooks", 5) == {"ids": [["a"]]}
+    assert cache.get(collection, "procrastination hooks", 10) is None
+    assert cache.get(collection, "procrastination hooks", 5, {"type": "hook"}) is None
+    assert normalize_query("  A \n b ") == "a b"
+
+
+def test_query_cache_invalidated_by_version_bump(collection):
+    cache = QueryCache()
+    cache.put(collection, "hooks", 5, None, {"ids": [["a"]]})
+    version = collection_version(collection)
+
+    assert bump_collection_version(collection) == version + 1
+    assert cache.get(collection, "hooks", 5) is None
+
+
+def test_query_cache_returns_copies(collection):
+    cache = QueryCache()
+    results = {"ids": [["a"]]}
+    cache.put(collection, "hooks", 5, None, results)
+
+    results["ids"][0].append("changed")
+    cache.get(collection, "hooks", 5)["ids"][0].append("changed again")
+
+    assert cache.get(collection, "hooks", 5) == {"ids": [["a"]]}
+
+
+def test_query_cache_drops_least_recently_used(collection):
+    cache = QueryCache(max_entries=2)
+    cache.put(collection, "first", 5, None, 1)
+    cache.put(collection, "second", 5, None, 2)
+    cache.get(collection, "first", 5)
+    cache.put(collection, "third", 5, None, 3)
+
+    assert cache.get(collection, "second", 5) is None
+    assert cache.get(collection, "first", 5) == 1
+    assert cache.stats()["entries"] == 2
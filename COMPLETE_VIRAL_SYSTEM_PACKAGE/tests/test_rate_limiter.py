@@ -0,0 +1,267 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("anthropic")
+
+from agents import rate_limiter
+from agents.rate_limiter import LLMCallError, RateLimiter, TokenBucket
+
+
+class FakeResponse:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+class FakeAPIError(Exception):
+    """Looks like an SDK status error: a status code and response headers."""
+
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = FakeResponse(headers or {})
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record every sleep the limiter asks for instead of sleeping."""
+    recorded = []
+    monkeypatch.setattr(rate_limiter.time, "sleep", recorded.append)
+    return recorded
+
+
+def failing_then(errors, result="ok"):
+    """A request that raises each error in turn, then succeeds."""
+    errors = list(errors)
+    calls = []
+
+    def request():
+        calls.append(1)
+        if errors:
+            raise errors.pop(0)
+        return result
+
+    request.calls = calls
+    return request
+
+
+def test_retry_after_header_sets_the_delay(sleeps):
+    limiter = RateLimiter(requests_per_minute=1000, backoff_base=0)
+    request = failing_then([FakeAPIError(503, {"retry-after": "7"})])
+
+    assert limiter.call(request) == "ok"
+    assert len(request.calls) == 2
+    assert sleeps == [7.0]
+
+
+def test_retry_after_ms_wins_over_retry_after(sleeps):
+    limiter = RateLimiter(requests_per_minute=1000, backoff_base=0)
+    request = failing_then([FakeAPIError(503, {"retry-after-ms": "250", "retry-after": "9"})])
+
+    limiter.call(request)
+    assert sleeps == [0.25]
+
+
+def test_throttle_pauses_everyone_and_halves_the_rate(sleeps):
+    limiter = RateLimiter(requests_per_minute=1000, backoff_base=0)
+    seen = []
+
+    def request():
+        seen.append((limiter._rate_factor, limiter._paused_until - time.monotonic()))
+        if len(seen) == 1:
+            raise FakeAPIError(429, {"retry-after": "30"})
+        return "ok"
+
+    limiter.call(request)
+
+    # The retry ran at half the rate, with every caller paused ~30s
+    rate_factor, pause = seen[1]
+    assert rate_factor == 0.5
+    assert pause > 25
+    # ...and the success started winning the rate back
+    assert limiter._rate_factor == 0.5 + rate_limiter.RATE_RECOVERY_STEP
+
+
+def test_permanent_error_raises_without_retrying(sleeps):
+    limiter = RateLimiter(requests_per_minute=1000)
+    request = failing_then([FakeAPIError(400)])
+
+    with pytest.raises(LLMCallError) as caught:
+        limiter.call(request)
+
+    assert len(request.calls) == 1
+    assert caught.value.status_code == 400
+    assert caught.value.attempts == 1
+    assert caught.value.retryable is False
+    assert sleeps == []
+
+
+def test_retries_run_out(sleeps):
+    limiter = RateLimiter(requests_per_minute=1000, max_retries=2, backoff_base=0)
+    request = failing_then([FakeAPIError(500)] * 5)
+
+    with pytest.raises(LLMCallError) as caught:
+        limiter.call(request)
+
+    assert len(request.calls) == 3
+    assert caught.value.attempts == 3
+    assert caught.value.retryable is True
+
+
+def test_concurrency_cap_is_respected():
+    limiter = RateLimiter(requests_per_minute=10_000, max_concurrency=2)
+    lock = threading.Lock()
+    in_flight = [0]
+    peak = [0]
+
+    def request():
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        time.sleep(0.05)
+        with lock:
+            in_flight[0] -= 1
+        return "ok"
+
+    threads = [threading.Thread(target=limiter.call, args=(request,)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak[0] == 2
+
+
+def test_slots_are_released_after_failures(sleeps):
+    limiter = RateLimiter(requests_per_minute=1000, max_concurrency=1, max_retries=1, backoff_base=0)
+
+    with pytest.raises(LLMCallError):
+        limiter.call(failing_then([FakeAPIError(500)] * 2))
+    with pytest.raises(LLMCallError):
+        limiter.call(failing_then([FakeAPIError(400)]))
+
+    # Every slot is free again: a bounded semaphore can't go above its size
+    assert limiter._slots.acquire(blocking=False)
+    limiter._slots.release()
+    assert limiter.call(lambda: "ok") == "ok"
+
+
+def test_token_bucket_waits_once_empty():
+    bucket = TokenBucket(60)  # one per second
+
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0, abs=0.05)
+    assert bucket.reserve(1) == pytest.approx(2.0, abs=0.05)
+
+    # Giving budget back shortens the queue
+    bucket.refund(2)
+    assert bucket.reserve(1) == pytest.approx(1.0, abs=0.05)
+
+
+def test_backoff_grows_and_is_capped(monkeypatch, sleeps):
+    # Take the top of every jitter range
+    monkeypatch.setattr(rate_limiter.random, "uniform", lambda low, high: high)
+    limiter = RateLimiter(requests_per_minute=1000, max_retries=4, backoff_base=1.0, backoff_max=5.0)
+
+    limiter.call(failing_then([FakeAPIError(500)] * 4))
+    assert sleeps == [1.0, 2.0, 4.0, 5.0]
+
+
+@pytest.fixture
+def async_sleeps(monkeypatch):
+    """Record every asyncio sleep the limiter asks for instead of sleeping."""
+    recorded = []
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(delay):
+        recorded.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", fake_sleep)
+    return recorded
+
+
+def test_acall_retries_with_retry_after(async_sleeps):
+    limiter = RateLimiter(requests_per_minute=1000, backoff_base=0)
+    request = failing_then([FakeAPIError(503, {"retry-after": "7"})])
+
+    async def attempt():
+        return request()
+
+    assert asyncio.run(limiter.acall(attempt)) == "ok"
+    assert len(request.calls) == 2
+    assert async_sleeps == [7.0]
+
+
+def test_acall_concurrency_cap_is_shared_with_call():
+    limiter = RateLimiter(requests_per_minute=10_000, max_concurrency=2)
+    lock = threading.Lock()
+    in_flight = [0]
+    peak = [0]
+
+    def enter():
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+
+    def leave():
+        with lock:
+            in_flight[0] -= 1
+
+    def blocking_request():
+        enter()
+        time.sleep(0.05)
+        leave()
+        return "ok"
+
+    async def async_request():
+        enter()
+        await asyncio.sleep(0.05)
+        leave()
+        return "ok"
+
+    async def main():
+        return await asyncio.gather(*(limiter.acall(async_request) for _ in range(6)))
+
+    threads = [threading.Thread(target=limiter.call, args=(blocking_request,)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    results = asyncio.run(main())
+    for thread in threads:
+        thread.join()
+
+    assert results == ["ok"] * 6
+    assert peak[0] == 2
+
+
+def test_acall_cancelled_while_waiting_gives_the_slot_back():
+    limiter = RateLimiter(requests_per_minute=10_000, max_concurrency=1)
+
+    async def main():
+        release = asyncio.Event()
+
+        async def hold():
+            await release.wait()
+            return "held"
+
+        holder = asyncio.create_task(limiter.acall(hold))
+        await asyncio.sleep(0.01)
+
+        # A second caller waits for the only slot, then gives up
+        waiter = asyncio.create_task(limiter.acall(hold))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        release.set()
+        await holder
+
+        async def quick():
+            return "ok"
+
+        return await asyncio.wait_for(limiter.acall(quick), timeout=1)
+
+    assert asyncio.run(main()) == "ok"
@@ -0,0 +1,35 @@
+from agents.research_dedup import deduplicate_findings, normalize_title, simhash
+
+
+def test_normalize_title():
+    assert normalize_title("The Mind, Revisited!") == "the mind revisited"
+
+
+def test_near_identical_titles_have_close_fingerprints():
+    first = simhash(normalize_title("The Dopamine Hypothesis, Revisited"))
+    second = simhash(normalize_title("The dopamine hypothesis revisited."))
+    other = simhash(normalize_title("Sleep deprivation and memory consolidation in adults"))
+
+    assert bin(first ^ second).count("1") <= 3
+    assert bin(first ^ other).count("1") > 3
+
+
+def test_duplicates_merge_into_the_richest_record():
+    findings = [
+        {"title": "The Dopamine Hypothesis of Reward Revisited", "url": "https://example.org/a"},
+        {"title": "The dopamine hypothesis of reward, revisited.", "abstract": "Long abstract", "journal": "Neuron"},
+        {"title": "Unrelated Work", "doi": "10.1/x"},
+        {"title": "Another title entirely", "doi": "10.1/X"},
+    ]
+
+    unique = deduplicate_findings(findings)
+
+    assert len(unique) == 2
+    merged = unique[0]
+    assert merged["journal"] == "Neuron"
+    assert merged["url"] == "https://example.org/a"  # filled in from the dropped record
+
+
+def test_short_titles_must_match_exactly():
+    findings = [{"title": "Memory"}, {"title": "Memories"}, {"title": "memory!"}]
+    assert len(deduplicate_findings(findings)) == 2
@@ -0,0 +1,142 @@
+import json
+import logging
+
+import pytest
+
+pytest.importorskip("anthropic")
+pytest.importorskip("config.settings")
+
+from agents.gatekeepers.research_gatekeeper import ResearchGatekeeper
+
+
+@pytest.fixture
+def gatekeeper():
+    """A gatekeeper with the default pre-scoring band and no API client."""
+    agent = object.__new__(ResearchGatekeeper)
+    agent.name = "ResearchGatekeeper"
+    agent.logger = logging.getLogger("test_research_gatekeeper")
+    agent.prescore_accept_threshold = 8.5
+    agent.prescore_reject_threshold = 5.5
+    agent.scoring_batch_size = 10
+    return agent
+
+
+def paper(journal, citation_count, year):
+    return {"title": f"{journal} paper", "journal": journal, "citation_count": citation_count, "year": year}
+
+
+def judged(overall):
+    return {
+        "credibility": overall, "uniqueness": overall, "narrative_value": overall,
+        "visual_potential": overall, "relevance": overall, "overall": overall
+    }
+
+
+def test_clearly_credible_paper_is_scored_locally(gatekeeper):
+    score = gatekeeper._prescore_finding(paper("Nature", 2400, 2025))
+
+    assert score["prescored"] is True
+    assert score["overall"] == score["credibility"] >= 8.5
+
+
+def test_old_barely_cited_paper_is_rejected(gatekeeper):
+    assert gatekeeper._prescore_finding(paper("Blog", 0, 2010)) == "reject"
+
+
+def test_borderline_and_unscorable_findings_go_to_claude(gatekeeper):
+    assert gatekeeper._prescore_finding(paper("Journal of Psychology", 50, 2019)) is None
+    assert gatekeeper._prescore_finding(paper("Blog", 7, 2010)) is None  # 5.6 - just above the band
+    assert gatekeeper._prescore_finding({"title": "No metadata"}) is None
+
+
+def test_reject_threshold_sits_above_the_minimum_credibility(gatekeeper):
+    gatekeeper.prescore_reject_threshold = 5.0
+    # With the old threshold nothing but the absolute floor could be dropped
+    assert gatekeeper._prescore_finding(paper("Blog", 1, 2010)) is None
+
+
+def test_prescored_findings_do_not_count_as_high_quality(gatekeeper, monkeypatch):
+    sent = []
+
+    def score_findings(typed_findings):
+        sent.extend(finding["title"] for finding, _ in typed_findings)
+        return [judged(9), judged(6)]
+
+    monkeypatch.setattr(gatekeeper, "_score_findings", score_findings)
+
+    accepted = paper("Nature", 2400, 2025)
+    rejected = paper("Blog", 0, 2010)
+    borderline = [paper("Journal of Psychology", 50, 2019), {"title": "Cross-field link"}]
+
+    validated = gatekeeper._validate_and_score_research([accepted, rejected, borderline[0]], borderline[1:], [], [])
+    metrics = validated["quality_metrics"]
+
+    assert sent == ["Journal of Psychology paper", "Cross-field link"]
+    assert len(validated["academic_sources"]) == 2
+    assert metrics["total_findings"] == 3
+    assert metrics["high_quality_count"] == 1  # only the Claude-judged 9
+    assert metrics["prescored_accepted"] == 1
+    assert metrics["prescored_rejected"] == 1
+    # Placeholder 5s from the pre-scored paper stay out of the averages
+    assert metrics["average_uniqueness"] == 7.5
+
+
+def batch_response(items):
+    return "Here are the scores:\n```json\n" + json.dumps(items) + "\n```"
+
+
+@pytest.fixture
+def scored_individually(gatekeeper, monkeypatch):
+    """Record findings that fall back to one Claude call each."""
+    fallbacks = []
+
+    def score_one(finding, finding_type):
+        fallbacks.append(finding["title"])
+        return judged(4)
+
+    monkeypatch.setattr(gatekeeper, "_score_research_finding", score_one)
+    return fallbacks
+
+
+def test_batch_scores_come_back_in_finding_order(gatekeeper, monkeypatch, scored_individually):
+    chunk = [({"title": "A"}, "academic"), ({"title": "B"}, "historical")]
+    # Claude answers out of order - the "index" field puts them back
+    response = batch_response([dict(judged(7), index=1), dict(judged(9), index=0)])
+    monkeypatch.setattr(gatekeeper, "invoke_llm", lambda prompt, use_json=False: response, raising=False)
+
+    scores = gatekeeper._score_research_batch(chunk)
+
+    assert [score["overall"] for score in scores] == [9.0, 7.0]
+    assert scored_individually == []
+
+
+def test_malformed_batch_item_falls_back_alone(gatekeeper, monkeypatch, scored_individually):
+    chunk = [({"title": "A"}, "academic"), ({"title": "B"}, "academic"), ({"title": "C"}, "academic")]
+    response = batch_response([
+        dict(judged(8), index=0),
+        {"index": 1, "overall": 8},           # missing dimensions
+        dict(judged(8), index=2, overall=14)  # out of range
+    ])
+    monkeypatch.setattr(gatekeeper, "invoke_llm", lambda prompt, use_json=False: response, raising=False)
+
+    scores = gatekeeper._score_research_batch(chunk)
+
+    assert [score["overall"] for score in scores] == [8.0, 4, 4]
+    assert scored_individually == ["B", "C"]
+
+
+def test_unparseable_batch_falls_back_for_every_finding(gatekeeper, monkeypatch, scored_individually):
+    chunk = [({"title": "A"}, "academic"), ({"title": "B"}, "academic")]
+    monkeypatch.setattr(gatekeeper, "invoke_llm", lambda prompt, use_json=False: "Sorry, no scores", raising=False)
+
+    assert len(gatekeeper._score_research_batch(chunk)) == 2
+    assert scored_individually == ["A", "B"]
+
+
+def test_extract_json_array(gatekeeper):
+    assert gatekeeper.extract_json_array('```json\n[{"index": 0}]\n```') == [{"index": 0}]
+
+    with pytest.raises(ValueError):
+        gatekeeper.extract_json_array('{"index": 0}')
+    with pytest.raises(ValueError):
+        gatekeeper.extract_json_array("[not json]")
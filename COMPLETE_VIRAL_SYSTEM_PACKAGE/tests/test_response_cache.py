@@ -0,0 +1,133 @@
+import asyncio
+import logging
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("anthropic")
+
+from agents import response_cache
+from agents.base_agent import BaseAgent
+from agents.response_cache import ResponseCache, acached_message, cached_message
+from agents.streaming import stream_message
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Control the time the cache sees."""
+    now = [1_000_000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """A fresh on-disk cache, installed as the shared one."""
+    shared = ResponseCache(path=str(tmp_path / "responses.sqlite3"))
+    monkeypatch.setattr(response_cache, "_default_cache", shared)
+    monkeypatch.delenv("LLM_CACHE_ENABLED", raising=False)
+    return shared
+
+
+def test_entries_expire_after_the_ttl(tmp_path, clock):
+    cache = ResponseCache(path=str(tmp_path / "ttl.sqlite3"), ttl_seconds=60)
+    cache.set("key", "answer")
+
+    clock[0] += 59
+    assert cache.get("key") == "answer"
+
+    clock[0] += 2
+    assert cache.get("key") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entries_are_evicted_first(tmp_path, clock):
+    cache = ResponseCache(path=str(tmp_path / "lru.sqlite3"), max_bytes=10)
+    cache.set("old", "aaaa")
+    clock[0] += 1
+    cache.set("newer", "bbbb")
+    clock[0] += 1
+    assert cache.get("old") == "aaaa"  # now the most recently used
+
+    clock[0] += 1
+    cache.set("newest", "cccc")  # 12 bytes > 10: one entry has to go
+
+    assert cache.get("newer") is None
+    assert cache.get("old") == "aaaa"
+    assert cache.get("newest") == "cccc"
+
+
+def test_keys_never_collide_across_field_boundaries():
+    key = ResponseCache.make_key("model", "ab", "c", 0.7, 1000)
+
+    assert key == ResponseCache.make_key("model", "ab", "c", 0.7, 1000)
+    assert key != ResponseCache.make_key("model", "a", "bc", 0.7, 1000)
+    assert key != ResponseCache.make_key("model", "ab", "c", 0.8, 1000)
+    assert key != ResponseCache.make_key("model", "ab", "c", 0.7, 2000)
+    # No system prompt and an empty one are the same request
+    assert ResponseCache.make_key("model", None, "c", 0.7, 1000) == ResponseCache.make_key("model", "", "c", 0.7, 1000)
+
+
+class FakeMessages:
+    """Stands in for client.messages (sync, async and streaming)."""
+
+    def __init__(self, text):
+        self.text = text
+        self.calls = []
+
+    def _response(self, kwargs):
+        self.calls.append(kwargs)
+        return SimpleNamespace(content=[SimpleNamespace(text=self.text)], usage=None)
+
+    def create(self, **kwargs):
+        return self._response(kwargs)
+
+    @contextmanager
+    def stream(self, **kwargs):
+        self.calls.append(kwargs)
+        yield SimpleNamespace(text_stream=iter([self.text[:3], self.text[3:]]))
+
+
+class FakeAsyncMessages(FakeMessages):
+    async def create(self, **kwargs):
+        return self._response(kwargs)
+
+
+REQUEST = dict(model="claude-test", max_tokens=500, temperature=0.5, system="You are a tester.", user_message="Hello")
+
+
+def test_sync_async_and_streaming_calls_share_one_entry(cache):
+    messages = FakeMessages("Hi there")
+    async_messages = FakeAsyncMessages("never used")
+
+    assert "".join(stream_message(SimpleNamespace(messages=messages), **REQUEST)) == "Hi there"
+    assert cached_message(SimpleNamespace(messages=messages), **REQUEST) == "Hi there"
+    assert asyncio.run(acached_message(SimpleNamespace(messages=async_messages), **REQUEST)) == "Hi there"
+
+    assert len(messages.calls) == 1
+    assert async_messages.calls == []
+    assert messages.calls[0]["messages"] == [{"role": "user", "content": "Hello"}]
+
+
+def test_base_agent_calls_go_through_the_shared_helpers(cache, monkeypatch):
+    agent = object.__new__(BaseAgent)
+    agent.name = "TestAgent"
+    agent.model = "claude-test"
+    agent.max_tokens = 500
+    agent.temperature = 0.5
+    agent.logger = logging.getLogger("test_response_cache")
+    agent.api_key = "test-key"
+    agent.client = SimpleNamespace(messages=FakeMessages("From the API"))
+    async_client = SimpleNamespace(messages=FakeAsyncMessages("From the async API"))
+    monkeypatch.setattr("agents.base_agent.get_async_client", lambda api_key: async_client)
+
+    # The same request as the module-level helpers: one shared cache entry
+    cached_message(agent.client, **REQUEST)
+    assert agent.call_claude("You are a tester.", "Hello") == "From the API"
+    assert "".join(agent.stream_claude("You are a tester.", "Hello")) == "From the API"
+    assert len(agent.client.messages.calls) == 1
+
+    assert asyncio.run(agent.acall_claude("You are a tester.", "Something new")) == "From the async API"
+    assert agent.call_claude("You are a tester.", "Something new") == "From the async API"
+    assert len(async_client.messages.calls) == 1
@@ -0,0 +1,66 @@
+import threading
+
+import pytest
+
+pytest.importorskip("anthropic")
+
+from agents.synthesis_subagents.script_writer import ScriptWriter
+
+OUTLINE = """[00:00-01:00] COLD OPEN - Hook
+[01:00-03:00] ACT 1 - The myth
+[03:00-05:00] ACT 2 - The reveal"""
+
+
+@pytest.fixture
+def writer(monkeypatch):
+    """A ScriptWriter whose Claude calls are replaced by stubs."""
+    agent = object.__new__(ScriptWriter)
+    agent.section_concurrency = 3
+    agent.attempts = {}
+    agent.failures = {}
+    lock = threading.Lock()
+
+    def write_section(shared_context, outline_text, outline, index):
+        with lock:
+            agent.attempts[index] = agent.attempts.get(index, 0) + 1
+            if agent.failures.get(index, 0) >= agent.attempts[index]:
+                raise RuntimeError("overloaded")
+        return f"{outline[index]['timecode']} SECTION {index}"
+
+    monkeypatch.setattr(agent, "_generate_outline", lambda shared_context, duration: OUTLINE)
+    monkeypatch.setattr(agent, "_write_section", write_section)
+    monkeypatch.setattr(agent, "_smooth_transitions", lambda outline, sections: sections)
+    return agent
+
+
+def test_failed_section_is_retried_alone(writer):
+    writer.failures = {1: 1}
+
+    script = writer._write_sectioned_script("context", 5)
+
+    assert script.split("\n\n---\n\n") == [
+        "[00:00-01:00] SECTION 0", "[01:00-03:00] SECTION 1", "[03:00-05:00] SECTION 2"
+    ]
+    assert writer.attempts == {0: 1, 1: 2, 2: 1}
+
+
+def test_section_failing_its_retry_falls_back_to_single_call(writer):
+    writer.failures = {2: 2}
+
+    assert writer._write_sectioned_script("context", 5) is None
+    assert writer.attempts[2] == 2
+
+
+def test_empty_section_counts_as_a_failure(writer, monkeypatch):
+    monkeypatch.setattr(writer, "_write_section", lambda *args: "")
+
+    assert writer._write_sectioned_script("context", 5) is None
+
+
+def test_failed_outline_falls_back_to_single_call(writer, monkeypatch):
+    def fail(shared_context, duration):
+        raise RuntimeError("overloaded")
+
+    monkeypatch.setattr(writer, "_generate_outline", fail)
+
+    assert writer._write_sectioned_script("context", 5) is None
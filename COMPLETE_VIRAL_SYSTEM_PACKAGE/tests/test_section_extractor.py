@@ -0,0 +1,231 @@
+import re
+
+import pytest
+
+from agents.section_extractor import DocumentSpec, SectionRule, extract
+
+ENGAGEMENT = """ENGAGEMENT STRATEGY
+
+1. RETENTION CURVE
+Predicted average retention: 62% of viewers reach the end
+
+2. MINUTE-BY-MINUTE BREAKDOWN
+
+[MINUTES 0-2: Opening & Hook]
+PACING: Fast - new visual every 3 seconds
+Goal: earn the next minute
+
+[MINUTES 2-5: The Science]
+PACING: Medium
+Explain the emotion-regulation model
+
+[MINUTE 5-6: Turning Point] PACING: Slow
+Let the reveal land
+
+3. RETENTION CHECKPOINTS
+
+CHECKPOINT 1: 2:30
+- Technique: open loop about the lab study
+- Why: first drop-off point
+
+CHECKPOINT 2: 5:00
+- Technique: pattern interrupt
+"""
+
+TRIGGERS = """PSYCHOLOGICAL TRIGGER ANALYSIS
+
+CURIOSITY GAP: Open a question in the first 10 seconds
+Effectiveness: 9/10
+Placement: 0:00-0:10
+
+SOCIAL PROOF: "Millions of people procrastinate daily"
+Effectiveness: 7.5/10
+
+IDENTITY: Viewers who see themselves as "lazy"
+Effectiveness: 8/10
+
+SHARING PSYCHOLOGY
+People share this because it reframes a personal flaw.
+It makes the sharer look insightful.
+
+OVERALL VIRAL PSYCHOLOGY: 8.5/10
+"""
+
+SCRIPT = """DOCUMENTARY SCRIPT: The Science of Procrastination
+
+[00:00-00:30] COLD OPEN:
+NARRATOR: You'd think procrastination is laziness.
+    (beat)
+"It isn't. [PAUSE] It's fear."
+
+[00:30-02:00] ACT 1: THE MYTH:
+NARRATOR: For decades we blamed time management.
+
+[02:00-03:00] ACT 2:
+NARRATOR: Then a lab in Ottawa found something else.
+"""
+
+VISUALS = """VISUAL ARCHITECTURE
+
+SCENE 1: The Empty Desk
+TIMECODE: 00:00-00:30
+SCRIPT REFERENCE: "You'd think procrastination is laziness."
+
+Shot 1:
+- SHOT TYPE: CU
+- SUBJECT: A blinking cursor
+
+B-ROLL NEEDED:
+- Clock hands spinning
+- Phone notifications piling up
+GRAPHICS/ANIMATIONS:
+- Animated brain scan
+
+SCENE 2: The Lab
+TIMECODE: 00:30-02:00
+
+B-ROLL NEEDED:
+- Researchers at a whiteboard
+LIGHTING MOOD: Soft
+"""
+
+
+# =================================================================
+# The extractor itself
+# =================================================================
+
+def test_sections_fields_items_and_lines():
+    spec = DocumentSpec(
+        "test_basic",
+        sections={
+            "part": SectionRule(
+                header=re.compile(r"^PART (?P<title>\d+)"),
+                end=re.compile(r"^END"),
+                fields={"mood": re.compile(r"MOOD:(.*)")},
+                item=re.compile(r"^\s*-\s*(.*)$")
+            )
+        },
+        values={"score": re.compile(r"SCORE: (\d+)")}
+    )
+    text = "intro\nPART 1 MOOD: calm\n- first\nbody line\nMOOD: tense\nEND\nignored\nPART 2\nSCORE: 7"
+
+    index = extract(text, spec)
+    first, second = index["sections"]["part"]
+
+    assert first["title"] == "1"
+    assert first["fields"] == {"mood": ["calm", "tense"]}  # header line fields count too
+    assert first["items"] == ["first"]
+    assert first["lines"] == ["body line"]
+    assert second["title"] == "2" and second["line_number"] == 7
+    assert index["values"]["score"] == ["7"]
+
+
+def test_parse_is_memoized_per_text_and_spec():
+    spec = DocumentSpec("test_memo", values={"n": re.compile(r"(\d+)")})
+    assert extract("a 1", spec) is extract("a 1", spec)
+    assert extract("a 2", spec) is not extract("a 1", spec)
+
+
+def test_spans_and_paragraphs():
+    spec = DocumentSpec(
+        "test_spans",
+        spans={"why": re.compile(r"WHY")},
+        paragraph_fields={"name": re.compile(r"^([^:]*):")}
+    )
+    index = extract("A: one\n\nWHY it works\nsecond line\n\nB: two", spec)
+
+    assert index["spans"]["why"] == " it works\nsecond line"
+    assert [p["fields"].get("name") for p in index["paragraphs"]] == ["A", None, "B"]
+
+
+# =================================================================
+# The four agent specs, through their accessors
+# (expected values match the parsers these specs replaced, except
+# where noted)
+# =================================================================
+
+@pytest.fixture
+def agent():
+    """Build an agent for its accessors only (no API client needed)."""
+    pytest.importorskip("anthropic")
+
+    def build(agent_cls):
+        return object.__new__(agent_cls)
+
+    return build
+
+
+def test_engagement_strategy(agent):
+    from agents.viral_subagents.engagement_optimizer import EngagementOptimizer
+    optimizer = agent(EngagementOptimizer)
+    state = {"engagement_strategy": ENGAGEMENT}
+
+    checkpoints = optimizer.get_retention_checkpoints(state)
+    # The section heading mentions "CHECKPOINT" too, as it always has
+    assert [c["line"] for c in checkpoints] == [
+        "3. RETENTION CHECKPOINTS", "CHECKPOINT 1: 2:30", "CHECKPOINT 2: 5:00"
+    ]
+    assert checkpoints[1]["details"] == ["- Technique: open loop about the lab study", "- Why: first drop-off point"]
+
+    # "MINUTE-BY-MINUTE BREAKDOWN" is not a segment; a header may carry its pacing
+    assert optimizer.get_pacing_breakdown(state) == {
+        "fast": ["[MINUTES 0-2: Opening & Hook]"],
+        "medium": ["[MINUTES 2-5: The Science]"],
+        "slow": ["[MINUTE 5-6: Turning Point] PACING: Slow"]
+    }
+
+
+def test_pacing_line_mentioning_minute_is_not_a_segment(agent):
+    from agents.viral_subagents.engagement_optimizer import EngagementOptimizer
+    optimizer = agent(EngagementOptimizer)
+
+    # The old parser reported the PACING line itself here; the segment is what's meant
+    state = {"engagement_strategy": "[MINUTES 0-2: Hook]\nPACING: Fast - new visual every minute"}
+    assert optimizer.get_pacing_breakdown(state)["fast"] == ["[MINUTES 0-2: Hook]"]
+
+
+def test_trigger_analysis(agent):
+    from agents.viral_subagents.psychology_trigger_detector import PsychologyTriggerDetector
+    detector = agent(PsychologyTriggerDetector)
+    state = {"psychology_triggers": TRIGGERS, "viral_psychology_score": 8.5}
+
+    # Each trigger keeps its OWN effectiveness (the old parser paired
+    # paragraphs with a separate score list by position)
+    top = detector.get_top_triggers(state)
+    assert [(t["name"], t["effectiveness"]) for t in top] == [
+        ("CURIOSITY GAP", 9.0), ("IDENTITY", 8.0), ("SOCIAL PROOF", 7.5)
+    ]
+
+    assert detector.get_sharing_psychology(state) == {
+        "analysis": "\nPeople share this because it reframes a personal flaw.\nIt makes the sharer look insightful.",
+        "viral_score": 8.5
+    }
+
+
+def test_script_sections(agent):
+    from agents.synthesis_subagents.script_writer import ScriptWriter
+    writer = agent(ScriptWriter)
+
+    sections = writer.get_script_sections({"documentary_script": SCRIPT})
+    assert [s["timecode"] for s in sections] == ["[00:00-00:30]", "[00:30-02:00]", "[02:00-03:00]"]
+    # Body lines are kept as written, including indentation and [PAUSE] cues
+    assert sections[0]["content"] == [
+        "NARRATOR: You'd think procrastination is laziness.",
+        "    (beat)",
+        "\"It isn't. [PAUSE] It's fear.\""
+    ]
+
+
+def test_visual_architecture(agent):
+    from agents.synthesis_subagents.visual_scene_architect import VisualSceneArchitect
+    architect = agent(VisualSceneArchitect)
+    state = {"visual_architecture": VISUALS}
+
+    scenes = architect.get_scene_list(state)
+    assert [(s["name"], s["timecode"]) for s in scenes] == [
+        ("The Empty Desk", "00:00-00:30"), ("The Lab", "00:30-02:00")
+    ]
+
+    assert architect.get_broll_list(state) == [
+        "Clock hands spinning", "Phone notifications piling up", "Researchers at a whiteboard"
+    ]
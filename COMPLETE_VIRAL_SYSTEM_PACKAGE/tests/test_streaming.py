@@ -0,0 +1,59 @@
+import re
+
+import pytest
+
+pytest.importorskip("anthropic")
+
+from agents.streaming import SectionConsumer, consume_stream
+
+SCRIPT = (
+    "Intro text before any section\n"
+    "[00:00-00:30] Cold open\n"
+    "You'd think procrastination is laziness.\n"
+    "[00:30-01:15] The science\n"
+    "It is emotional regulation.\n"
+    "Not time management.\n"
+    "[01:15-02:00] The fix\n"
+    "Start with two minutes."
+)
+
+HEADER = re.compile(r"^\[(?P<title>\d+:\d+-\d+:\d+)\]")
+
+
+def split_into_deltas(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize("delta_size", [1, 3, 7, 1000])
+def test_sections_are_the_same_however_the_stream_is_cut(delta_size):
+    reported = []
+    consumer = SectionConsumer(HEADER, reported.append)
+
+    text = consume_stream(split_into_deltas(SCRIPT, delta_size), [consumer])
+
+    assert text == SCRIPT
+    assert [section["title"] for section in reported] == ["00:00-00:30", "00:30-01:15", "01:15-02:00"]
+    assert [section["index"] for section in reported] == [0, 1, 2]
+    assert reported[1]["text"] == "[00:30-01:15] The science\nIt is emotional regulation.\nNot time management."
+    assert reported[2]["text"].endswith("Start with two minutes.")
+    assert consumer.sections == reported
+
+
+def test_section_is_reported_as_soon_as_the_next_header_arrives():
+    reported = []
+    consumer = SectionConsumer(HEADER, reported.append)
+
+    consumer.feed("[00:00-00:30] Cold open\nFirst line\n[00:30-01:")
+    assert reported == []  # next header line not finished yet
+
+    consumer.feed("15] The science\n")
+    assert [section["title"] for section in reported] == ["00:00-00:30"]
+
+    consumer.close()
+    assert [section["title"] for section in reported] == ["00:00-00:30", "00:30-01:15"]
+
+
+def test_stream_without_headers_reports_nothing():
+    reported = []
+    consume_stream(["just some ", "text\nwith lines"], [SectionConsumer(HEADER, reported.append)])
+    assert reported == []
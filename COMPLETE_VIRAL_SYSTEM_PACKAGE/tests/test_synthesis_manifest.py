@@ -0,0 +1,22 @@
+from agents.synthesis_manifest import MANIFEST_VERSION, SynthesisManifest, content_hash
+
+
+def test_manifest_reuses_only_matching_inputs():
+    manifest = SynthesisManifest()
+    key = content_hash("visuals", "topic", 10, "section text")
+    manifest.record("visuals", key, "SCENE 1: Lab")
+
+    restored = SynthesisManifest(manifest.to_dict())
+    assert restored.lookup("visuals", key) == "SCENE 1: Lab"
+    assert restored.lookup("visuals", content_hash("visuals", "topic", 10, "edited text")) is None
+    assert restored.lookup("notes", key) is None
+
+
+def test_manifest_ignores_outdated_versions():
+    data = {"version": MANIFEST_VERSION + 1, "artifacts": {"visuals": {"key": "old"}}}
+    assert SynthesisManifest(data).lookup("visuals", "key") is None
+    assert SynthesisManifest(None).to_dict() == {"version": MANIFEST_VERSION, "artifacts": {}}
+
+
+def test_content_hash_separates_parts():
+    assert content_hash("ab", "c") != content_hash("a", "bc")
@@ -0,0 +1,73 @@
+from agents.query_cache import collection_version
+from agents.technique_writer import (
+    CONTENT_HASH_KEY,
+    TechniqueWriter,
+    document_fingerprint,
+    normalize_video_url,
+    video_technique_id,
+)
+
+
+def video_metadata(analyzed_at):
+    return {
+        "video_url": "https://www.youtube.com/watch?v=abc123",
+        "video_title": "How Procrastination Works",
+        "viral_score": "8.5",
+        "analyzed_at": analyzed_at,
+    }
+
+
+def test_same_video_gets_same_id_however_the_url_is_written():
+    assert normalize_video_url("https://www.youtube.com/watch?v=abc123&t=30s") == "youtube:abc123"
+    assert video_technique_id("youtu.be/abc123") == video_technique_id("https://youtube.com/shorts/abc123")
+
+
+def test_fingerprint_ignores_volatile_metadata():
+    first = document_fingerprint("analysis", video_metadata("2026-01-01T10:00:00"))
+    second = document_fingerprint("analysis", video_metadata("2026-03-05T18:30:00"))
+    assert first == second
+
+    changed = dict(video_metadata("2026-01-01T10:00:00"), viral_score="9.0")
+    assert document_fingerprint("analysis", changed) != first
+
+
+def test_reanalysed_identical_video_writes_nothing(collection):
+    doc_id = video_technique_id("https://www.youtube.com/watch?v=abc123")
+
+    writer = TechniqueWriter(collection)
+    writer.add(doc_id, "analysis", video_metadata("2026-01-01T10:00:00"))
+    assert writer.flush() == 1
+    version = collection_version(collection)
+
+    writer.add(doc_id, "analysis", video_metadata("2026-03-05T18:30:00"))
+    assert writer.flush() == 0
+
+    assert len(collection.upserts) == 1
+    assert writer.unchanged == 1
+    assert collection_version(collection) == version
+    # The stored entry keeps its original timestamp
+    assert collection.records[doc_id][1]["analyzed_at"] == "2026-01-01T10:00:00"
+
+
+def test_changed_document_is_rewritten_and_bumps_version(collection):
+    writer = TechniqueWriter(collection)
+    writer.add("video_1", "first analysis", video_metadata("2026-01-01T10:00:00"))
+    writer.flush()
+    version = collection_version(collection)
+
+    writer.add("video_1", "better analysis", video_metadata("2026-01-02T10:00:00"))
+    assert writer.flush() == 1
+
+    assert collection.records["video_1"][0] == "better analysis"
+    assert CONTENT_HASH_KEY in collection.records["video_1"][1]
+    assert collection_version(collection) == version + 1
+
+
+def test_full_buffer_flushes_in_batches_and_reports_ids(collection):
+    flushed = []
+    with TechniqueWriter(collection, batch_size=2, on_flush=flushed.append) as writer:
+        for number in range(5):
+            writer.add(f"doc_{number}", f"text {number}")
+
+    assert collection.upserts == [["doc_0", "doc_1"], ["doc_2", "doc_3"], ["doc_4"]]
+    assert flushed == collection.upserts
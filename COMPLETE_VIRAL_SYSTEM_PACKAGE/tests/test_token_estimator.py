@@ -0,0 +1,132 @@
+import json
+
+import pytest
+
+from agents import token_estimator
+from agents.token_estimator import (
+    estimate_tokens,
+    fit_max_tokens,
+    heuristic_tokens,
+    tokens_for_words,
+    truncate_to_tokens,
+)
+
+PROSE = (
+    "Procrastination is not a time management problem. Researchers now "
+    "describe it as an emotion regulation problem: we delay tasks that "
+    "make us feel anxious, bored or insecure, and the short-term relief "
+    "rewards the delay. "
+) * 20
+JSON_COMPACT = json.dumps(
+    {"findings": [{"title": "Dopamine and reward", "year": 2019, "citations": 1234, "score": 8.5}] * 30},
+    separators=(",", ":")
+)
+CJK = "拖延症是一种情绪调节问题，而不是时间管理问题。" * 40
+URL = "https://example.com/research/" + "a1b2c3" * 200
+
+SAMPLES = {"prose": PROSE, "json": JSON_COMPACT, "cjk": CJK, "url": URL}
+
+
+@pytest.fixture
+def heuristic(monkeypatch):
+    """Force the rough local rule, whether or not tiktoken is available."""
+    monkeypatch.setattr(token_estimator, "_get_encoding", lambda: None)
+
+
+class CharEncoding:
+    """Stand-in tokenizer: one token per character."""
+
+    def encode(self, text, disallowed_special=()):
+        return [ord(char) for char in text]
+
+    def decode(self, tokens):
+        return "".join(chr(token) for token in tokens)
+
+
+@pytest.fixture
+def char_encoding(monkeypatch):
+    monkeypatch.setattr(token_estimator, "_get_encoding", lambda: CharEncoding())
+
+
+def test_heuristic_costs(heuristic):
+    assert estimate_tokens("") == 0
+    assert estimate_tokens(None) == 0
+    assert heuristic_tokens("procrastination") == 3  # 15 letters / 6
+    assert heuristic_tokens("2024") == 2
+    assert heuristic_tokens('{"a":1}') == 7
+    assert heuristic_tokens("日本語") == 3
+    assert heuristic_tokens("one two") == 2  # a single space is free
+
+
+@pytest.mark.parametrize("name", list(SAMPLES))
+def test_heuristic_estimate_is_plausible(heuristic, name):
+    text = SAMPLES[name]
+    tokens = estimate_tokens(text)
+
+    # Somewhere between "one token per character" and "one per 8 characters"
+    assert len(text) / 8 < tokens <= len(text) * token_estimator.DEFAULT_SCALE + 1
+
+
+@pytest.mark.parametrize("name", list(SAMPLES))
+@pytest.mark.parametrize("budget", [20, 200])
+def test_truncation_fits_and_keeps_content(heuristic, name, budget):
+    text = SAMPLES[name]
+    result = truncate_to_tokens(text, budget)
+
+    assert result.endswith(" ...")
+    assert estimate_tokens(result) <= budget
+    assert text.startswith(result[:-len(" ...")])
+    # Never reduced to just the marker, even without any whitespace
+    assert len(result) > len(" ...") + 5
+
+
+def test_truncation_prefers_whole_words(heuristic):
+    result = truncate_to_tokens(PROSE, 30)
+    kept = result[:-len(" ...")]
+    assert PROSE[len(kept)] in " ,.:"
+
+
+def test_text_within_budget_is_unchanged(heuristic):
+    assert truncate_to_tokens("short text", 100) == "short text"
+    assert truncate_to_tokens(None, 100) == ""
+
+
+@pytest.mark.parametrize("name", list(SAMPLES))
+def test_truncation_with_a_tokenizer(char_encoding, name):
+    text = SAMPLES[name]
+    result = truncate_to_tokens(text, 100)
+
+    assert estimate_tokens(result) <= 100
+    assert text.startswith(result[:-len(" ...")])
+    assert len(result) > 50
+
+
+def test_sizing_helpers():
+    assert tokens_for_words(100) == 135
+    assert fit_max_tokens(1_000, 4_000) == 4_000
+    assert fit_max_tokens(199_000, 4_000) == 990
+    assert fit_max_tokens(199_990, 4_000) == 256
+
+
+def real_encoding():
+    encoding = None
+    if token_estimator.TIKTOKEN_AVAILABLE:
+        try:
+            encoding = token_estimator.tiktoken.get_encoding(token_estimator.TIKTOKEN_ENCODING)
+        except Exception:
+            pass
+    if encoding is None:
+        pytest.skip("tiktoken encoding not available (offline?)")
+    return encoding
+
+
+@pytest.mark.parametrize("name", list(SAMPLES))
+def test_heuristic_is_calibrated_against_tiktoken(name):
+    encoding = real_encoding()
+    text = SAMPLES[name]
+
+    real = len(encoding.encode(text, disallowed_special=()))
+    ratio = heuristic_tokens(text) / real
+
+    # Budgets stay usable: never wildly off in either direction
+    assert 0.6 <= ratio <= 1.8, f"{name}: heuristic {heuristic_tokens(text)} vs tiktoken {real}"
@@ -0,0 +1,89 @@
+import pytest
+
+pytest.importorskip("anthropic")
+
+from agents.gatekeepers import viral_analyst_gatekeeper as gatekeeper_module
+from agents.gatekeepers.viral_analyst_gatekeeper import ViralAnalystGatekeeper
+
+
+class FakePatterns:
+    def analyze_patterns(self, state):
+        state["viral_patterns"] = "Pattern: open loop, viral hook structure " * 20
+        # In-place change of an existing list must still be merged
+        state["notes"].append("patterns done")
+        return state
+
+
+class FakeHooks:
+    def generate_hooks(self, state):
+        state["viral_hooks"] = "Hook 1: You'd think procrastination is laziness."
+        return state
+
+
+class FailingEngagement:
+    def optimize_engagement(self, state):
+        # Same failure convention as the real sub-agents
+        state["engagement_strategy"] = "Optimization failed: 529 overloaded"
+        state["engagement_optimization_score"] = 0.0
+        return state
+
+
+class FakeEngagement:
+    def optimize_engagement(self, state):
+        state["engagement_strategy"] = "Pattern interrupt every 90 seconds for engagement."
+        return state
+
+
+class FakeTriggers:
+    def detect_triggers(self, state):
+        state["psychology_triggers"] = "Curiosity gap trigger at 0:05 (psychological)."
+        return state
+
+
+def use_subagents(monkeypatch, engagement_cls):
+    monkeypatch.setattr(gatekeeper_module, "VIRAL_SUBAGENTS", [
+        ("pattern_analyzer", FakePatterns, "analyze_patterns", "viral_patterns", "Pattern analysis failed"),
+        ("hook_generator", FakeHooks, "generate_hooks", "viral_hooks", "Hook generation failed"),
+        ("engagement_optimizer", engagement_cls, "optimize_engagement",
+         "engagement_strategy", "Optimization failed"),
+        ("psychology_trigger_detector", FakeTriggers, "detect_triggers",
+         "psychology_triggers", "Trigger analysis failed"),
+    ])
+
+
+@pytest.fixture
+def gatekeeper(monkeypatch):
+    monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+    return ViralAnalystGatekeeper()
+
+
+def initial_state():
+    return {"topic": "Procrastination", "viral_analysis_mode": "fanout", "notes": ["start"], "errors": []}
+
+
+def test_fanout_merges_every_subagent(monkeypatch, gatekeeper):
+    use_subagents(monkeypatch, FakeEngagement)
+    state = initial_state()
+
+    result = gatekeeper.execute(state)
+
+    assert result["notes"] == ["start", "patterns done"]
+    assert state["notes"] == ["start"]  # caller's state untouched
+    assert result["viral_hooks"].startswith("Hook 1")
+    assert result["errors"] == []
+    assert set(result["viral_analysis"]) == {"analysis_complete", "mode", "raw_analysis", "timestamp"}
+    assert result["viral_analysis"]["analysis_complete"] is True
+    assert "=== HOOK GENERATOR ===" in result["viral_analysis"]["raw_analysis"]
+    assert result["viral_confidence"] > 0.5
+
+
+def test_failed_subagent_is_reported_and_caps_confidence(monkeypatch, gatekeeper):
+    use_subagents(monkeypatch, FailingEngagement)
+
+    result = gatekeeper.execute(initial_state())
+
+    assert result["viral_analysis"]["analysis_complete"] is False
+    assert "Optimization failed" not in result["viral_analysis"]["raw_analysis"]
+    assert any("engagement_optimizer failed" in error for error in result["errors"])
+    assert result["viral_confidence"] <= gatekeeper_module.FAILED_SUBAGENT_MAX_CONFIDENCE
+    assert result["viral_optimization_ready"] is False
@@ -0,0 +1,174 @@
+"""
+Agent Pool - Reusable, Pre-Built Agents for Batch Runs
+
+This file keeps a small pool of agents that have ALREADY been constructed,
+so batch jobs (many topics, many videos) don't rebuild every agent per item.
+
+EXPLANATION FOR BEGINNERS:
+- Building an agent reads the API key, fetches the Anthropic client and sets
+  up prompts and config - cheap once, wasteful a few hundred times
+- Agents don't remember anything between runs (results live in "state"),
+  so the same agent object can safely handle topic after topic
+- acquire() hands out an idle agent (or builds one if none are idle)
+- release() puts it back for the next topic
+- Two threads never get the same agent at the same time
+
+Together with agents/client_registry.py this means a batch run keeps both
+its agents AND its HTTP connections warm from the first topic to the last.
+
+USAGE EXAMPLE:
+    from agents.agent_pool import get_agent_pool
+    from agents.viral_subagents.hook_generator import HookGenerator
+
+    pool = get_agent_pool()
+    pool.warm(HookGenerator, count=4)   # optional: build 4 up front
+
+    for state in topic_states:
+        with pool.lease(HookGenerator) as hook_gen:
+            hook_gen.generate_hooks(state)
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from contextlib import contextmanager
+import threading
+
+
+class AgentPool:
+    """
+    Thread-safe pool of idle agent instances, grouped by class + constructor args.
+
+    Agents built with different arguments (e.g. a different db_path) are kept
+    apart, so acquire() only ever returns an agent configured the way you asked.
+    """
+
+    def __init__(self, max_idle_per_kind: int = 8):
+        """
+        Create an empty pool.
+
+        Args:
+            max_idle_per_kind: Most idle agents kept per class/arguments combination
+                (extra released agents are simply dropped)
+        """
+        self.max_idle_per_kind = max_idle_per_kind
+        self._idle: Dict[Tuple, List[Any]] = {}
+        self._kinds: Dict[int, Tuple] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _pool_key(agent_cls: type, args: tuple, kwargs: Dict[str, Any]) -> Tuple:
+        """Build the key that groups interchangeable agents together."""
+        return (agent_cls, args, tuple(sorted(kwargs.items())))
+
+    def acquire(self, agent_cls: type, *args, **kwargs) -> Any:
+        """
+        Get an agent of this class - reused if one is idle, built otherwise.
+
+        Args:
+            agent_cls: Agent class (e.g. HookGenerator)
+            *args, **kwargs: Constructor arguments (must be hashable)
+
+        Returns:
+            Agent instance, exclusively yours until release()
+        """
+        key = self._pool_key(agent_cls, args, kwargs)
+
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop()
+
+        # Nothing idle - build outside the lock so other threads aren't blocked
+        agent = agent_cls(*args, **kwargs)
+
+        with self._lock:
+            self._kinds[id(agent)] = key
+
+        return agent
+
+    def release(self, agent: Any):
+        """
+        Return an agent to the pool so the next acquire() can reuse it.
+
+        Args:
+            agent: Agent previously returned by acquire()
+        """
+        with self._lock:
+            key = self._kinds.get(id(agent))
+            if key is None:
+                # Not one of ours - nothing to do
+                return
+
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_kind:
+                idle.append(agent)
+            else:
+                del self._kinds[id(agent)]
+
+    @contextmanager
+    def lease(self, agent_cls: type, *args, **kwargs):
+        """
+        Borrow an agent for the duration of a "with" block.
+
+        The agent goes back to the pool even if the block raises.
+        """
+        agent = self.acquire(agent_cls, *args, **kwargs)
+        try:
+            yield agent
+        finally:
+            self.release(agent)
+
+    def warm(self, agent_cls: type, count: int = 1, *args, **kwargs):
+        """
+        Build agents ahead of time so the first topics don't pay for it.
+
+        Args:
+            agent_cls: Agent class to pre-build
+            count: How many idle agents to have ready
+            *args, **kwargs: Constructor arguments
+        """
+        agents = [self.acquire(agent_cls, *args, **kwargs) for _ in range(count)]
+        for agent in agents:
+            self.release(agent)
+
+    def clear(self):
+        """Forget every pooled agent."""
+        with self._lock:
+            self._idle.clear()
+            self._kinds.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Count idle agents by class name.
+
+        Returns:
+            Dictionary of {class_name: idle_count}
+        """
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for (agent_cls, _, _), idle in self._idle.items():
+                counts[agent_cls.__name__] = counts.get(agent_cls.__name__, 0) + len(idle)
+            return counts
+
+
+# =================================================================
+# PROCESS-WIDE DEFAULT POOL
+# =================================================================
+
+_default_pool: Optional[AgentPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_agent_pool() -> AgentPool:
+    """
+    Get the shared agent pool used by batch runs (created on first use).
+
+    Returns:
+        The shared AgentPool
+    """
+    global _default_pool
+
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = AgentPool()
+
+    return _default_pool
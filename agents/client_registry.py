@@ -0,0 +1,236 @@
+"""
+Client Registry - Shared Anthropic Clients for All Agents
+
+This file hands out SHARED Anthropic clients so that every agent in the
+system talks to Claude through the same pool of HTTP connections.
+
+EXPLANATION FOR BEGINNERS:
+- Every Anthropic client owns a pool of HTTP connections
+- Opening a new connection costs a TCP + TLS handshake (slow!)
+- If every agent builds its own client, every agent pays that cost
+- If all agents share one client, they reuse the same warm connections
+  ("keep-alive" connections stay open between requests)
+- The ASYNC client lets many requests wait on the network at the same time
+  (instead of one agent blocking while Claude thinks)
+
+IMPORTANT DETAIL:
+Async HTTP connections belong to the event loop that opened them, so we keep
+one async client per event loop. When the loop goes away, so does its client.
+The normal (sync) client is shared by the whole process.
+
+To run async calls from normal code, use run_coroutine(): it runs them on
+ONE long-lived background event loop, so they all share that loop's client
+(asyncio.run() would build a new loop - and a new connection pool - every
+time).
+
+CONFIGURATION (environment variables, all optional):
+- ANTHROPIC_MAX_CONNECTIONS: Requests in flight at once (default: 20)
+- ANTHROPIC_MAX_KEEPALIVE: Idle connections kept warm (default: 10)
+- ANTHROPIC_KEEPALIVE_EXPIRY: Seconds an idle connection stays open (default: 30)
+Or call configure_pool() in code before the first agent is created.
+
+USAGE EXAMPLE:
+    from agents.client_registry import get_client, get_async_client
+
+    client = get_client(api_key)             # in normal code
+    client = get_async_client(api_key)       # inside "async def" code
+    result = run_coroutine(some_async_call())  # async code, from normal code
+"""
+
+from typing import Any, Coroutine, Dict, Optional
+import asyncio
+import os
+import threading
+import weakref
+
+import httpx
+from anthropic import Anthropic, AsyncAnthropic
+
+# Connection pool limits shared by every agent
+# - MAX_CONNECTIONS: how many HTTP requests can be in flight at once
+# - MAX_KEEPALIVE_CONNECTIONS: how many idle connections we keep warm for reuse
+# - KEEPALIVE_EXPIRY_SECONDS: how long an idle connection stays open
+MAX_CONNECTIONS = int(os.getenv("ANTHROPIC_MAX_CONNECTIONS", 20))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("ANTHROPIC_MAX_KEEPALIVE", 10))
+KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("ANTHROPIC_KEEPALIVE_EXPIRY", 30.0))
+
+# One sync client per API key, shared by the whole process
+_sync_clients: Dict[str, Anthropic] = {}
+
+# One dictionary of {api_key: client} per event loop
+# WeakKeyDictionary drops the entry automatically when the loop is garbage collected
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, AsyncAnthropic]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# Agents may be created from several threads - guard the registry
+_registry_lock = threading.Lock()
+
+# Background event loop used by run_coroutine() (started on first use)
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _pool_limits() -> httpx.Limits:
+    """Build the connection pool limits used by every shared client."""
+    return httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS
+    )
+
+
+def configure_pool(
+    max_connections: Optional[int] = None,
+    max_keepalive_connections: Optional[int] = None,
+    keepalive_expiry: Optional[float] = None
+):
+    """
+    Change the connection pool limits used by shared clients.
+
+    Call this BEFORE creating agents - clients that already exist keep the
+    limits they were built with. Use reset_clients() to rebuild them.
+
+    Args:
+        max_connections: Requests in flight at once
+        max_keepalive_connections: Idle connections kept warm for reuse
+        keepalive_expiry: Seconds an idle connection stays open
+    """
+    global MAX_CONNECTIONS, MAX_KEEPALIVE_CONNECTIONS, KEEPALIVE_EXPIRY_SECONDS
+
+    with _registry_lock:
+        if max_connections is not None:
+            MAX_CONNECTIONS = max_connections
+        if max_keepalive_connections is not None:
+            MAX_KEEPALIVE_CONNECTIONS = max_keepalive_connections
+        if keepalive_expiry is not None:
+            KEEPALIVE_EXPIRY_SECONDS = keepalive_expiry
+
+
+def get_client(api_key: str) -> Anthropic:
+    """
+    Get the shared (sync) Anthropic client for this API key.
+
+    The first call creates the client and its connection pool. Every later
+    call - from any agent, in any thread - gets the SAME client back, so TLS
+    handshakes are paid once per connection instead of once per agent.
+
+    Args:
+        api_key: Anthropic API key
+
+    Returns:
+        Shared Anthropic client
+    """
+    with _registry_lock:
+        client = _sync_clients.get(api_key)
+
+        if client is None:
+            http_client = httpx.Client(limits=_pool_limits(), follow_redirects=True)
+            # max_retries=0: retries are handled by the shared rate limiter
+            # (agents/rate_limiter.py) - SDK retries on top would multiply them
+            client = Anthropic(api_key=api_key, http_client=http_client, max_retries=0)
+            _sync_clients[api_key] = client
+
+    return client
+
+
+def reset_clients():
+    """
+    Close and forget every shared sync client.
+
+    The next get_client() call builds a fresh client (picking up any new
+    configure_pool() limits). Async clients are released with their event loop.
+    """
+    with _registry_lock:
+        clients = list(_sync_clients.values())
+        _sync_clients.clear()
+
+    for client in clients:
+        try:
+            client.close()
+        except Exception:
+            pass
+
+
+def get_async_client(api_key: str) -> AsyncAnthropic:
+    """
+    Get the shared async Anthropic client for the current event loop.
+
+    The first call on an event loop creates the client (and its connection
+    pool). Every later call on the same loop - from any agent - gets the
+    SAME client back, so connections are reused instead of re-opened.
+
+    Args:
+        api_key: Anthropic API key
+
+    Returns:
+        Shared AsyncAnthropic client
+
+    Raises:
+        RuntimeError: If called outside a running event loop
+    """
+    # Only valid inside "async def" code - async clients need a running loop
+    loop = asyncio.get_running_loop()
+
+    with _registry_lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(api_key)
+
+        if client is None:
+            # First request on this loop - build the pooled client
+            http_client = httpx.AsyncClient(limits=_pool_limits(), follow_redirects=True)
+            client = AsyncAnthropic(api_key=api_key, http_client=http_client, max_retries=0)
+            clients[api_key] = client
+
+    return client
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """Start the shared background event loop (once) and return it."""
+    global _background_loop
+
+    with _registry_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            # Daemon thread: never keeps the program alive on exit
+            threading.Thread(
+                target=loop.run_forever,
+                name="anthropic-async-loop",
+                daemon=True
+            ).start()
+            _background_loop = loop
+
+    return _background_loop
+
+
+def run_coroutine(coroutine: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Run async code from normal (non-async) code and wait for its result.
+
+    Every call runs on the same background event loop, so
+    get_async_client() inside it always returns the same client and the
+    connection pool stays warm between calls. Safe to call from several
+    threads at once.
+
+    Args:
+        coroutine: The async call to run, e.g. asyncio.gather(...)
+
+    Returns:
+        Whatever the coroutine returns (its exception is raised here)
+
+    Raises:
+        RuntimeError: If called from the background loop itself
+            (async code should simply "await" instead)
+    """
+    loop = _get_background_loop()
+
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+
+    if running is loop:
+        # Waiting here would block the loop that has to do the work
+        coroutine.close()
+        raise RuntimeError("run_coroutine() cannot be called from async code - use await instead")
+
+    return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
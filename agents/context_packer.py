@@ -0,0 +1,246 @@
+"""
+Context Packer - Fit the Best Research Into a Prompt's Token Budget
+
+Every agent that sees research_findings used to either paste ALL of it as
+pretty-printed JSON (mostly whitespace and low-value findings) or chop it
+at a fixed number of characters (often in the middle of a record).
+
+EXPLANATION FOR BEGINNERS:
+- Each agent gets a "token budget": roughly how much research it may see
+- The packer collects every finding from the research report, RANKS them
+  by quality_score (best first) and writes each one as compact JSON
+  (no indentation, no extra spaces)
+- Findings are added whole, one at a time, until the budget is full -
+  a record is never cut in half
+- Whatever doesn't fit is SUMMARIZED in one line instead of silently
+  dropped: "+ 23 more findings (academic_sources 15, ...): Title A; Title B"
+
+Research can arrive as the Research Gatekeeper's report (a dictionary) or as
+plain text. Text is packed paragraph by paragraph the same way.
+
+USAGE EXAMPLE:
+    from agents.context_packer import pack_research
+
+    research = pack_research(state.get("research_findings"), token_budget=750)
+    prompt = f"RESEARCH:\n{research}\n\nTASK: ..."
+"""
+
+from typing import Any, Dict, List, Tuple
+import json
+
+from agents.token_estimator import estimate_tokens, truncate_to_tokens
+
+# Shown when there is no research at all
+DEFAULT_EMPTY_TEXT = "No research available"
+
+# Report sections that are shown before the ranked findings (when present)
+HEADER_KEYS = ["topic", "executive_summary", "recommendations"]
+
+# Report sections that never go into prompts:
+# - all_findings repeats key_findings
+# - research_strategy is the plan, not the results
+SKIPPED_KEYS = {"all_findings", "research_strategy", "research_date"}
+
+# Per-finding bookkeeping that costs tokens but tells the model nothing
+DROPPED_FINDING_KEYS = {"validated", "prescored"}
+
+
+def _compact(value: Any) -> str:
+    """Serialize without indentation or padding spaces."""
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def finding_score(finding: Any) -> float:
+    """
+    Read a finding's quality for ranking.
+
+    Understands {"quality_score": {"overall": 8.7}}, {"quality_score": 8.7}
+    and {"credibility_score": 8.7}. Anything else ranks last (0).
+    """
+    if not isinstance(finding, dict):
+        return 0.0
+
+    score = finding.get("quality_score")
+    if isinstance(score, dict):
+        score = score.get("overall")
+    if score is None:
+        score = finding.get("credibility_score")
+
+    try:
+        return float(score)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _finding_label(finding: Any) -> str:
+    """Short name for a finding in the summary line."""
+    if isinstance(finding, dict):
+        for key in ("title", "name", "event", "claim", "finding", "content"):
+            if finding.get(key):
+                return " ".join(str(finding[key]).split()[:10])
+        return "untitled"
+    return " ".join(str(finding).split()[:10])
+
+
+def _slim_finding(finding: Any) -> Any:
+    """Drop bookkeeping keys and reduce a detailed quality_score to its overall value."""
+    if not isinstance(finding, dict):
+        return finding
+
+    slim = {key: value for key, value in finding.items() if key not in DROPPED_FINDING_KEYS}
+    if isinstance(slim.get("quality_score"), dict) and "overall" in slim["quality_score"]:
+        slim["quality_score"] = slim["quality_score"]["overall"]
+    return slim
+
+
+def collect_findings(research: Dict[str, Any]) -> Tuple[List[Tuple[str, Any]], Dict[str, Any]]:
+    """
+    Split a research report into ranked-able findings and everything else.
+
+    Every list found in the report (or in its "key_findings" section)
+    counts as findings of that category.
+
+    Args:
+        research: Research report dictionary
+
+    Returns:
+        ([(category, finding), ...], {other_key: value})
+    """
+    findings: List[Tuple[str, Any]] = []
+    other: Dict[str, Any] = {}
+
+    for key, value in research.items():
+        if key in SKIPPED_KEYS or key in HEADER_KEYS:
+            continue
+        if key == "key_findings" and isinstance(value, dict):
+            for category, items in value.items():
+                if isinstance(items, list):
+                    findings.extend((category, item) for item in items)
+                else:
+                    other[category] = items
+        elif isinstance(value, list):
+            findings.extend((key, item) for item in value)
+        else:
+            other[key] = value
+
+    # A report with only all_findings (no key_findings) still has findings
+    if not findings and isinstance(research.get("all_findings"), dict):
+        for category, items in research["all_findings"].items():
+            if isinstance(items, list):
+                findings.extend((category, item) for item in items)
+
+    return findings, other
+
+
+def _summarize_tail(tail: List[Tuple[str, Any]], token_budget: int) -> str:
+    """One line describing the findings that did not fit."""
+    counts: Dict[str, int] = {}
+    for category, _ in tail:
+        counts[category] = counts.get(category, 0) + 1
+
+    line = f"+ {len(tail)} more findings not shown ("
+    line += ", ".join(f"{category} {count}" for category, count in counts.items()) + ")"
+
+    # Add as many titles (best first) as still fit
+    labels = []
+    for _, finding in tail:
+        candidate = line + ": " + "; ".join(labels + [_finding_label(finding)])
+        if estimate_tokens(candidate) > token_budget:
+            break
+        labels.append(_finding_label(finding))
+
+    return line + (": " + "; ".join(labels) if labels else "")
+
+
+def _pack_text(text: str, token_budget: int) -> str:
+    """Pack plain text paragraph by paragraph; summarize what doesn't fit."""
+    if estimate_tokens(text) <= token_budget:
+        return text
+
+    paragraphs = [p for p in text.split("\n\n") if p.strip()]
+    kept: List[str] = []
+    used = 0
+
+    for index, paragraph in enumerate(paragraphs):
+        cost = estimate_tokens(paragraph)
+        if used + cost > token_budget:
+            if not kept:
+                # Not even one whole paragraph fits - keep its first whole words
+                kept.append(truncate_to_tokens(paragraph, token_budget - 20))
+                index += 1
+            omitted = len(paragraphs) - index
+            if omitted:
+                kept.append(f"[... {omitted} more paragraphs omitted]")
+            break
+        kept.append(paragraph)
+        used += cost
+
+    return "\n\n".join(kept)
+
+
+def pack_research(
+    research: Any,
+    token_budget: int,
+    empty_text: str = DEFAULT_EMPTY_TEXT
+) -> str:
+    """
+    Render research for a prompt within a token budget.
+
+    Args:
+        research: Research report (dict), plain text, or None
+        token_budget: Roughly how many tokens the result may use
+        empty_text: What to show when there is no research
+
+    Returns:
+        Compact research text: header sections, then findings best-first,
+        then a one-line summary of any findings that did not fit
+    """
+    if not research:
+        return empty_text
+
+    if isinstance(research, str):
+        return _pack_text(research, token_budget)
+
+    if not isinstance(research, dict):
+        return _pack_text(_compact(research), token_budget)
+
+    lines: List[str] = []
+    used = 0
+
+    # 1. Header sections (topic, summary, recommendations)
+    for key in HEADER_KEYS:
+        if research.get(key):
+            # No single header section may take more than a third of the budget
+            line = truncate_to_tokens(f"{key}: {_compact(research[key])}", token_budget // 3)
+            cost = estimate_tokens(line)
+            if used + cost > token_budget:
+                continue
+            lines.append(line)
+            used += cost
+
+    findings, other = collect_findings(research)
+
+    # 2. Small scalar facts (counts, metrics)
+    if other:
+        line = _compact(other)
+        cost = estimate_tokens(line)
+        if used + cost <= token_budget // 2:
+            lines.append(line)
+            used += cost
+
+    # 3. Findings, best first (stable: equal scores keep report order)
+    ranked = sorted(findings, key=lambda item: finding_score(item[1]), reverse=True)
+    summary_reserve = min(60, token_budget // 10)
+
+    for index, (category, finding) in enumerate(ranked):
+        line = f"[{category}] {_compact(_slim_finding(finding))}"
+        cost = estimate_tokens(line)
+        if used + cost > token_budget - summary_reserve:
+            lines.append(_summarize_tail(ranked[index:], max(summary_reserve, token_budget - used)))
+            break
+        lines.append(line)
+        used += cost
+
+    return "\n".join(lines) if lines else empty_text
@@ -0,0 +1,311 @@
+"""
+Embeddings - Cached, Batched Text Embeddings for the Technique Library
+
+ChromaDB turns every stored document and every search query into an
+"embedding" (a list of numbers that captures its meaning). Left to itself,
+Chroma re-computes those embeddings every time - the same technique text
+on every re-ingest, the same search query on every run.
+
+EXPLANATION FOR BEGINNERS:
+- CachedEmbeddingFunction is handed to each Chroma collection as its
+  embedding function, so Chroma asks US for embeddings
+- Every text is fingerprinted (model name + text). Embeddings we have
+  computed before come straight from a small SQLite file on disk
+- Only the texts we have NEVER seen are run through the local
+  sentence-transformers model, all together in batches (much faster
+  than one at a time)
+- The model is loaded once per process and shared by every collection
+
+The default model (all-MiniLM-L6-v2) is the same one Chroma uses by
+default, so collections created before this change keep working.
+
+CONFIGURATION (environment variables, all optional):
+- EMBEDDING_MODEL: sentence-transformers model name (default: all-MiniLM-L6-v2)
+- EMBEDDING_BATCH_SIZE: Texts encoded per batch (default: 64)
+- EMBEDDING_DEVICE: "cpu", "cuda", ... (default: chosen by sentence-transformers)
+- EMBEDDING_CACHE_ENABLED: "0" / "false" turns the disk cache off (default: on)
+- EMBEDDING_CACHE_PATH: SQLite file location (default: ./cache/embeddings.sqlite3)
+
+USAGE EXAMPLE:
+    from agents.embeddings import chroma_embedding_kwargs
+
+    collection = client.get_or_create_collection(
+        name="viral_techniques",
+        **chroma_embedding_kwargs()
+    )
+"""
+
+from array import array
+from typing import Any, Dict, List, Optional, Sequence
+import os
+import sqlite3
+import threading
+import time
+
+from agents.hashing import content_hash
+
+# sentence-transformers - local embedding models (optional)
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+# Chroma's embedding function base class (optional - any callable works)
+try:
+    from chromadb.api.types import EmbeddingFunction
+except ImportError:
+    EmbeddingFunction = object
+
+# Defaults (overridable with the environment variables listed above)
+DEFAULT_MODEL = "all-MiniLM-L6-v2"
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_CACHE_PATH = os.path.join(".", "cache", "embeddings.sqlite3")
+
+# SQLite limits how many "?" placeholders one query may use
+LOOKUP_CHUNK_SIZE = 500
+
+
+class EmbeddingCache:
+    """
+    Content-addressed SQLite store of embeddings.
+
+    Embeddings never go stale (the same model always gives the same
+    vector for the same text), so there is no expiry. Vectors are stored
+    as packed 32-bit floats.
+
+    Safe to share between threads (all access goes through one lock).
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: SQLite file location
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # check_same_thread=False: the lock above makes cross-thread use safe
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                vector BLOB NOT NULL,
+                created_at REAL NOT NULL
+            )"""
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        """Fingerprint of one text under one model."""
+        return content_hash(model, text)
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        """
+        Look up several embeddings at once.
+
+        Args:
+            keys: Keys from make_key()
+
+        Returns:
+            {key: vector} for the keys that were found
+        """
+        found: Dict[str, List[float]] = {}
+        keys = list(keys)
+
+        with self._lock:
+            for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+                chunk = keys[start:start + LOOKUP_CHUNK_SIZE]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = array("f", blob).tolist()
+
+        return found
+
+    def set_many(self, items: Dict[str, Sequence[float]], model: str = "") -> None:
+        """
+        Store several embeddings at once.
+
+        Args:
+            items: {key: vector}
+            model: Model name (stored for inspection/debugging only)
+        """
+        now = time.time()
+        rows = [(key, model, array("f", vector).tobytes(), now) for key, vector in items.items()]
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, vector, created_at) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Delete every stored embedding."""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return basic cache statistics.
+
+        Returns:
+            Dictionary with the cache path and entry count
+        """
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+        return {"path": self.path, "entries": count}
+
+
+class CachedEmbeddingFunction(EmbeddingFunction):
+    """
+    Chroma embedding function: disk cache first, then batched local encoding.
+
+    Chroma calls it with a list of texts and expects one vector per text,
+    in the same order.
+    """
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        cache: Optional[EmbeddingCache] = None,
+        device: Optional[str] = None
+    ):
+        """
+        Args:
+            model_name: sentence-transformers model to encode with
+            batch_size: Texts encoded per batch
+            cache: Where to keep computed embeddings (None = no disk cache)
+            device: Where to run the model (None = automatic)
+        """
+        self.model_name = model_name
+        self.batch_size = max(1, batch_size)
+        self.cache = cache
+        self.device = device
+
+        self.cache_hits = 0
+        self.encoded = 0
+
+        # The model is loaded on first use (loading takes seconds)
+        self._model = None
+        self._model_lock = threading.Lock()
+
+    def _get_model(self):
+        """Load the sentence-transformers model once."""
+        with self._model_lock:
+            if self._model is None:
+                if not SENTENCE_TRANSFORMERS_AVAILABLE:
+                    raise ImportError(
+                        "sentence-transformers is not installed. "
+                        "Install with: pip install sentence-transformers"
+                    )
+                self._model = SentenceTransformer(self.model_name, device=self.device)
+            return self._model
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        """Run the model over texts, batch_size at a time."""
+        model = self._get_model()
+        vectors = model.encode(
+            texts,
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+        return [vector.tolist() for vector in vectors]
+
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        """
+        Embed texts (Chroma's embedding function interface).
+
+        Args:
+            input: Texts to embed (Chroma's required argument name)
+
+        Returns:
+            One vector per text, in input order
+        """
+        texts = list(input)
+        keys = [EmbeddingCache.make_key(self.model_name, text) for text in texts]
+
+        vectors: Dict[str, List[float]] = {}
+        if self.cache is not None:
+            vectors = self.cache.get_many(set(keys))
+        self.cache_hits += sum(1 for key in keys if key in vectors)
+
+        # Encode each NEW text once, even if it appears several times
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                missing.setdefault(key, text)
+
+        if missing:
+            encoded = dict(zip(missing, self._encode(list(missing.values()))))
+            self.encoded += len(encoded)
+            vectors.update(encoded)
+            if self.cache is not None:
+                self.cache.set_many(encoded, model=self.model_name)
+
+        return [vectors[key] for key in keys]
+
+
+# =================================================================
+# PROCESS-WIDE DEFAULT EMBEDDING FUNCTION
+# =================================================================
+
+_default_function: Optional[CachedEmbeddingFunction] = None
+_default_function_lock = threading.Lock()
+
+
+def get_embedding_function() -> Optional[CachedEmbeddingFunction]:
+    """
+    Get the embedding function shared by every collection (created on first use).
+
+    Returns:
+        The shared CachedEmbeddingFunction, or None when
+        sentence-transformers is not installed
+    """
+    global _default_function
+
+    if not SENTENCE_TRANSFORMERS_AVAILABLE:
+        return None
+
+    with _default_function_lock:
+        if _default_function is None:
+            cache = None
+            if os.getenv("EMBEDDING_CACHE_ENABLED", "1").strip().lower() not in ("0", "false", "no", "off"):
+                cache = EmbeddingCache(os.getenv("EMBEDDING_CACHE_PATH", DEFAULT_CACHE_PATH))
+
+            _default_function = CachedEmbeddingFunction(
+                model_name=os.getenv("EMBEDDING_MODEL", DEFAULT_MODEL),
+                batch_size=int(os.getenv("EMBEDDING_BATCH_SIZE", DEFAULT_BATCH_SIZE)),
+                cache=cache,
+                device=os.getenv("EMBEDDING_DEVICE") or None
+            )
+
+    return _default_function
+
+
+def chroma_embedding_kwargs() -> Dict[str, Any]:
+    """
+    Keyword arguments for get_or_create_collection().
+
+    Returns {"embedding_function": shared function}, or {} when
+    sentence-transformers is missing - Chroma then falls back to its own
+    default embedder (passing embedding_function=None would disable
+    embedding altogether).
+    """
+    function = get_embedding_function()
+    return {"embedding_function": function} if function is not None else {}
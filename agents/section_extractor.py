@@ -0,0 +1,239 @@
+"""
+Section Extractor - One-Pass Parser for Free-Text Agent Output
+
+Many sub-agents return long free-text documents (engagement strategies,
+trigger analyses, scene lists, scripts) and then offer accessor methods
+that dig pieces back out of that text. This file parses each document
+ONCE, with precompiled patterns, and remembers the result.
+
+EXPLANATION FOR BEGINNERS:
+- Each agent describes its document with a DocumentSpec:
+  "a line like 'CHECKPOINT 3: 4:30' starts a checkpoint section",
+  "a line like 'PACING: Fast' is a field of the current minute segment", ...
+- extract(text, spec) walks the lines ONE time and checks every rule on
+  each line, building an index of sections, fields, list items and values
+- The index is memoized by a hash of the text, so calling an accessor
+  100 times on the same document parses it only once
+- Accessors then become simple lookups into the index
+
+SECTION RULES (checked per line, in this order):
+1. header - starts a new section (closes the previous one of this kind);
+            fields on the header line itself are stored too
+2. end    - closes the current section
+3. fields - "KEY: value" lines stored under section["fields"][name]
+4. item   - bullet lines stored in section["items"]
+5. anything else non-blank goes to section["lines"]
+
+Every section kind is tracked independently, so e.g. a checkpoint and a
+minute segment can both be "open" on the same line.
+
+USAGE EXAMPLE:
+    spec = DocumentSpec(
+        "example",
+        sections={"checkpoint": SectionRule(re.compile(r"(?i)^.*CHECKPOINT.*$"))}
+    )
+    index = extract(strategy_text, spec)
+    for checkpoint in index["sections"]["checkpoint"]:
+        print(checkpoint["line"], checkpoint["lines"])
+"""
+
+from typing import Any, Dict, List, Optional, Pattern
+from collections import OrderedDict
+import hashlib
+import threading
+
+# How many parsed documents to remember
+MAX_CACHED_DOCUMENTS = 256
+
+
+class SectionRule:
+    """
+    How to recognize one kind of section in a document.
+    """
+
+    def __init__(
+        self,
+        header: Pattern,
+        end: Optional[Pattern] = None,
+        fields: Optional[Dict[str, Pattern]] = None,
+        item: Optional[Pattern] = None,
+        strip_lines: bool = True
+    ):
+        """
+        Args:
+            header: Matches a line that starts a section. A named group
+                "title" (if present) becomes section["title"]
+            end: Matches a line that closes the current section
+            fields: {name: pattern}; group 1 of each match is stored under
+                section["fields"][name] (a list, in document order)
+            item: Matches a list-item line; group 1 goes to section["items"]
+            strip_lines: Store body lines stripped (True) or as written (False)
+        """
+        self.header = header
+        self.end = end
+        self.fields = fields or {}
+        self.item = item
+        self.strip_lines = strip_lines
+
+
+class DocumentSpec:
+    """
+    Everything to extract from one type of document.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        sections: Optional[Dict[str, SectionRule]] = None,
+        values: Optional[Dict[str, Pattern]] = None,
+        spans: Optional[Dict[str, Pattern]] = None,
+        paragraph_fields: Optional[Dict[str, Pattern]] = None
+    ):
+        """
+        Args:
+            name: Spec name (part of the memoization key)
+            sections: {kind: SectionRule}
+            values: {name: pattern} matched against every line; group 1 of
+                each match is collected into index["values"][name]
+            spans: {name: pattern}; index["spans"][name] is the text after
+                the FIRST match, up to the next blank line (None if no match)
+            paragraph_fields: If given, the document is also split into
+                blank-line separated paragraphs, each with these fields
+        """
+        self.name = name
+        self.sections = sections or {}
+        self.values = values or {}
+        self.spans = spans or {}
+        self.paragraph_fields = paragraph_fields
+
+
+_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def extract(text: str, spec: DocumentSpec) -> Dict[str, Any]:
+    """
+    Parse a document (or fetch the memoized parse).
+
+    The returned index is SHARED between callers - treat it as read-only
+    and copy anything you hand out.
+
+    Args:
+        text: Document text
+        spec: What to extract
+
+    Returns:
+        {
+            "sections": {kind: [section, ...]},
+            "values": {name: [str, ...]},
+            "spans": {name: Optional[str]},
+            "paragraphs": [{"text": str, "fields": {...}}, ...]
+        }
+        where each section is
+        {"title", "line", "line_number", "lines", "fields", "items"}
+    """
+    key = (spec.name, hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest())
+
+    with _cache_lock:
+        index = _cache.get(key)
+        if index is not None:
+            _cache.move_to_end(key)
+            return index
+
+    index = _parse(text, spec)
+
+    with _cache_lock:
+        _cache[key] = index
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_CACHED_DOCUMENTS:
+            _cache.popitem(last=False)
+
+    return index
+
+
+def _collect_fields(rule: SectionRule, section: Dict[str, Any], line: str) -> bool:
+    """Store every field of the rule found on this line; True if any was."""
+    found = False
+    for name, pattern in rule.fields.items():
+        match = pattern.search(line)
+        if match:
+            section["fields"].setdefault(name, []).append(match.group(1).strip())
+            found = True
+    return found
+
+
+def _parse(text: str, spec: DocumentSpec) -> Dict[str, Any]:
+    """Build the index for one document in a single pass over its lines."""
+    sections: Dict[str, List[Dict[str, Any]]] = {kind: [] for kind in spec.sections}
+    current: Dict[str, Optional[Dict[str, Any]]] = {kind: None for kind in spec.sections}
+    values: Dict[str, List[str]] = {name: [] for name in spec.values}
+
+    for line_number, line in enumerate(text.split("\n")):
+        # Document-wide values
+        for name, pattern in spec.values.items():
+            match = pattern.search(line)
+            if match:
+                values[name].append(match.group(1))
+
+        # Every section kind sees every line
+        for kind, rule in spec.sections.items():
+            header = rule.header.search(line)
+            if header:
+                section = {
+                    "title": (header.groupdict().get("title") or "").strip(),
+                    "line": line.strip(),
+                    "line_number": line_number,
+                    "lines": [],
+                    "fields": {},
+                    "items": []
+                }
+                sections[kind].append(section)
+                current[kind] = section
+                # "[MINUTES 0-2: Hook] PACING: Fast" - the header carries a field
+                _collect_fields(rule, section, line)
+                continue
+
+            section = current[kind]
+            if section is None:
+                continue
+
+            if rule.end is not None and rule.end.search(line):
+                current[kind] = None
+                continue
+
+            if _collect_fields(rule, section, line):
+                continue
+
+            if rule.item is not None:
+                match = rule.item.search(line)
+                if match:
+                    if match.group(1):
+                        section["items"].append(match.group(1))
+                    continue
+
+            if line.strip():
+                section["lines"].append(line.strip() if rule.strip_lines else line)
+
+    # Spans: text after the first match up to the next blank line
+    spans: Dict[str, Optional[str]] = {}
+    for name, pattern in spec.spans.items():
+        match = pattern.search(text)
+        spans[name] = text[match.end():].split("\n\n")[0] if match else None
+
+    # Paragraphs (blank-line separated)
+    paragraphs = []
+    if spec.paragraph_fields is not None:
+        for paragraph in text.split("\n\n"):
+            fields = {}
+            for name, pattern in spec.paragraph_fields.items():
+                match = pattern.search(paragraph)
+                if match:
+                    fields[name] = match.group(1)
+            paragraphs.append({"text": paragraph, "fields": fields})
+
+    return {
+        "sections": sections,
+        "values": values,
+        "spans": spans,
+        "paragraphs": paragraphs
+    }
@@ -0,0 +1,192 @@
+"""
+Streaming - Receive Claude's Answer Piece by Piece
+
+A long script takes minutes to generate. With a normal call nothing can
+happen until the LAST word arrives. Streaming hands us the answer in small
+pieces ("text deltas") as Claude writes it, so work on the first sections
+can start while later sections are still being written.
+
+EXPLANATION FOR BEGINNERS:
+- stream_message() is a generator: loop over it and you get text pieces
+  as soon as they arrive
+- A "consumer" is an object that watches those pieces go by. It has two
+  methods: feed(delta) for every piece and close() when the answer ends
+- SectionConsumer is a ready-made consumer: it collects lines, and every
+  time a NEW section header appears it knows the PREVIOUS section is
+  finished and calls your callback with it
+- consume_stream() drives the loop: it passes every piece to every
+  consumer and returns the complete text at the end
+
+Streamed answers go through the same on-disk response cache as normal
+calls (see agents/response_cache.py). A cached answer is "streamed" as
+one single piece, so consumers behave the same either way.
+
+USAGE EXAMPLE:
+    from agents.streaming import SectionConsumer, consume_stream, stream_message
+
+    def on_section(section):
+        print("Finished:", section["title"])
+
+    consumer = SectionConsumer(re.compile(r"^\\[\\d+:\\d+"), on_section)
+    script = consume_stream(
+        stream_message(client, model, 8000, 0.8, system_prompt, prompt),
+        [consumer]
+    )
+"""
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Pattern
+
+from agents.rate_limiter import get_rate_limiter
+from agents.response_cache import prepare_request, request_kwargs, store_response
+
+
+def stream_message(
+    client: Any,
+    model: str,
+    max_tokens: int,
+    temperature: float,
+    system: str,
+    user_message: str,
+    description: Optional[str] = None
+) -> Iterator[str]:
+    """
+    Streaming version of cached_message(): yield the response as it arrives.
+
+    The complete response is stored in the response cache only once the
+    stream has finished, so an abandoned stream never caches half an answer.
+
+    Args:
+        client: Anthropic client
+        model: Claude model identifier
+        max_tokens: Maximum response length
+        temperature: Response creativity (0.0-1.0)
+        system: System prompt
+        user_message: The user's request
+        description: Name used in rate limiter logs and errors
+
+    Yields:
+        Text deltas, in order (one single delta on a cache hit)
+
+    Raises:
+        LLMCallError: If the stream failed for good (see agents/rate_limiter.py)
+    """
+    # Same prompt sizing and cache fingerprint as cached_message()
+    prompt_tokens, max_tokens, key, cached = prepare_request(model, max_tokens, temperature, system, user_message)
+    if cached is not None:
+        yield cached
+        return
+
+    # Cache miss (or cache disabled) - stream from Claude through the
+    # shared rate limiter (retried only if it fails before the first piece)
+    pieces: List[str] = []
+    kwargs = request_kwargs(model, max_tokens, temperature, system, user_message)
+
+    deltas = get_rate_limiter().stream(
+        lambda: client.messages.stream(**kwargs),
+        estimated_tokens=prompt_tokens,
+        description=description or f"Claude stream ({model})"
+    )
+    for delta in deltas:
+        pieces.append(delta)
+        yield delta
+
+    store_response(key, "".join(pieces), model)
+
+
+class SectionConsumer:
+    """
+    Watches a stream and reports each section as soon as it is complete.
+
+    A section starts at a line matching the header pattern and ends where
+    the next header starts (or where the stream ends). Text before the
+    first header is ignored.
+
+    The callback receives one dictionary per section:
+        {"index": 0, "title": "[00:00-00:30]", "header": "...", "text": "..."}
+    where "title" is the header's named group "title" (or the whole
+    header line) and "text" includes the header line itself.
+    """
+
+    def __init__(self, header: Pattern, on_section: Callable[[Dict[str, Any]], None]):
+        """
+        Args:
+            header: Matches a line that starts a new section
+            on_section: Called with each completed section, in order
+        """
+        self.header = header
+        self.on_section = on_section
+        self.sections: List[Dict[str, Any]] = []
+        self._partial_line = ""
+        self._current: Optional[Dict[str, Any]] = None
+        self._current_lines: List[str] = []
+
+    def feed(self, delta: str):
+        """Take the next piece of streamed text."""
+        text = self._partial_line + delta
+        lines = text.split("\n")
+
+        # The last piece may be an unfinished line - keep it for later
+        self._partial_line = lines.pop()
+
+        for line in lines:
+            self._handle_line(line)
+
+    def close(self):
+        """The stream has ended - finish the last section."""
+        if self._partial_line:
+            self._handle_line(self._partial_line)
+            self._partial_line = ""
+        self._finish_current()
+
+    def _handle_line(self, line: str):
+        """Route one complete line: new header, or body of the current section."""
+        match = self.header.search(line)
+        if match:
+            self._finish_current()
+            title = match.groupdict().get("title") or line
+            self._current = {
+                "index": len(self.sections),
+                "title": title.strip(),
+                "header": line.strip()
+            }
+            self._current_lines = [line]
+        elif self._current is not None:
+            self._current_lines.append(line)
+
+    def _finish_current(self):
+        """Report the open section (if any) to the callback."""
+        if self._current is None:
+            return
+
+        section = self._current
+        section["text"] = "\n".join(self._current_lines).strip("\n")
+        self.sections.append(section)
+        self._current = None
+        self._current_lines = []
+
+        self.on_section(section)
+
+
+def consume_stream(deltas: Iterable[str], consumers: Optional[List[Any]] = None) -> str:
+    """
+    Run a stream to the end, feeding every piece to every consumer.
+
+    Args:
+        deltas: Text pieces (e.g. from stream_message())
+        consumers: Objects with feed(delta) and close() methods
+
+    Returns:
+        The complete response text
+    """
+    consumers = consumers or []
+    pieces: List[str] = []
+
+    for delta in deltas:
+        pieces.append(delta)
+        for consumer in consumers:
+            consumer.feed(delta)
+
+    for consumer in consumers:
+        consumer.close()
+
+    return "".join(pieces)
@@ -0,0 +1,104 @@
+"""
+Synthesis Manifest - Remember What Each Generated Piece Was Made From
+
+When an editor tweaks ONE section of the script, only that section's
+visuals and production notes need to be regenerated - everything else
+is still valid. This file keeps the bookkeeping that makes that possible.
+
+EXPLANATION FOR BEGINNERS:
+- Every generated piece (one section's visuals, one section's notes, the
+  project-wide notes) is stored together with a "fingerprint" (hash) of
+  EXACTLY the inputs it was made from
+- Next time, we fingerprint the current inputs again:
+  same fingerprint = inputs unchanged = reuse the stored piece
+  different fingerprint = something changed = regenerate that piece
+- Dependencies chain naturally: a section's notes are fingerprinted from
+  the section text AND its visuals, so new visuals also mean new notes
+
+The manifest is a plain dictionary of strings, so it can live in the
+workflow state and be saved to JSON with everything else.
+
+USAGE EXAMPLE:
+    from agents.synthesis_manifest import SynthesisManifest, content_hash
+
+    old = SynthesisManifest(state.get("synthesis_manifest"))
+    new = SynthesisManifest()
+
+    key = content_hash(topic, section_text)
+    visuals = old.lookup("visuals", key)
+    if visuals is None:
+        visuals = design_visuals(section_text)
+    new.record("visuals", key, visuals)
+
+    state["synthesis_manifest"] = new.to_dict()
+"""
+
+from typing import Any, Dict, Optional
+
+# content_hash lives in agents/hashing.py (shared with the embedding cache
+# and the technique writer) - imported here so existing imports keep working
+from agents.hashing import content_hash
+
+# Bump when the meaning of stored fingerprints changes - older manifests
+# are then ignored instead of reused
+MANIFEST_VERSION = 1
+
+
+class SynthesisManifest:
+    """
+    Generated pieces, each stored under the fingerprint of its inputs.
+
+    Layout (as returned by to_dict()):
+        {
+            "version": 1,
+            "artifacts": {
+                "visuals": {inputs_hash: text, ...},
+                "notes": {inputs_hash: text, ...},
+                ...
+            }
+        }
+    """
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            data: A manifest from to_dict() (None or an outdated version
+                starts an empty manifest)
+        """
+        if not data or data.get("version") != MANIFEST_VERSION:
+            data = {}
+
+        self.artifacts: Dict[str, Dict[str, str]] = {
+            kind: dict(entries) for kind, entries in data.get("artifacts", {}).items()
+        }
+
+    def lookup(self, kind: str, inputs_hash: str) -> Optional[str]:
+        """
+        Find a stored piece made from exactly these inputs.
+
+        Args:
+            kind: Artifact kind ("visuals", "notes", ...)
+            inputs_hash: content_hash() of the current inputs
+
+        Returns:
+            The stored text, or None if the inputs changed (or are new)
+        """
+        return self.artifacts.get(kind, {}).get(inputs_hash)
+
+    def record(self, kind: str, inputs_hash: str, output: str):
+        """
+        Store a freshly generated (or reused) piece.
+
+        Args:
+            kind: Artifact kind ("visuals", "notes", ...)
+            inputs_hash: content_hash() of the inputs it was made from
+            output: The generated text
+        """
+        self.artifacts.setdefault(kind, {})[inputs_hash] = output
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the manifest as a plain (JSON-friendly) dictionary."""
+        return {
+            "version": MANIFEST_VERSION,
+            "artifacts": {kind: dict(entries) for kind, entries in self.artifacts.items()}
+        }
@@ -0,0 +1,427 @@
+"""
+PIPELINED SYNTHESIS
+===================
+Part of: Content Synthesis Gatekeeper
+Purpose: Runs Script Writer, Visual Scene Architect and Production Notes
+         Generator as an overlapping pipeline instead of one after another
+
+The normal order is: write the WHOLE script, then design the WHOLE visual
+architecture, then write the WHOLE production notes. Each step waits for the
+previous one to finish completely.
+
+EXPLANATION FOR BEGINNERS:
+- The script is streamed (see agents/streaming.py)
+- The moment a timecoded section of the script is finished, a worker
+  thread starts designing that section's visuals, then its production cues
+- Meanwhile the script keeps streaming, so section 1's visuals are being
+  designed while section 5 is still being written
+- Project-wide pieces don't depend on any one section, so they are
+  requested right at the start: the overall visual strategy (themes,
+  pacing, shot variety, editor's guide...) and the production notes
+  (equipment, budget, timeline...)
+- Every section's visuals are designed FROM that visual strategy, so
+  separately designed scenes still share one visual language
+- At the end, the per-section pieces are stitched back together IN SCRIPT
+  ORDER, no matter which worker finished first
+
+    time ─────────────────────────────────────────────►
+    strategy: [overall visual strategy]
+    script:   [sec 1][sec 2][sec 3][sec 4]
+    visuals:         [sec 1]→[notes 1]
+                            [sec 2]→[notes 2]
+                                   [sec 3]→[notes 3]
+                                          [sec 4]→[notes 4]
+
+The result has the same state keys as running the three agents in order
+(documentary_script, visual_architecture, production_notes and their scores).
+
+INCREMENTAL REGENERATION:
+Every generated piece is recorded in state["synthesis_manifest"] with a
+fingerprint of the inputs it was made from (see agents/synthesis_manifest.py).
+After an editor changes part of the script, regenerate(state) re-does ONLY
+the sections whose text changed (plus anything that depends on them) and
+reuses the rest. The visual strategy depends only on topic, duration and
+engagement strategy, so script edits never regenerate it.
+
+CONFIGURATION (environment variables, all optional):
+- SYNTHESIS_PIPELINE_MAX_WORKERS: Sections processed at the same time (default: 4)
+
+Author: Advanced Multi-Agent System
+Created: 2024
+"""
+
+import os
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Any, Optional
+
+# Add parent directories to path so shared agent modules can be imported
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from agents.hashing import content_hash
+from agents.synthesis_manifest import SynthesisManifest
+from agents.synthesis_subagents.script_writer import ScriptWriter
+from agents.synthesis_subagents.visual_scene_architect import VisualSceneArchitect
+from agents.synthesis_subagents.production_notes_generator import ProductionNotesGenerator
+
+# Sections processed at the same time
+DEFAULT_MAX_WORKERS = int(os.getenv("SYNTHESIS_PIPELINE_MAX_WORKERS", 4))
+
+# ScriptWriter.write_script() reports failures with this prefix
+SCRIPT_FAILURE_PREFIX = "Script generation failed"
+
+
+class PipelinedSynthesis:
+    """
+    PIPELINED SYNTHESIS - Script, visuals and production notes, overlapped
+
+    Drop-in replacement for calling write_script(),
+    design_visual_architecture() and generate_production_notes() in a row.
+    """
+
+    def __init__(
+        self,
+        script_writer: Optional[ScriptWriter] = None,
+        visual_architect: Optional[VisualSceneArchitect] = None,
+        notes_generator: Optional[ProductionNotesGenerator] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS
+    ):
+        """
+        INITIALIZATION - Set up the three synthesis agents
+
+        Parameters:
+        -----------
+        script_writer, visual_architect, notes_generator : optional
+            Existing agents to reuse (new ones are created if omitted)
+        max_workers : int
+            Sections processed at the same time
+        """
+
+        self.script_writer = script_writer or ScriptWriter()
+        self.visual_architect = visual_architect or VisualSceneArchitect()
+        self.notes_generator = notes_generator or ProductionNotesGenerator()
+        self.max_workers = max(1, max_workers)
+
+    def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        MAIN METHOD - Generate script, visuals and notes as a pipeline
+
+        Visuals and notes whose inputs are unchanged since the last run
+        (see synthesis_manifest in the returned state) are reused.
+
+        Parameters:
+        -----------
+        state : Dict[str, Any]
+            Same inputs as ScriptWriter.write_script()
+
+        Returns:
+        --------
+        Dict[str, Any]
+            Updated state with documentary_script, visual_architecture,
+            production_notes (and their scores), plus
+            pipelined_section_count and synthesis_manifest
+        """
+
+        print("\n⚡ Pipelined Synthesis: Script, visuals and notes in parallel...")
+
+        context = self._build_context(state)
+        manifest = SynthesisManifest(state.get("synthesis_manifest"))
+
+        section_jobs: List[Future] = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Project-wide pieces don't need the script - start them right away
+            # (submitted BEFORE any section, so sections waiting for the
+            # strategy never block the worker it needs)
+            strategy_job = executor.submit(self._process_visual_strategy, context, manifest)
+            project_job = executor.submit(self._process_project_notes, context, manifest)
+
+            def on_section(section: Dict[str, Any]):
+                # Called from the streaming loop as each section completes
+                section_jobs.append(
+                    executor.submit(self._process_section, section, context, manifest, strategy_job)
+                )
+
+            consumer = self.script_writer.section_consumer(on_section)
+            state = self.script_writer.write_script(state, stream_consumers=[consumer])
+
+            # Wait for every section, in SCRIPT order
+            section_results = [job.result() for job in section_jobs]
+            strategy_result = strategy_job.result()
+            project_result = project_job.result()
+
+        script = state.get("documentary_script", "")
+        if script.startswith(SCRIPT_FAILURE_PREFIX):
+            # Nothing reliable to design visuals for
+            return state
+
+        if not section_results:
+            # Script had no timecoded sections - fall back to the normal order
+            print("⚠️ Pipelined Synthesis: No timecoded sections found, running in sequence")
+            state = self.visual_architect.design_visual_architecture(state)
+            return self.notes_generator.generate_production_notes(state)
+
+        return self._assemble(state, context, section_results, strategy_result, project_result)
+
+    def regenerate(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        REGENERATE - Bring visuals and notes up to date after script edits
+
+        Use this after an editor changes documentary_script by hand. The
+        script itself is NOT rewritten. It is split into its timecoded
+        sections, and a section's visuals and notes are regenerated only if
+        their inputs changed. Those inputs are the section text, its
+        position, and the topic, duration and engagement strategy.
+        Everything else is reused from synthesis_manifest.
+
+        Parameters:
+        -----------
+        state : Dict[str, Any]
+            State from an earlier run() or regenerate() (with the edited
+            documentary_script and its synthesis_manifest)
+
+        Returns:
+        --------
+        Dict[str, Any]
+            Updated state (same keys as run()), plus regenerated_sections:
+            the timecodes of the sections that were actually regenerated
+        """
+
+        print("\n🔁 Pipelined Synthesis: Regenerating changed sections...")
+
+        context = self._build_context(state)
+        manifest = SynthesisManifest(state.get("synthesis_manifest"))
+        sections = self.script_writer.split_sections(state.get("documentary_script", ""))
+
+        if not sections:
+            print("⚠️ Pipelined Synthesis: No timecoded sections found, running in sequence")
+            state = self.visual_architect.design_visual_architecture(state)
+            return self.notes_generator.generate_production_notes(state)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            strategy_job = executor.submit(self._process_visual_strategy, context, manifest)
+            project_job = executor.submit(self._process_project_notes, context, manifest)
+            section_jobs = [
+                executor.submit(self._process_section, section, context, manifest, strategy_job)
+                for section in sections
+            ]
+
+            section_results = [job.result() for job in section_jobs]
+            strategy_result = strategy_job.result()
+            project_result = project_job.result()
+
+        return self._assemble(state, context, section_results, strategy_result, project_result)
+
+    def _build_context(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Per-section prompts only need these few keys."""
+
+        return {
+            "topic": state.get("topic", "Unknown"),
+            "duration_minutes": state.get("duration_minutes", 30),
+            "engagement_strategy": state.get("engagement_strategy", "No strategy")
+        }
+
+    def _assemble(
+        self,
+        state: Dict[str, Any],
+        context: Dict[str, Any],
+        section_results: List[Dict[str, Any]],
+        strategy_result: Dict[str, Any],
+        project_result: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Stitch the per-section pieces together in script order, score them,
+        and store a fresh manifest of everything that was generated.
+
+        Like design_visual_architecture(), the visual architecture ends with
+        the OVERALL VISUAL STRATEGY block.
+        """
+
+        duration = context["duration_minutes"]
+
+        visual_architecture = "\n\n---\n\n".join(
+            [result["visuals"] for result in section_results] + [strategy_result["strategy"]]
+        )
+        self.visual_architect.record_visual_architecture(state, visual_architecture, duration)
+
+        production_notes = (
+            "SECTION-BY-SECTION PRODUCTION CUES\n\n"
+            + "\n\n".join(result["notes"] for result in section_results)
+            + "\n\n" + "=" * 70 + "\n\n"
+            + project_result["notes"]
+        )
+        self.notes_generator.record_production_notes(state, production_notes)
+
+        # Only pieces of the CURRENT document go into the new manifest
+        # (failed pieces have no key, so they are retried next time)
+        manifest = SynthesisManifest()
+        for result in section_results + [strategy_result, project_result]:
+            for kind, key, text in result["artifacts"]:
+                manifest.record(kind, key, text)
+
+        regenerated = [result["title"] for result in section_results if result["regenerated"]]
+
+        state["synthesis_manifest"] = manifest.to_dict()
+        state["pipelined_section_count"] = len(section_results)
+        state["regenerated_sections"] = regenerated
+
+        print(f"✅ Pipelined Synthesis: {len(section_results)} sections stitched "
+              f"({len(regenerated)} regenerated, {len(section_results) - len(regenerated)} reused)")
+
+        return state
+
+    def _process_section(
+        self,
+        section: Dict[str, Any],
+        context: Dict[str, Any],
+        manifest: SynthesisManifest,
+        strategy_job: Future
+    ) -> Dict[str, Any]:
+        """
+        Design visuals, then production cues, for one finished script section.
+
+        The visuals follow the overall visual strategy (strategy_job is the
+        running _process_visual_strategy(); a failed strategy is left out).
+        Each piece is reused from the manifest when its inputs are unchanged.
+        Errors are returned as text for that section only, so one failed
+        section never loses the others.
+
+        Returns:
+        --------
+        Dict[str, Any]
+            {"title", "visuals", "notes", "regenerated",
+             "artifacts": [(kind, inputs_hash, text), ...]}
+        """
+
+        artifacts = []
+        regenerated = False
+
+        strategy_result = strategy_job.result()
+        visual_strategy = strategy_result["strategy"] if strategy_result["artifacts"] else None
+
+        # Visuals depend on everything design_section_visuals() reads
+        visuals_key = content_hash(
+            "visuals", context["topic"], context["duration_minutes"],
+            context["engagement_strategy"], section["index"], section["title"], section["text"],
+            visual_strategy or ""
+        )
+        visuals = manifest.lookup("visuals", visuals_key)
+
+        if visuals is None:
+            regenerated = True
+            try:
+                visuals = self.visual_architect.design_section_visuals(section, context, visual_strategy)
+                artifacts.append(("visuals", visuals_key, visuals))
+            except Exception as e:
+                visuals = f"SCENE {section['index'] + 1}: {section['title']}\nVisual design failed: {str(e)}"
+        else:
+            artifacts.append(("visuals", visuals_key, visuals))
+
+        # Notes depend on the section AND its visuals
+        notes_key = content_hash(
+            "notes", context["topic"], context["duration_minutes"],
+            section["title"], section["text"], visuals
+        )
+        notes = manifest.lookup("notes", notes_key)
+
+        if notes is None:
+            regenerated = True
+            try:
+                notes = self.notes_generator.generate_section_notes(section, visuals, context)
+                artifacts.append(("notes", notes_key, notes))
+            except Exception as e:
+                notes = f"{section['title']}\nProduction cues failed: {str(e)}"
+        else:
+            artifacts.append(("notes", notes_key, notes))
+
+        return {
+            "title": section["title"],
+            "visuals": visuals,
+            "notes": notes,
+            "regenerated": regenerated,
+            "artifacts": artifacts
+        }
+
+    def _process_visual_strategy(self, context: Dict[str, Any], manifest: SynthesisManifest) -> Dict[str, Any]:
+        """
+        Overall visual strategy, reused from the manifest unless topic,
+        duration or engagement strategy changed.
+
+        Returns:
+        --------
+        Dict[str, Any]
+            {"strategy", "artifacts": [(kind, inputs_hash, text), ...]}
+            (no artifacts if generation failed)
+        """
+
+        key = content_hash(
+            "visual_strategy", context["topic"], context["duration_minutes"], context["engagement_strategy"]
+        )
+        strategy = manifest.lookup("visual_strategy", key)
+
+        if strategy is not None:
+            return {"strategy": strategy, "artifacts": [("visual_strategy", key, strategy)]}
+
+        try:
+            strategy = self.visual_architect.design_visual_strategy(context)
+        except Exception as e:
+            return {"strategy": f"OVERALL VISUAL STRATEGY:\nVisual strategy failed: {str(e)}", "artifacts": []}
+
+        return {"strategy": strategy, "artifacts": [("visual_strategy", key, strategy)]}
+
+    def _process_project_notes(self, context: Dict[str, Any], manifest: SynthesisManifest) -> Dict[str, Any]:
+        """
+        Project-wide notes, reused from the manifest unless topic or duration changed.
+
+        Returns:
+        --------
+        Dict[str, Any]
+            {"notes", "artifacts": [(kind, inputs_hash, text), ...]}
+        """
+
+        key = content_hash("project_notes", context["topic"], context["duration_minutes"])
+        notes = manifest.lookup("project_notes", key)
+
+        if notes is not None:
+            return {"notes": notes, "artifacts": [("project_notes", key, notes)]}
+
+        try:
+            notes = self.notes_generator.generate_project_notes(context)
+        except Exception as e:
+            return {"notes": f"Project-wide notes failed: {str(e)}", "artifacts": []}
+
+        return {"notes": notes, "artifacts": [("project_notes", key, notes)]}
+
+
+# ==============================================================================
+# TESTING
+# ==============================================================================
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("TESTING PIPELINED SYNTHESIS")
+    print("=" * 70)
+
+    test_state = {
+        "topic": "The Science of Procrastination",
+        "duration_minutes": 10,
+        "research_findings": "Procrastination is emotional regulation, not time management.",
+        "viral_hooks": "You'd think procrastination is laziness. Science says otherwise.",
+        "engagement_strategy": "Pattern interrupt every 90 seconds.",
+        "target_audience": "Young professionals, 25-35"
+    }
+
+    pipeline = PipelinedSynthesis()
+    result_state = pipeline.run(test_state)
+
+    print("\n" + "=" * 70)
+    print("RESULTS")
+    print("=" * 70)
+    print(f"\nSections: {result_state.get('pipelined_section_count', 0)}")
+    print(f"Script Quality: {result_state.get('script_quality_score', 0):.1f}/10")
+    print(f"Visual Quality: {result_state.get('visual_quality_score', 0):.1f}/10")
+    print(f"Production Completeness: {result_state.get('production_completeness_score', 0):.1f}/10")
+
+    print("\n" + "=" * 70)
+    print("TEST COMPLETE")
+    print("=" * 70)
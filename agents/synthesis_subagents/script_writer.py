@@ -13,9 +13,56 @@ Author: Advanced Multi-Agent System
 Created: 2024
 """
 
-import anthropic
 import os
-from typing import Dict, List, Any
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Any, Optional
+
+# Add parent directories to path so shared agent modules can be imported
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from agents.client_registry import get_client
+from agents.response_cache import cached_message
+from agents.context_packer import pack_research
+from agents.token_estimator import tokens_for_words, truncate_to_tokens
+from agents.section_extractor import DocumentSpec, SectionRule, extract
+from agents.streaming import SectionConsumer, consume_stream, stream_message
+
+# Layout of a documentary script - parsed ONCE per script text
+# (see agents/section_extractor.py)
+SCRIPT_SPEC = DocumentSpec(
+    "documentary_script",
+    sections={
+        # A line with a "[timecode]" and a colon starts a section, e.g.
+        # "[00:00-00:30] COLD OPEN:" - body lines are kept as written
+        "section": SectionRule(
+            header=re.compile(r"^(?=.*:)[^\[\n]*(?P<title>\[[^\]\n]*\])"),
+            strip_lines=False
+        ),
+    }
+)
+
+# Stricter section start for streaming consumers: the first bracket on the
+# line must be a timecode, so narration lines like '"... [PAUSE]"' never
+# split a section in two
+TIMECODE_HEADER_PATTERN = re.compile(r"^[^\[\n]*(?P<title>\[\d{1,3}:\d{2}[^\]\n]*\])")
+
+# One outline line: "[02:00-05:00] ACT 1: COMPLICATION - Reveal deeper complexity"
+OUTLINE_LINE_PATTERN = re.compile(r"^\s*\[(\d{1,3}):(\d{2})\s*-\s*(\d{1,3}):(\d{2})\]\s*(.+?)\s*$")
+
+# One smoothing-pass answer: "TRANSITION 3: And that's where it gets strange."
+TRANSITION_LINE_PATTERN = re.compile(r"^\s*TRANSITION\s+(\d+)\s*:\s*(.+?)\s*$", re.IGNORECASE)
+
+# How much research (in tokens) goes into each script prompt
+RESEARCH_TOKEN_BUDGET = 750
+
+# Documentary narration pace used for every word-count target
+WORDS_PER_MINUTE = 130
+
+# Extra attempts for a section that fails in "sectioned" mode before the
+# whole script falls back to the single-call mode
+SECTION_RETRIES = 1
 
 class ScriptWriter:
     """
@@ -50,11 +97,20 @@ class ScriptWriter:
             )
         
         # Initialize Anthropic client
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        # (shared by every agent - see agents/client_registry.py)
+        self.client = get_client(self.api_key)
         
         # Use most capable model
         self.model = "claude-sonnet-4-20250514"
         
+        # "single": the whole script in one call (default)
+        # "sectioned": outline first, then every section written concurrently
+        # (state["script_writer_mode"] overrides this per run)
+        self.mode = os.getenv("SCRIPT_WRITER_MODE", "single")
+        
+        # Sections written at the same time in "sectioned" mode
+        self.section_concurrency = int(os.getenv("SCRIPT_SECTION_MAX_CONCURRENCY", 4))
+        
         # Define the agent's expertise
         self.agent_role = """You are the SCRIPT WRITER - a master documentary scriptwriter.
 
@@ -96,7 +152,11 @@ Write complete, production-ready scripts that:
 
 You write scripts that are both academically rigorous AND highly watchable."""
     
-    def write_script(self, state: Dict[str, Any]) -> Dict[str, Any]:
+    def write_script(
+        self,
+        state: Dict[str, Any],
+        stream_consumers: Optional[List[Any]] = None
+    ) -> Dict[str, Any]:
         """
         MAIN WRITING METHOD - Generate complete script
         
@@ -115,6 +175,12 @@ You write scripts that are both academically rigorous AND highly watchable."""
             - engagement_strategy: Engagement plan
             - psychology_triggers: Trigger strategy
             - target_audience: Demographics
+        stream_consumers : Optional[List[Any]]
+            If given, the script is STREAMED and every text piece is fed to
+            these consumers as it arrives (see agents/streaming.py).
+            Use section_consumer() to get each timecoded section the moment
+            it is finished, long before the whole script is done.
+            (In "sectioned" mode consumers see the finished script at the end.)
         
         Returns:
         --------
@@ -127,17 +193,17 @@ You write scripts that are both academically rigorous AND highly watchable."""
         # Extract all necessary information
         topic = state.get("topic", "Unknown")
         duration = state.get("duration_minutes", 30)
-        research = state.get("research_findings", "No research")[:3000]
-        hooks = state.get("viral_hooks", "No hooks")[:2000]
-        engagement = state.get("engagement_strategy", "No strategy")[:2000]
-        psychology = state.get("psychology_triggers", "No triggers")[:2000]
+        research = pack_research(state.get("research_findings"), RESEARCH_TOKEN_BUDGET, "No research")
+        hooks = truncate_to_tokens(state.get("viral_hooks", "No hooks"), 500)
+        engagement = truncate_to_tokens(state.get("engagement_strategy", "No strategy"), 500)
+        psychology = truncate_to_tokens(state.get("psychology_triggers", "No triggers"), 500)
         audience = state.get("target_audience", "General")
-        patterns = state.get("viral_patterns", "No patterns")[:1500]
+        patterns = truncate_to_tokens(state.get("viral_patterns", "No patterns"), 375)
         
         # Calculate word count target
         # Average speaking rate: 150 words per minute
         # Documentary narration: ~130 words per minute (slower, clearer)
-        target_words = int(duration * 130)
+        target_words = int(duration * WORDS_PER_MINUTE)
         
         # Build comprehensive script generation prompt
         script_prompt = f"""WRITE COMPLETE DOCUMENTARY SCRIPT
@@ -254,30 +320,63 @@ WORD COUNT TRACKING:
 Write the COMPLETE script now. This is the final production script - 
 make every word count."""
         
+        # Context shared by every call in "sectioned" mode
+        shared_context = f"""PROJECT SPECIFICATIONS:
+Topic: {topic}
+Duration: {duration} minutes
+Target Word Count: {target_words} words (~{WORDS_PER_MINUTE} words/minute)
+Target Audience: {audience}
+
+RESEARCH FOUNDATION:
+{research}
+
+VIRAL HOOK OPTIONS:
+{hooks}
+
+ENGAGEMENT STRATEGY:
+{engagement}
+
+PSYCHOLOGICAL TRIGGERS:
+{psychology}
+
+VIRAL PATTERNS TO IMPLEMENT:
+{patterns}"""
+        
+        mode = state.get("script_writer_mode", self.mode)
+        
         try:
-            # Call Claude to generate the script
-            # Using max tokens to allow full script
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=8000,  # Long script needs many tokens
-                temperature=0.8,  # Creative but controlled
-                system=self.agent_role,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": script_prompt
-                    }
-                ]
-            )
+            script = None
             
-            # Extract the script
-            script = response.content[0].text
+            if mode == "sectioned":
+                # Outline -> concurrent sections -> transition pass
+                script = self._write_sectioned_script(shared_context, duration)
+                if script is not None and stream_consumers:
+                    consume_stream([script], stream_consumers)
+            
+            if script is None:
+                # Call Claude to generate the script
+                # Using max tokens to allow full script
+                # Room for the narration plus timecodes and production marks
+                # (never less than the long-standing 8000)
+                request = dict(
+                    model=self.model,
+                    max_tokens=min(16000, max(8000, tokens_for_words(target_words) * 2)),
+                    temperature=0.8,  # Creative but controlled
+                    system=self.agent_role,
+                    user_message=script_prompt
+                )
+                
+                if stream_consumers:
+                    # Stream so consumers can start on finished sections early
+                    script = consume_stream(stream_message(self.client, **request), stream_consumers)
+                else:
+                    script = cached_message(self.client, **request)
             
             # Count actual words in script
             word_count = len(script.split())
             
             # Calculate actual duration based on word count
-            actual_duration = word_count / 130  # 130 words per minute
+            actual_duration = word_count / WORDS_PER_MINUTE  # 130 words per minute
             
             # Count how many timecodes are present
             timecode_count = script.count("[") - script.count("[[")  # Exclude [PAUSE]
@@ -339,6 +438,295 @@ make every word count."""
             
             return state
     
+    def _write_sectioned_script(self, shared_context: str, duration: float) -> Optional[str]:
+        """
+        SECTIONED MODE - Outline first, then write every section at once
+        
+        One giant call has to fit the whole script into a single max_tokens
+        budget, and takes longer the longer the documentary. Here:
+        1. A short call writes a timecoded outline
+        2. Every outline section is written in its OWN call, concurrently,
+           from the outline plus the shared context
+        3. A light final pass writes one bridging line per section boundary
+           so the independently written sections flow into each other
+        
+        Parameters:
+        -----------
+        shared_context : str
+            Topic, specifications, research and viral inputs
+        duration : float
+            Target length in minutes
+        
+        A section that fails (or comes back empty) is retried on its own
+        (SECTION_RETRIES times); the sections already written are kept.
+        
+        Returns:
+        --------
+        Optional[str]
+            The assembled script, or None if no usable outline came back or
+            a section still failed after its retries (the caller then falls
+            back to the single-call mode)
+        """
+        
+        try:
+            outline_text = self._generate_outline(shared_context, duration)
+        except Exception as e:
+            print(f"⚠️ Script Writer: Outline failed ({str(e)}), writing script in one call")
+            return None
+        
+        outline = self._parse_outline(outline_text)
+        
+        if len(outline) < 2:
+            print("⚠️ Script Writer: Outline unusable, writing script in one call")
+            return None
+        
+        print(f"   Outline: {len(outline)} sections, writing concurrently...")
+        
+        def write(index: int) -> Optional[str]:
+            # Errors stay inside this section - one bad call must not
+            # throw away the sections written alongside it
+            for attempt in range(SECTION_RETRIES + 1):
+                try:
+                    text = self._write_section(shared_context, outline_text, outline, index)
+                    if text:
+                        return text
+                    error = "empty response"
+                except Exception as e:
+                    error = str(e)
+                
+                retrying = attempt < SECTION_RETRIES
+                print(f"⚠️ Script Writer: Section {outline[index]['timecode']} failed ({error})"
+                      + (", retrying" if retrying else ""))
+            
+            return None
+        
+        # map() keeps results in outline order
+        with ThreadPoolExecutor(max_workers=max(1, self.section_concurrency)) as executor:
+            sections = list(executor.map(write, range(len(outline))))
+        
+        if None in sections:
+            print("⚠️ Script Writer: A section could not be written, writing script in one call")
+            return None
+        
+        sections = self._smooth_transitions(outline, sections)
+        
+        return "\n\n---\n\n".join(sections)
+    
+    def _generate_outline(self, shared_context: str, duration: float) -> str:
+        """
+        Ask for a timecoded outline: one "[MM:SS-MM:SS] TITLE - purpose" line per section.
+        """
+        
+        section_count = max(4, min(16, int(duration // 2) + 2))
+        
+        outline_prompt = f"""OUTLINE A DOCUMENTARY SCRIPT
+
+{shared_context}
+
+YOUR TASK:
+Write a timecoded outline of {section_count} sections covering 00:00 to {int(duration)}:00,
+following the cold open -> setup -> complication -> investigation ->
+revelation -> synthesis -> closing arc.
+
+Write EXACTLY one line per section and nothing else, in this format:
+[MM:SS-MM:SS] SECTION TITLE - What this section must accomplish (hook, loop opened/closed, key finding)"""
+        
+        return cached_message(
+            self.client,
+            model=self.model,
+            max_tokens=1500,  # An outline is short
+            temperature=0.7,
+            system=self.agent_role,
+            user_message=outline_prompt
+        )
+    
+    def _parse_outline(self, outline_text: str) -> List[Dict[str, Any]]:
+        """
+        Turn outline lines into sections with a word budget each.
+        
+        Returns:
+        --------
+        List[Dict[str, Any]]
+            [{"timecode": "[00:00-00:30]", "heading": "...", "target_words": 65}, ...]
+        """
+        
+        outline = []
+        
+        for line in outline_text.split("\n"):
+            match = OUTLINE_LINE_PATTERN.match(line)
+            if not match:
+                continue
+            
+            start_min, start_sec, end_min, end_sec, heading = match.groups()
+            start = int(start_min) * 60 + int(start_sec)
+            end = int(end_min) * 60 + int(end_sec)
+            if end <= start:
+                continue
+            
+            outline.append({
+                "timecode": f"[{start_min}:{start_sec}-{end_min}:{end_sec}]",
+                "heading": heading,
+                "target_words": max(20, int((end - start) / 60 * WORDS_PER_MINUTE))
+            })
+        
+        return outline
+    
+    def _write_section(
+        self,
+        shared_context: str,
+        outline_text: str,
+        outline: List[Dict[str, Any]],
+        index: int
+    ) -> str:
+        """
+        Write ONE outline section (runs on a worker thread).
+        """
+        
+        section = outline[index]
+        previous_heading = outline[index - 1]["heading"] if index > 0 else "(none - this is the opening)"
+        next_heading = outline[index + 1]["heading"] if index + 1 < len(outline) else "(none - this is the ending)"
+        
+        section_prompt = f"""WRITE ONE SECTION OF A DOCUMENTARY SCRIPT
+
+{shared_context}
+
+FULL OUTLINE (other sections are being written separately):
+{outline_text}
+
+WRITE THIS SECTION ONLY:
+{section["timecode"]} {section["heading"]}
+Target Word Count: {section["target_words"]} words (±10%)
+Previous section: {previous_heading}
+Next section: {next_heading}
+
+FORMAT:
+
+{section["timecode"]} [SECTION TITLE]:
+
+**NARRATION:**
+"Complete narration text here. [PAUSE] for timing marks. *Emphasize* key words."
+
+**PACING NOTES:** [Fast/Medium/Slow]
+**EMOTIONAL TONE:** [Describe target emotion]
+**KEY TRIGGER:** [Which psychological trigger is active]
+
+Don't repeat what the previous section covers or pre-empt the next one.
+Write the section now."""
+        
+        return cached_message(
+            self.client,
+            model=self.model,
+            max_tokens=min(4000, max(1000, tokens_for_words(section["target_words"]) * 2)),
+            temperature=0.8,  # Same creativity as the single-call script
+            system=self.agent_role,
+            user_message=section_prompt
+        ).strip()
+    
+    def _smooth_transitions(self, outline: List[Dict[str, Any]], sections: List[str]) -> List[str]:
+        """
+        LIGHT FINAL PASS - One bridging line at each section boundary
+        
+        Only the end of each section and the start of the next are sent,
+        so this call stays small no matter how long the script is.
+        If it fails, the sections are returned unchanged.
+        """
+        
+        boundaries = []
+        for index in range(len(sections) - 1):
+            ending = " ".join(sections[index].split()[-60:])
+            opening = " ".join(sections[index + 1].split()[:60])
+            boundaries.append(
+                f"BOUNDARY {index + 1} ({outline[index]['timecode']} -> {outline[index + 1]['timecode']}):\n"
+                f"END OF SECTION: ...{ending}\n"
+                f"START OF NEXT: {opening}..."
+            )
+        
+        boundary_text = "\n\n".join(boundaries)
+        
+        smoothing_prompt = f"""SMOOTH SCRIPT TRANSITIONS
+
+These documentary sections were written separately. For each boundary,
+write ONE short narration line that closes the section and hands over to the
+next one naturally (open a loop, tease, or bridge the idea).
+
+{boundary_text}
+
+Reply with one line per boundary and nothing else:
+TRANSITION 1: [narration line]
+TRANSITION 2: [narration line]
+..."""
+        
+        try:
+            response = cached_message(
+                self.client,
+                model=self.model,
+                max_tokens=min(4000, 100 * len(boundaries) + 200),
+                temperature=0.7,
+                system=self.agent_role,
+                user_message=smoothing_prompt
+            )
+        except Exception as e:
+            print(f"⚠️ Script Writer: Transition pass skipped ({str(e)})")
+            return sections
+        
+        smoothed = list(sections)
+        for line in response.split("\n"):
+            match = TRANSITION_LINE_PATTERN.match(line)
+            if not match:
+                continue
+            index = int(match.group(1)) - 1
+            if 0 <= index < len(smoothed) - 1:
+                line_text = match.group(2).strip('"')
+                smoothed[index] += f'\n\n**TRANSITION:** "{line_text}"'
+        
+        return smoothed
+    
+    def section_consumer(self, on_section: Callable[[Dict[str, Any]], None]) -> SectionConsumer:
+        """
+        STREAM CONSUMER - Report each script section as soon as it is written
+        
+        Pass the result to write_script(state, stream_consumers=[...]).
+        A section starts at a line whose first bracket is a timecode, so
+        "title" is the section's timecode (e.g. "[02:00-05:00]").
+        
+        Parameters:
+        -----------
+        on_section : Callable
+            Called with {"index", "title", "header", "text"} for every
+            completed section, in script order
+        
+        Returns:
+        --------
+        SectionConsumer
+            Consumer to register with write_script()
+        """
+        
+        return SectionConsumer(TIMECODE_HEADER_PATTERN, on_section)
+    
+    def split_sections(self, script: str) -> List[Dict[str, Any]]:
+        """
+        SPLIT SCRIPT - Cut a finished script into its timecoded sections
+        
+        Uses the same section rule as section_consumer(), so a script split
+        here lines up exactly with the sections a streaming run reported
+        (e.g. for regenerating only the sections an editor changed).
+        
+        Parameters:
+        -----------
+        script : str
+            Complete script text
+        
+        Returns:
+        --------
+        List[Dict[str, Any]]
+            Sections as {"index", "title", "header", "text"}, in order
+        """
+        
+        consumer = self.section_consumer(lambda section: None)
+        consume_stream([script], [consumer])
+        
+        return consumer.sections
+    
     def get_script_sections(self, state: Dict[str, Any]) -> List[Dict[str, str]]:
         """
         EXTRACT SCRIPT SECTIONS - Parse script into timestamped sections
@@ -362,35 +750,13 @@ make every word count."""
         if not script:
             return []
         
-        sections = []
-        current_section = {}
+        # Timecoded sections come straight from the parsed index
+        index = extract(script, SCRIPT_SPEC)
         
-        # Split by lines
-        lines = script.split("\n")
-        
-        for line in lines:
-            # Look for timecodes
-            if "[" in line and "]" in line and ":" in line:
-                # Save previous section if exists
-                if current_section:
-                    sections.append(current_section)
-                
-                # Start new section
-                timecode = line[line.find("["):line.find("]")+1]
-                current_section = {
-                    "timecode": timecode,
-                    "content": []
-                }
-            elif current_section:
-                # Add content to current section
-                if line.strip():
-                    current_section["content"].append(line)
-        
-        # Add last section
-        if current_section:
-            sections.append(current_section)
-        
-        return sections
+        return [
+            {"timecode": section["title"], "content": list(section["lines"])}
+            for section in index["sections"]["section"]
+        ]
     
     def export_script_to_file(self, state: Dict[str, Any], filename: str = "documentary_script.txt") -> str:
         """
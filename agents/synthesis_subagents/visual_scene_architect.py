@@ -13,9 +13,39 @@ Author: Advanced Multi-Agent System
 Created: 2024
 """
 
-import anthropic
 import os
-from typing import Dict, List, Any
+import re
+import sys
+from typing import Callable, Dict, List, Any, Optional
+
+# Add parent directories to path so shared agent modules can be imported
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from agents.client_registry import get_client
+from agents.response_cache import cached_message
+from agents.token_estimator import truncate_to_tokens
+from agents.section_extractor import DocumentSpec, SectionRule, extract
+from agents.streaming import SectionConsumer, consume_stream, stream_message
+
+# Layout of a visual architecture - parsed ONCE per document
+# (see agents/section_extractor.py)
+VISUAL_ARCHITECTURE_SPEC = DocumentSpec(
+    "visual_architecture",
+    sections={
+        # "SCENE 3: The Lab" with a "TIMECODE: 02:30-03:15" line
+        "scene": SectionRule(
+            header=re.compile(r"(?i)^(?=.*SCENE )[^:]*:(?P<title>.*)$"),
+            fields={"timecode": re.compile(r"(?i)TIMECODE:(.*)")}
+        ),
+        # "B-ROLL NEEDED:" followed by "- item" bullets, until the next
+        # non-bullet heading (an all-caps line or a line with a colon)
+        "broll": SectionRule(
+            header=re.compile(r"(?i)B-ROLL"),
+            end=re.compile(r"^\s*(?![-•\s])(?=.*:|[^a-z]*[A-Z][^a-z]*$)"),
+            item=re.compile(r"^\s*[-•]+\s*(.*?)\s*$")
+        ),
+    }
+)
 
 class VisualSceneArchitect:
     """
@@ -51,7 +81,8 @@ class VisualSceneArchitect:
             )
         
         # Initialize client
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        # (shared by every agent - see agents/client_registry.py)
+        self.client = get_client(self.api_key)
         
         # Model selection
         self.model = "claude-sonnet-4-20250514"
@@ -120,7 +151,11 @@ Create shot-by-shot visual direction that:
 4. Matches pacing and mood
 5. Guides practical production"""
     
-    def design_visual_architecture(self, state: Dict[str, Any]) -> Dict[str, Any]:
+    def design_visual_architecture(
+        self,
+        state: Dict[str, Any],
+        stream_consumers: Optional[List[Any]] = None
+    ) -> Dict[str, Any]:
         """
         MAIN DESIGN METHOD - Create visual scene architecture
         
@@ -135,6 +170,10 @@ Create shot-by-shot visual direction that:
             - topic: Documentary topic
             - engagement_strategy: Pacing and retention plan
             - duration_minutes: Video length
+        stream_consumers : Optional[List[Any]]
+            If given, the visual direction is STREAMED and every text piece
+            is fed to these consumers as it arrives (see agents/streaming.py).
+            Use scene_consumer() to get each scene as soon as it is finished.
         
         Returns:
         --------
@@ -145,10 +184,10 @@ Create shot-by-shot visual direction that:
         print("\n🎥 Visual Scene Architect: Designing visual direction...")
         
         # Extract information
-        script = state.get("documentary_script", "No script")[:4000]
+        script = truncate_to_tokens(state.get("documentary_script", "No script"), 1000)
         topic = state.get("topic", "Unknown")
         duration = state.get("duration_minutes", 30)
-        engagement = state.get("engagement_strategy", "No strategy")[:1500]
+        engagement = truncate_to_tokens(state.get("engagement_strategy", "No strategy"), 375)
         
         # Build visual design prompt
         visual_prompt = f"""CREATE VISUAL ARCHITECTURE
@@ -248,75 +287,22 @@ Create detailed direction for {min(20, int(duration * 1.5))} distinct scenes."""
         
         try:
             # Call Claude to generate visual architecture
-            response = self.client.messages.create(
+            request = dict(
                 model=self.model,
                 max_tokens=7000,  # Long, detailed visual descriptions
                 temperature=0.75,  # Creative but structured
                 system=self.agent_role,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": visual_prompt
-                    }
-                ]
+                user_message=visual_prompt
             )
             
-            # Extract visual architecture
-            visual_architecture = response.content[0].text
-            
-            # Count scenes
-            scene_count = visual_architecture.upper().count("SCENE ")
-            
-            # Count shots
-            shot_count = visual_architecture.upper().count("SHOT ")
-            
-            # Check for key elements
-            has_broll = "B-ROLL" in visual_architecture.upper()
-            has_graphics = "GRAPHICS" in visual_architecture.upper() or "ANIMATION" in visual_architecture.upper()
-            has_lighting = "LIGHTING" in visual_architecture.upper()
-            has_color = "COLOR" in visual_architecture.upper()
-            
-            # Calculate visual quality score
-            quality_score = 0.0
-            
-            # Scene coverage
-            if scene_count >= duration * 0.5:  # At least 1 scene per 2 minutes
-                quality_score += 3.0
-            elif scene_count > 0:
-                quality_score += 1.5
-            
-            # Shot detail
-            if shot_count >= scene_count * 2:  # Multiple shots per scene
-                quality_score += 2.5
-            elif shot_count > 0:
-                quality_score += 1.0
-            
-            # Production elements
-            if has_broll:
-                quality_score += 1.5
-            if has_graphics:
-                quality_score += 1.0
-            if has_lighting:
-                quality_score += 1.0
-            if has_color:
-                quality_score += 1.0
-            
-            quality_score = min(10.0, quality_score)
-            
-            # Add to state
-            state["visual_architecture"] = visual_architecture
-            state["scene_count"] = scene_count
-            state["shot_count"] = shot_count
-            state["visual_quality_score"] = quality_score
-            state["has_broll_direction"] = has_broll
-            state["has_graphics_direction"] = has_graphics
+            if stream_consumers:
+                # Stream so consumers can start on finished scenes early
+                visual_architecture = consume_stream(stream_message(self.client, **request), stream_consumers)
+            else:
+                visual_architecture = cached_message(self.client, **request)
             
-            # Success message
-            print(f"✅ Visual Scene Architect: Architecture created")
-            print(f"   Scenes Designed: {scene_count}")
-            print(f"   Shots Specified: {shot_count}")
-            print(f"   Quality Score: {quality_score:.1f}/10")
-            print(f"   B-roll: {'✓' if has_broll else '✗'} | Graphics: {'✓' if has_graphics else '✗'}")
+            # Score the document and record it in state
+            self.record_visual_architecture(state, visual_architecture, duration)
             
             return state
             
@@ -329,6 +315,283 @@ Create detailed direction for {min(20, int(duration * 1.5))} distinct scenes."""
             
             return state
     
+    def design_visual_strategy(self, context: Dict[str, Any]) -> str:
+        """
+        VISUAL STRATEGY - The project-wide "OVERALL VISUAL STRATEGY" block
+        
+        Used by the pipelined synthesis mode, where scenes are designed one
+        section at a time. The strategy needs no script (only topic,
+        duration and engagement strategy), so it can be requested right at
+        the start and then shared with every section as its visual language.
+        
+        Parameters:
+        -----------
+        context : Dict[str, Any]
+            Shared state: topic, duration_minutes, engagement_strategy
+        
+        Returns:
+        --------
+        str
+            Text starting with "OVERALL VISUAL STRATEGY:" (same six parts
+            as in design_visual_architecture())
+        """
+        
+        topic = context.get("topic", "Unknown")
+        duration = context.get("duration_minutes", 30)
+        engagement = truncate_to_tokens(context.get("engagement_strategy", "No strategy"), 375)
+        
+        strategy_prompt = f"""CREATE THE OVERALL VISUAL STRATEGY
+
+DOCUMENTARY DETAILS:
+Topic: {topic}
+Duration: {duration} minutes
+
+ENGAGEMENT STRATEGY:
+{engagement}
+
+YOUR TASK:
+Define the visual language of the whole documentary. Every scene will be
+designed separately FROM this strategy, so be specific: name the motifs,
+palette and shot style that all scenes must share.
+
+Answer in exactly this format:
+
+OVERALL VISUAL STRATEGY:
+
+1. VISUAL THEMES
+   - Primary visual motif: [Description]
+   - Secondary elements: [Description]
+   - Recurring imagery: [Description]
+
+2. PACING THROUGH VISUALS
+   - Opening (0-2 min): [Fast/Medium/Slow cuts, why]
+   - Middle sections: [Visual pacing strategy]
+   - Climax: [Peak visual intensity]
+   - Closing: [Resolution visual style]
+
+3. SHOT VARIETY BREAKDOWN
+   - % Close-ups: X%
+   - % Medium shots: X%
+   - % Wide shots: X%
+   - % Special shots: X%
+
+4. VISUAL PROGRESSION
+   How visuals evolve through the documentary:
+   [Describe arc of visual complexity/style]
+
+5. PRACTICAL PRODUCTION REQUIREMENTS
+   - Location types needed: [List]
+   - Props/materials needed: [List]
+   - Special equipment: [List]
+   - Estimated filming days: X
+
+6. EDITOR'S GUIDE
+   - Suggested editing pace
+   - Transition styles
+   - Color grading direction
+   - Audio-visual sync points"""
+        
+        return cached_message(
+            self.client,
+            model=self.model,
+            max_tokens=1500,  # One strategy block
+            temperature=0.75,  # Same creativity as the full document
+            system=self.agent_role,
+            user_message=strategy_prompt
+        )
+    
+    def design_section_visuals(
+        self,
+        section: Dict[str, Any],
+        context: Dict[str, Any],
+        visual_strategy: Optional[str] = None
+    ) -> str:
+        """
+        SECTION DESIGN - Visual direction for ONE script section
+        
+        Used by the pipelined synthesis mode: as soon as the Script Writer
+        finishes a timecoded section, its visuals are designed right away
+        instead of waiting for the whole script.
+        
+        The output uses the same "SCENE N: Name" / "TIMECODE:" layout as
+        design_visual_architecture(), so stitched sections still work with
+        get_scene_list() and get_broll_list().
+        
+        Parameters:
+        -----------
+        section : Dict[str, Any]
+            Finished script section: {"index", "title", "text"}
+            (as reported by ScriptWriter.section_consumer())
+        context : Dict[str, Any]
+            Shared state: topic, duration_minutes, engagement_strategy
+        visual_strategy : Optional[str]
+            Result of design_visual_strategy() - keeps every separately
+            designed scene in the same visual language
+        
+        Returns:
+        --------
+        str
+            Visual direction for this section
+        """
+        
+        topic = context.get("topic", "Unknown")
+        duration = context.get("duration_minutes", 30)
+        engagement = truncate_to_tokens(context.get("engagement_strategy", "No strategy"), 200)
+        scene_number = section["index"] + 1
+        
+        strategy_block = ""
+        if visual_strategy:
+            strategy_block = f"""
+OVERALL VISUAL STRATEGY (follow its motifs, palette and shot style):
+{truncate_to_tokens(visual_strategy, 400)}
+"""
+        
+        section_prompt = f"""CREATE VISUAL DIRECTION FOR ONE SCRIPT SECTION
+
+DOCUMENTARY DETAILS:
+Topic: {topic}
+Duration: {duration} minutes
+
+ENGAGEMENT STRATEGY (EXCERPT):
+{engagement}
+{strategy_block}
+SCRIPT SECTION {scene_number} ({section["title"]}):
+{truncate_to_tokens(section["text"], 750)}
+
+YOUR TASK:
+Create shot-by-shot visual direction for THIS SECTION ONLY, in exactly
+this format:
+
+SCENE {scene_number}: [Descriptive Scene Name]
+TIMECODE: {section["title"].strip("[]")}
+SCRIPT REFERENCE: [Key quote from this section]
+
+VISUAL DIRECTION:
+
+Shot 1:
+- SHOT TYPE: [ECU/CU/MCU/MS/LS/ELS]
+- ANGLE: [Eye level/High/Low/Dutch]
+- MOVEMENT: [Static/Pan/Tilt/Dolly/Track]
+- SUBJECT: [What we're filming]
+- COMPOSITION: [Visual arrangement]
+- DURATION: [Seconds]
+- MOOD: [Emotional tone]
+- PURPOSE: [Why this shot]
+
+[Continue for 3-5 shots]
+
+B-ROLL NEEDED:
+- [Specific B-roll footage description]
+
+GRAPHICS/ANIMATIONS:
+- [Specific graphic/animation needs]
+
+LIGHTING MOOD: [Bright/Soft/Dramatic/etc.]
+COLOR PALETTE: [Color mood - Warm/Cool/Vibrant/Muted]
+PACING: [Fast cuts/Slow transitions/Mixed]"""
+        
+        return cached_message(
+            self.client,
+            model=self.model,
+            max_tokens=1500,  # One scene only
+            temperature=0.75,  # Same creativity as the full document
+            system=self.agent_role,
+            user_message=section_prompt
+        )
+    
+    def record_visual_architecture(self, state: Dict[str, Any], visual_architecture: str, duration: float):
+        """
+        SCORE AND STORE - Put a finished visual architecture into state
+        
+        Shared by design_visual_architecture() and the pipelined synthesis
+        mode (which stitches the document together section by section).
+        
+        Parameters:
+        -----------
+        state : Dict[str, Any]
+            State to update (in place)
+        visual_architecture : str
+            Complete visual architecture document
+        duration : float
+            Target video length in minutes
+        """
+        
+        # Count scenes
+        scene_count = visual_architecture.upper().count("SCENE ")
+        
+        # Count shots
+        shot_count = visual_architecture.upper().count("SHOT ")
+        
+        # Check for key elements
+        has_broll = "B-ROLL" in visual_architecture.upper()
+        has_graphics = "GRAPHICS" in visual_architecture.upper() or "ANIMATION" in visual_architecture.upper()
+        has_lighting = "LIGHTING" in visual_architecture.upper()
+        has_color = "COLOR" in visual_architecture.upper()
+        
+        # Calculate visual quality score
+        quality_score = 0.0
+        
+        # Scene coverage
+        if scene_count >= duration * 0.5:  # At least 1 scene per 2 minutes
+            quality_score += 3.0
+        elif scene_count > 0:
+            quality_score += 1.5
+        
+        # Shot detail
+        if shot_count >= scene_count * 2:  # Multiple shots per scene
+            quality_score += 2.5
+        elif shot_count > 0:
+            quality_score += 1.0
+        
+        # Production elements
+        if has_broll:
+            quality_score += 1.5
+        if has_graphics:
+            quality_score += 1.0
+        if has_lighting:
+            quality_score += 1.0
+        if has_color:
+            quality_score += 1.0
+        
+        quality_score = min(10.0, quality_score)
+        
+        # Add to state
+        state["visual_architecture"] = visual_architecture
+        state["scene_count"] = scene_count
+        state["shot_count"] = shot_count
+        state["visual_quality_score"] = quality_score
+        state["has_broll_direction"] = has_broll
+        state["has_graphics_direction"] = has_graphics
+        
+        # Success message
+        print(f"✅ Visual Scene Architect: Architecture created")
+        print(f"   Scenes Designed: {scene_count}")
+        print(f"   Shots Specified: {shot_count}")
+        print(f"   Quality Score: {quality_score:.1f}/10")
+        print(f"   B-roll: {'✓' if has_broll else '✗'} | Graphics: {'✓' if has_graphics else '✗'}")
+    
+    def scene_consumer(self, on_scene: Callable[[Dict[str, Any]], None]) -> SectionConsumer:
+        """
+        STREAM CONSUMER - Report each scene as soon as it is written
+        
+        Pass the result to design_visual_architecture(state, stream_consumers=[...]).
+        Scenes are recognized with the same header rule as get_scene_list(),
+        so "title" is the scene's name.
+        
+        Parameters:
+        -----------
+        on_scene : Callable
+            Called with {"index", "title", "header", "text"} for every
+            completed scene, in document order
+        
+        Returns:
+        --------
+        SectionConsumer
+            Consumer to register with design_visual_architecture()
+        """
+        
+        return SectionConsumer(VISUAL_ARCHITECTURE_SPEC.sections["scene"].header, on_scene)
+    
     def get_scene_list(self, state: Dict[str, Any]) -> List[Dict[str, str]]:
         """
         EXTRACT SCENE LIST - Get all scenes with timecodes
@@ -351,30 +614,18 @@ Create detailed direction for {min(20, int(duration * 1.5))} distinct scenes."""
         if not architecture:
             return []
         
+        # Scene sections come straight from the parsed index
+        index = extract(architecture, VISUAL_ARCHITECTURE_SPEC)
+        
         scenes = []
-        lines = architecture.split("\n")
-        current_scene = {}
-        
-        for line in lines:
-            if "SCENE " in line.upper() and ":" in line:
-                # Save previous scene
-                if current_scene:
-                    scenes.append(current_scene)
-                
-                # New scene
-                scene_name = line.split(":", 1)[1].strip() if ":" in line else line
-                current_scene = {
-                    "name": scene_name,
-                    "details": []
-                }
-            elif "TIMECODE:" in line.upper() and current_scene:
-                current_scene["timecode"] = line.split(":", 1)[1].strip()
-            elif current_scene and line.strip():
-                current_scene["details"].append(line.strip())
-        
-        # Add last scene
-        if current_scene:
-            scenes.append(current_scene)
+        for section in index["sections"]["scene"]:
+            scene = {
+                "name": section["title"],
+                "details": list(section["lines"])
+            }
+            if "timecode" in section["fields"]:
+                scene["timecode"] = section["fields"]["timecode"][-1]
+            scenes.append(scene)
         
         return scenes
     
@@ -400,29 +651,14 @@ Create detailed direction for {min(20, int(duration * 1.5))} distinct scenes."""
         if not architecture:
             return []
         
-        broll_list = []
-        lines = architecture.split("\n")
-        in_broll_section = False
+        # Bullet items of every B-roll section, in document order
+        index = extract(architecture, VISUAL_ARCHITECTURE_SPEC)
         
-        for line in lines:
-            if "B-ROLL" in line.upper():
-                in_broll_section = True
-                continue
-            
-            if in_broll_section:
-                # Check if we've left the B-roll section
-                if line.strip() and not line.strip().startswith("-") and not line.strip().startswith("•"):
-                    if line.isupper() or ":" in line:
-                        in_broll_section = False
-                        continue
-                
-                # Extract B-roll item
-                if line.strip().startswith("-") or line.strip().startswith("•"):
-                    broll_item = line.strip().lstrip("-•").strip()
-                    if broll_item:
-                        broll_list.append(broll_item)
-        
-        return broll_list
+        return [
+            item
+            for section in index["sections"]["broll"]
+            for item in section["items"]
+        ]
 
 
 # ==============================================================================
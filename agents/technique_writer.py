@@ -0,0 +1,214 @@
+"""
+Technique Writer - Batched, Repeat-Safe Writes to the Technique Library
+
+The viral_techniques collection (ChromaDB) used to be written one document
+per call, with IDs made from the current time. Two analyses stored in the
+same second got the SAME ID (one failed), and every single add paid for
+its own embedding call and index write.
+
+EXPLANATION FOR BEGINNERS:
+- Every document gets a STABLE ID:
+  - analyzed videos: derived from the video URL (the same video always
+    gets the same ID, however its URL was written)
+  - anything else: derived from the document's content
+- Documents are BUFFERED and written in batches with upsert()
+  ("update if the ID exists, insert if not") - one embedding call and
+  one index write per batch instead of per document
+- Each document's metadata carries a fingerprint of its content. Before
+  writing, we look up the IDs: a document whose fingerprint is already
+  stored is skipped, so re-ingesting the same video is a no-op
+- Timestamps such as "analyzed_at" are not part of the fingerprint, so
+  re-analyzing a video with the same result also writes nothing (the
+  stored entry keeps its original timestamp)
+
+USAGE EXAMPLE:
+    from agents.technique_writer import TechniqueWriter, video_technique_id
+
+    with TechniqueWriter(collection, batch_size=64) as writer:
+        for analysis in analyses:
+            writer.add(video_technique_id(analysis["video_url"]), analysis["analysis_text"], metadata)
+    # Leaving the "with" block writes whatever is still buffered
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+import json
+import os
+import threading
+
+from agents.bm25_index import update_collection_index
+from agents.hashing import content_hash
+from agents.query_cache import bump_collection_version
+
+# Documents per upsert() call
+DEFAULT_BATCH_SIZE = int(os.getenv("TECHNIQUE_WRITE_BATCH_SIZE", 64))
+
+# Metadata key holding each document's content fingerprint
+CONTENT_HASH_KEY = "content_hash"
+
+# Metadata that changes on every run without the document changing
+# (e.g. when it was analyzed) - left out of the fingerprint
+VOLATILE_METADATA_KEYS = frozenset({CONTENT_HASH_KEY, "analyzed_at"})
+
+
+def normalize_video_url(url: str) -> str:
+    """
+    Reduce a video URL to what identifies the video.
+
+    "https://www.youtube.com/watch?v=abc&t=30s", "youtu.be/abc" and
+    "youtube.com/shorts/abc" all become "youtube:abc". Other URLs lose
+    their scheme, "www." and trailing slash and are lower-cased.
+    """
+    url = url.strip()
+    parsed = urlparse(url if "://" in url else f"https://{url}")
+    host = parsed.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+
+    if host in ("youtube.com", "m.youtube.com", "music.youtube.com"):
+        video_id = parse_qs(parsed.query).get("v", [None])[0]
+        if not video_id and parsed.path.startswith(("/shorts/", "/embed/", "/live/")):
+            video_id = parsed.path.split("/")[2]
+        if video_id:
+            return f"youtube:{video_id}"
+    elif host == "youtu.be" and parsed.path.strip("/"):
+        return f"youtube:{parsed.path.strip('/').split('/')[0]}"
+
+    return f"{host}{parsed.path}".rstrip("/").lower()
+
+
+def video_technique_id(video_url: str) -> str:
+    """Stable document ID for an analyzed video (same video, same ID)."""
+    return f"video_{content_hash(normalize_video_url(video_url))[:20]}"
+
+
+def content_technique_id(text: str, prefix: str = "technique") -> str:
+    """Stable document ID derived from the document's content."""
+    return f"{prefix}_{content_hash(text)[:20]}"
+
+
+def document_fingerprint(document: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+    """Fingerprint of a document and its metadata (minus VOLATILE_METADATA_KEYS)."""
+    metadata = {key: value for key, value in (metadata or {}).items() if key not in VOLATILE_METADATA_KEYS}
+    return content_hash(document, json.dumps(metadata, sort_keys=True, default=str))
+
+
+class TechniqueWriter:
+    """
+    Buffers documents for a ChromaDB collection and upserts them in batches.
+
+    Safe to share between threads. Documents added with the same ID before
+    a flush are collapsed (the last one wins).
+    """
+
+    def __init__(
+        self,
+        collection: Any,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        on_flush: Optional[Callable[[List[str]], None]] = None
+    ):
+        """
+        Args:
+            collection: ChromaDB collection to write to
+            batch_size: Documents per upsert() (a full buffer flushes itself)
+            on_flush: Called with the IDs of every batch that reached the
+                database (written or already up to date)
+        """
+        self.collection = collection
+        self.batch_size = max(1, batch_size)
+        self.on_flush = on_flush
+
+        self.written = 0
+        self.unchanged = 0
+
+        # id -> (document, metadata), in the order they were added
+        self._buffer: Dict[str, tuple] = {}
+        self._lock = threading.RLock()
+
+    def __enter__(self) -> "TechniqueWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.flush()
+
+    @property
+    def pending(self) -> int:
+        """Documents waiting to be written."""
+        return len(self._buffer)
+
+    def add(self, doc_id: str, document: str, metadata: Optional[Dict[str, Any]] = None):
+        """
+        Buffer one document (flushes automatically when the buffer is full).
+
+        Args:
+            doc_id: Stable ID (see video_technique_id / content_technique_id)
+            document: Text to embed and store
+            metadata: ChromaDB metadata (str/int/float/bool values)
+        """
+        metadata = dict(metadata or {})
+        metadata[CONTENT_HASH_KEY] = document_fingerprint(document, metadata)
+
+        with self._lock:
+            # Re-adding an ID moves it to the end with the newest content
+            self._buffer.pop(doc_id, None)
+            self._buffer[doc_id] = (document, metadata)
+
+            if len(self._buffer) >= self.batch_size:
+                self.flush()
+
+    def flush(self) -> int:
+        """
+        Write everything buffered, one upsert() per batch.
+
+        A batch that fails is dropped from the buffer and its error is
+        raised; batches written before it stay written.
+
+        Returns:
+            Number of documents actually written (unchanged ones excluded)
+        """
+        written = 0
+
+        with self._lock:
+            while self._buffer:
+                ids = list(self._buffer)[:self.batch_size]
+                batch = {doc_id: self._buffer.pop(doc_id) for doc_id in ids}
+                written += self._write_batch(batch)
+
+                if self.on_flush:
+                    self.on_flush(ids)
+
+        return written
+
+    def _write_batch(self, batch: Dict[str, tuple]) -> int:
+        """Upsert one batch, skipping documents whose fingerprint is already stored."""
+        ids = list(batch)
+
+        # One lookup for the whole batch (metadata only - no embeddings)
+        existing = self.collection.get(ids=ids, include=["metadatas"])
+        stored_hashes = {
+            doc_id: (meta or {}).get(CONTENT_HASH_KEY)
+            for doc_id, meta in zip(existing.get("ids") or [], existing.get("metadatas") or [])
+        }
+
+        changed = [
+            doc_id for doc_id in ids
+            if stored_hashes.get(doc_id) != batch[doc_id][1][CONTENT_HASH_KEY]
+        ]
+        self.unchanged += len(ids) - len(changed)
+
+        if changed:
+            self.collection.upsert(
+                ids=changed,
+                documents=[batch[doc_id][0] for doc_id in changed],
+                metadatas=[batch[doc_id][1] for doc_id in changed]
+            )
+            self.written += len(changed)
+
+            # Cached search results no longer reflect the collection;
+            # the keyword index only re-indexes what was written
+            version = bump_collection_version(self.collection)
+            update_collection_index(
+                self.collection, version, {doc_id: batch[doc_id][0] for doc_id in changed}
+            )
+
+        return len(changed)
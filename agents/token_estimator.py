@@ -0,0 +1,242 @@
+"""
+Token Estimator - Know How Big a Prompt Is Before Sending It
+
+Claude measures text in TOKENS, not characters. Cutting text at "3000
+characters" is a guess: 3000 characters of prose is ~700 tokens, but 3000
+characters of numbers and JSON punctuation can be well over 1000. This file
+estimates token counts locally (no network call) so agents can size
+prompts, pick max_tokens and log prompt sizes in the unit that matters.
+
+EXPLANATION FOR BEGINNERS:
+When tiktoken is installed (it is in requirements.txt), the text is run
+through its cl100k_base tokenizer. That is OpenAI's tokenizer, not
+Claude's, but the two split English text and JSON very similarly, so it
+is a close stand-in.
+
+Without tiktoken (or when its tokenizer files can't be downloaded), a
+rough local rule is used instead. The text is split into pieces the way
+tokenizers roughly see it:
+- a word ("procrastination") costs about 1 token per 6 letters (min 1)
+- a number costs about 1 token per 3 digits
+- every punctuation mark or symbol ({ } " : , ...) costs 1 token
+- every non-English character (é, 日, emoji) costs about 1 token
+- a single space is free (it rides along with the next word); line breaks
+  and runs of indentation cost 1 token each
+Either way, the total is multiplied by a small safety factor so
+estimates err HIGH - better to leave a little room than to overflow a
+budget. The rough rule is only meant for budgeting; check it against the
+tokenizer with tests/test_token_estimator.py.
+
+CONFIGURATION (environment variables, all optional):
+- TOKEN_ESTIMATE_SCALE: Multiply every estimate by this (default: 1.05)
+- TOKEN_ESTIMATOR: "tiktoken" (default) or "heuristic" to always use the
+  rough rule
+
+USAGE EXAMPLE:
+    from agents.token_estimator import estimate_tokens, truncate_to_tokens
+
+    print(estimate_tokens(prompt))            # e.g. 1834
+    research = truncate_to_tokens(research, 750)
+"""
+
+from typing import List, Optional
+import math
+import os
+import re
+import threading
+
+# tiktoken - exact BPE tokenizer (optional)
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# Safety factor applied to every estimate (errs slightly high)
+DEFAULT_SCALE = float(os.getenv("TOKEN_ESTIMATE_SCALE", 1.05))
+
+# tiktoken encoding used as a stand-in for Claude's tokenizer
+TIKTOKEN_ENCODING = "cl100k_base"
+
+# Claude's context window (prompt + response) for the models used here
+DEFAULT_CONTEXT_WINDOW = 200_000
+
+# Fixed cost of a request's framing (roles, message boundaries)
+MESSAGE_OVERHEAD_TOKENS = 10
+
+# Spoken English: tokens per word of narration (used for word-count targets)
+TOKENS_PER_WORD = 1.35
+
+# One match per "piece": words, numbers, whitespace runs, single other characters
+_PIECE_PATTERN = re.compile(r"[A-Za-z]+|\d+|\s+|.", re.DOTALL)
+
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding():
+    """
+    Load the tiktoken encoding once.
+
+    Returns None when tiktoken is missing, TOKEN_ESTIMATOR=heuristic, or
+    the encoding can't be loaded (tiktoken downloads it on first use).
+    """
+    global _encoding, _encoding_loaded
+
+    if not TIKTOKEN_AVAILABLE or os.getenv("TOKEN_ESTIMATOR", "tiktoken").strip().lower() == "heuristic":
+        return None
+
+    with _encoding_lock:
+        if not _encoding_loaded:
+            _encoding_loaded = True
+            try:
+                _encoding = tiktoken.get_encoding(TIKTOKEN_ENCODING)
+            except Exception:
+                # Offline and not cached yet - use the rough rule
+                _encoding = None
+
+    return _encoding
+
+
+def _encode(encoding, text: str) -> List[int]:
+    """Tokenize text, treating special-token markers as plain text."""
+    return encoding.encode(text, disallowed_special=())
+
+
+def _piece_cost(piece: str) -> int:
+    """Token cost of one piece from _PIECE_PATTERN."""
+    first = piece[0]
+
+    if first.isascii() and first.isalpha():
+        return math.ceil(len(piece) / 6)
+    if first.isascii() and first.isdigit():
+        return math.ceil(len(piece) / 3)
+    if first.isspace():
+        # A lone space joins the next word; newlines and indentation cost 1
+        return 0 if piece == " " else 1
+    return 1
+
+
+def heuristic_tokens(text: Optional[str]) -> int:
+    """Token count by the rough local rule alone (no safety factor)."""
+    if not text:
+        return 0
+
+    return sum(_piece_cost(piece) for piece in _PIECE_PATTERN.findall(text))
+
+
+def estimate_tokens(text: Optional[str], scale: float = DEFAULT_SCALE) -> int:
+    """
+    Estimate how many tokens Claude will count for this text.
+
+    Args:
+        text: Any text (None counts as empty)
+        scale: Safety factor (default from TOKEN_ESTIMATE_SCALE)
+
+    Returns:
+        Estimated token count (0 for empty text)
+    """
+    if not text:
+        return 0
+
+    encoding = _get_encoding()
+    raw = len(_encode(encoding, text)) if encoding is not None else heuristic_tokens(text)
+    return math.ceil(raw * scale)
+
+
+def estimate_message_tokens(system: str, user_message: str) -> int:
+    """
+    Estimate the prompt size of one system + user message request.
+
+    Args:
+        system: System prompt
+        user_message: User message
+
+    Returns:
+        Estimated prompt tokens
+    """
+    return estimate_tokens(system) + estimate_tokens(user_message) + MESSAGE_OVERHEAD_TOKENS
+
+
+def tokens_for_words(word_count: int) -> int:
+    """Estimate the tokens needed to WRITE this many words of narration."""
+    return math.ceil(word_count * TOKENS_PER_WORD)
+
+
+def truncate_to_tokens(text: Optional[str], max_tokens: int, marker: str = " ...") -> str:
+    """
+    Shorten text to fit a token budget, preferably at a word boundary.
+
+    Text with no whitespace inside the budget (Chinese or Japanese, compact
+    JSON, a long URL) is cut at the last token that fits instead - never
+    reduced to just the marker.
+
+    Args:
+        text: Text to shorten (None counts as empty)
+        max_tokens: Token budget
+        marker: Appended when text was cut
+
+    Returns:
+        The text unchanged if it fits, otherwise its longest prefix that
+        fits (ending on a whole word where possible) plus the marker
+    """
+    if not text:
+        return text or ""
+
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    # Raw (unscaled) tokens left for the text itself
+    budget = max(0, max_tokens - estimate_tokens(marker)) / DEFAULT_SCALE
+
+    encoding = _get_encoding()
+    if encoding is not None:
+        # Longest token prefix that fits (a split multi-byte character
+        # decodes to U+FFFD and is dropped)
+        prefix = encoding.decode(_encode(encoding, text)[:int(budget)]).rstrip("\ufffd")
+    else:
+        # Walk the pieces until the budget is used up
+        used = 0
+        prefix_end = 0
+        for match in _PIECE_PATTERN.finditer(text):
+            used += _piece_cost(match.group())
+            if used > budget:
+                break
+            prefix_end = match.end()
+        prefix = text[:prefix_end]
+
+    # Prefer ending on a whole word: drop a word cut in half - unless that
+    # would throw away most of the prefix (text with few or no spaces)
+    if prefix and prefix[-1].isalnum() and text[len(prefix)].isalnum():
+        last_space = max(prefix.rfind(" "), prefix.rfind("\n"), prefix.rfind("\t"))
+        if last_space >= len(prefix) // 2:
+            prefix = prefix[:last_space]
+
+    return prefix.rstrip() + marker
+
+
+def fit_max_tokens(
+    prompt_tokens: int,
+    requested: int,
+    context_window: int = DEFAULT_CONTEXT_WINDOW,
+    minimum: int = 256
+) -> int:
+    """
+    Pick a max_tokens that still fits next to the prompt.
+
+    The prompt and the response share one context window, so a huge prompt
+    leaves less room for the answer.
+
+    Args:
+        prompt_tokens: Estimated prompt size
+        requested: The max_tokens the caller wanted
+        context_window: Total tokens the model accepts
+        minimum: Never go below this
+
+    Returns:
+        requested, lowered if the prompt leaves less room than that
+    """
+    room = context_window - prompt_tokens - MESSAGE_OVERHEAD_TOKENS
+    return max(minimum, min(requested, room))
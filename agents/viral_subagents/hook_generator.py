@@ -12,9 +12,77 @@ Author: Advanced Multi-Agent System
 Created: 2024
 """
 
-import anthropic  # Anthropic's SDK for calling Claude AI
 import os         # For accessing environment variables (API keys)
-from typing import Dict, List, Any  # For type hints
+import re         # For the compiled hook parser
+import sys        # For making the shared agent modules importable
+from typing import Dict, List, Any, Optional, TypedDict  # For type hints
+
+# Add parent directories to path so shared agent modules can be imported
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from agents.client_registry import get_client  # Shared, pooled Anthropic client
+from agents.response_cache import cached_message  # Persistent cache for Claude responses
+from agents.context_packer import pack_research  # Best research first, within a token budget
+from agents.token_estimator import truncate_to_tokens  # Cut text by tokens, not characters
+
+
+class HookRecord(TypedDict):
+    """
+    One parsed hook from the generated hook text.
+    
+    The hook's full text is viral_hooks[start:end] - we store offsets
+    instead of copying the text so state snapshots stay small.
+    """
+    number: int               # Hook number as written ("HOOK #3" -> 3)
+    title: str                # Hook name from the header line
+    score: Optional[float]    # EFFECTIVENESS SCORE, None if Claude left it out
+    start: int                # Offset of "HOOK #" in viral_hooks
+    end: int                  # Offset where this hook's text ends
+
+
+# How much research (in tokens) goes into the hook prompt
+RESEARCH_TOKEN_BUDGET = 500
+
+# Compiled once, used for every parse
+# Header: "HOOK #3: The Contrarian Opener" (number and separator are optional)
+_HOOK_HEADER_PATTERN = re.compile(r"HOOK #[^\S\n]*(\d*)[^\S\n]*[:.\-]?[^\S\n]*([^\n]*)")
+# Score: "EFFECTIVENESS SCORE: 8.5" / "EFFECTIVENESS SCORE: **9/10**"
+_EFFECTIVENESS_PATTERN = re.compile(r"EFFECTIVENESS SCORE:[\s*]*(\d+(?:\.\d+)?)")
+
+
+def parse_hooks(hooks_text: str) -> List[HookRecord]:
+    """
+    Parse generated hook text into hook records in a single pass.
+    
+    Parameters:
+    -----------
+    hooks_text : str
+        Claude's full hook generation output
+    
+    Returns:
+    --------
+    List[HookRecord]
+        One record per "HOOK #" section, in text order
+    """
+    headers = list(_HOOK_HEADER_PATTERN.finditer(hooks_text))
+    records: List[HookRecord] = []
+    
+    for i, header in enumerate(headers):
+        start = header.start()
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(hooks_text)
+        
+        score_match = _EFFECTIVENESS_PATTERN.search(hooks_text, header.end(), end)
+        
+        records.append({
+            "number": int(header.group(1)) if header.group(1) else i + 1,
+            "title": header.group(2).strip(" *"),
+            "score": float(score_match.group(1)) if score_match else None,
+            "start": start,
+            "end": end
+        })
+    
+    return records
+
 
 class HookGenerator:
     """
@@ -54,7 +122,8 @@ class HookGenerator:
             )
         
         # Create the Anthropic client for API calls
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        # (shared by every agent - see agents/client_registry.py)
+        self.client = get_client(self.api_key)
         
         # Specify which AI model to use (Claude Sonnet 4.5 is the smartest)
         self.model = "claude-sonnet-4-20250514"
@@ -116,8 +185,8 @@ Each hook must include specific psychological triggers and engagement mechanics.
         
         # Extract information from state
         topic = state.get("topic", "Unknown topic")
-        research = state.get("research_findings", "No research")[:2000]  # Limit size
-        patterns = state.get("viral_patterns", "No patterns")[:2000]
+        research = pack_research(state.get("research_findings"), RESEARCH_TOKEN_BUDGET, "No research")
+        patterns = truncate_to_tokens(state.get("viral_patterns", "No patterns"), 500)
         audience = state.get("target_audience", "General audience")
         
         # Build the hook generation prompt
@@ -179,42 +248,24 @@ Generate 7 unique hooks now."""
         try:
             # Call Claude AI to generate the hooks
             # We use temperature=0.9 for maximum creativity
-            response = self.client.messages.create(
+            hooks_content = cached_message(
+                self.client,
                 model=self.model,
                 max_tokens=4000,  # Long response needed for 7 detailed hooks
                 temperature=0.9,  # High creativity for generating diverse hooks
                 system=self.agent_role,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": hook_prompt
-                    }
-                ]
+                user_message=hook_prompt
             )
             
-            # Extract the generated hooks from Claude's response
-            hooks_content = response.content[0].text
-            
-            # Parse out individual hooks
-            # We split by "HOOK #" to separate each hook
-            hook_sections = hooks_content.split("HOOK #")[1:]  # Skip first empty element
+            # Parse every hook ONCE and keep the records in state
+            # (the accessor methods below just read these records)
+            hook_records = parse_hooks(hooks_content)
             
             # Count how many hooks were generated
-            hook_count = len(hook_sections)
+            hook_count = len(hook_records)
             
-            # Extract effectiveness scores if present
-            # We look for "EFFECTIVENESS SCORE:" patterns in the text
-            scores = []
-            for section in hook_sections:
-                if "EFFECTIVENESS SCORE:" in section:
-                    # Try to extract the number
-                    try:
-                        score_line = section.split("EFFECTIVENESS SCORE:")[1].split("\n")[0]
-                        # Extract first number found
-                        score = float(''.join(filter(lambda x: x.isdigit() or x == '.', score_line.split()[0])))
-                        scores.append(score)
-                    except:
-                        scores.append(7.0)  # Default score
+            # Effectiveness scores of the hooks that have one
+            scores = [record["score"] for record in hook_records if record["score"] is not None]
             
             # Calculate average effectiveness
             avg_effectiveness = sum(scores) / len(scores) if scores else 7.5
@@ -224,6 +275,7 @@ Generate 7 unique hooks now."""
             state["hook_count"] = hook_count
             state["hook_effectiveness_avg"] = avg_effectiveness
             state["hook_effectiveness_scores"] = scores
+            state["hook_records"] = hook_records
             
             # Success message
             print(f"✅ Hook Generator: Created {hook_count} hooks")
@@ -240,6 +292,7 @@ Generate 7 unique hooks now."""
             state["viral_hooks"] = f"Hook generation failed: {str(e)}"
             state["hook_count"] = 0
             state["hook_effectiveness_avg"] = 0.0
+            state["hook_records"] = []  # Never keep a previous run's hooks
             
             return state
     
@@ -247,7 +300,7 @@ Generate 7 unique hooks now."""
         """
         EXTRACT BEST HOOK - Get the highest-scoring hook
         
-        This method parses all generated hooks and returns the one
+        This method reads the parsed hook records and returns the one
         with the highest effectiveness score.
         
         Parameters:
@@ -262,30 +315,20 @@ Generate 7 unique hooks now."""
         """
         
         hooks_text = state.get("viral_hooks", "")
-        scores = state.get("hook_effectiveness_scores", [])
+        scored = [record for record in self._get_hook_records(state) if record["score"] is not None]
         
-        if not hooks_text or not scores:
+        if not hooks_text or not scored:
             return {"error": "No hooks available"}
         
-        # Find the index of the highest score
-        best_index = scores.index(max(scores))
+        # Highest score wins (first one on ties)
+        best = max(scored, key=lambda record: record["score"])
+        best_hook_text = hooks_text[best["start"]:best["end"]]
         
-        # Split into individual hooks
-        hook_sections = hooks_text.split("HOOK #")[1:]
-        
-        if best_index < len(hook_sections):
-            best_hook_text = "HOOK #" + hook_sections[best_index]
-            
-            # Parse the components (simplified parser)
-            result = {
-                "full_text": best_hook_text,
-                "score": scores[best_index],
-                "preview": best_hook_text[:200] + "..."
-            }
-            
-            return result
-        
-        return {"error": "Could not extract best hook"}
+        return {
+            "full_text": best_hook_text,
+            "score": best["score"],
+            "preview": best_hook_text[:200] + "..."
+        }
     
     def get_all_hooks_summary(self, state: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
@@ -303,32 +346,39 @@ Generate 7 unique hooks now."""
         """
         
         hooks_text = state.get("viral_hooks", "")
-        scores = state.get("hook_effectiveness_scores", [])
         
         if not hooks_text:
             return []
         
-        # Split into individual hooks
-        hook_sections = hooks_text.split("HOOK #")[1:]
-        
-        summaries = []
-        for i, section in enumerate(hook_sections):
-            score = scores[i] if i < len(scores) else 0.0
-            
-            # Get first line as title
-            title = section.split("\n")[0].strip()
-            
-            summaries.append({
-                "number": i + 1,
-                "title": title,
-                "score": score,
-                "preview": section[:150] + "..."
-            })
+        summaries = [
+            {
+                "number": record["number"],
+                "title": record["title"],
+                "score": record["score"] if record["score"] is not None else 0.0,
+                "preview": hooks_text[record["start"]:record["end"]][:150] + "..."
+            }
+            for record in self._get_hook_records(state)
+        ]
         
         # Sort by score (highest first)
         summaries.sort(key=lambda x: x["score"], reverse=True)
         
         return summaries
+    
+    def _get_hook_records(self, state: Dict[str, Any]) -> List[HookRecord]:
+        """
+        Get the parsed hook records from state.
+        
+        States produced before hook_records existed are parsed once here
+        and the records are saved back into state for next time.
+        """
+        records = state.get("hook_records")
+        
+        if records is None:
+            records = parse_hooks(state.get("viral_hooks", ""))
+            state["hook_records"] = records
+        
+        return records
 
 
 # ==============================================================================
@@ -16,10 +16,17 @@ Created: 2024
 """
 
 import os
+import sys
 import json
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
+# Add the repository root to path so the shared agent modules can be imported
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from agents.embeddings import chroma_embedding_kwargs
+from agents.query_cache import get_query_cache
+from agents.technique_writer import TechniqueWriter
+
 # ChromaDB imports
 try:
     import chromadb
@@ -81,12 +88,14 @@ class ViralTechniqueDatabase:
             )
             
             # Get or create collection
+            # (embeddings from the shared, cached embedder in agents/embeddings.py)
             self.collection = self.client.get_or_create_collection(
                 name="viral_techniques",
                 metadata={
                     "description": "Viral video techniques and patterns",
                     "version": "1.0"
-                }
+                },
+                **chroma_embedding_kwargs()
             )
             
             print(f"✅ Connected to database")
@@ -105,10 +114,14 @@ class ViralTechniqueDatabase:
         Adds a curated set of proven viral techniques to bootstrap
         the database. These come from analysis of successful videos.
         
+        All techniques are written in ONE batched upsert. Running this
+        again is safe: techniques that are already stored unchanged are
+        skipped, changed ones are updated in place.
+        
         Returns:
         --------
         int
-            Number of techniques added
+            Number of techniques added or updated
         """
         
         if not self.collection:
@@ -460,38 +473,42 @@ ADVANCED:
             }
         ]
         
-        added = 0
+        writer = TechniqueWriter(self.collection, batch_size=len(sample_techniques))
         
-        for technique in sample_techniques:
-            try:
-                # Add to database
-                self.collection.add(
-                    documents=[technique["text"]],
-                    ids=[technique["id"]],
-                    metadatas=[technique["metadata"]]
-                )
-                
-                added += 1
-                print(f"✅ Added: {technique['id']}")
-                
-            except Exception as e:
-                print(f"❌ Failed to add {technique['id']}: {str(e)}")
+        try:
+            # Buffer everything, then write it in one batch
+            for technique in sample_techniques:
+                writer.add(technique["id"], technique["text"], technique["metadata"])
+            writer.flush()
+            
+        except Exception as e:
+            print(f"❌ Failed to add sample techniques: {str(e)}")
         
-        print(f"\n✅ Added {added}/{len(sample_techniques)} techniques")
+        added = writer.written
+        print(f"\n✅ Added {added}/{len(sample_techniques)} techniques "
+              f"({writer.unchanged} already up to date)")
         print(f"   Total in database: {self.collection.count()}")
         
         return added
     
-    def search(self, query: str, n_results: int = 5) -> Dict[str, Any]:
+    def search(self,
+               query: str,
+               n_results: int = 5,
+               where: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         SEARCH - Find relevant techniques
         
+        Repeated searches are answered from the shared in-memory cache
+        (agents/query_cache.py) until the collection is written to.
+        
         Parameters:
         -----------
         query : str
             Search query
         n_results : int
             Number of results
+        where : Dict[str, Any], optional
+            Metadata filter, e.g. {"category": "hook"}
         
         Returns:
         --------
@@ -503,11 +520,20 @@ ADVANCED:
             return {"error": "Database not available"}
         
         try:
-            results = self.collection.query(
-                query_texts=[query],
-                n_results=n_results,
-                include=["documents", "metadatas", "distances"]
-            )
+            cache = get_query_cache()
+            results = cache.get(self.collection, query, n_results, where) if cache else None
+            
+            if results is None:
+                query_options = {"where": where} if where else {}
+                results = self.collection.query(
+                    query_texts=[query],
+                    n_results=n_results,
+                    include=["documents", "metadatas", "distances"],
+                    **query_options
+                )
+                
+                if cache:
+                    cache.put(self.collection, query, n_results, where, results)
             
             formatted = []
             if results["documents"] and len(results["documents"][0]) > 0:
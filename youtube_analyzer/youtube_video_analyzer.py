@@ -20,12 +20,22 @@ Author: Advanced Multi-Agent System
 Created: 2024
 """
 
-import anthropic
 import os
-from typing import Dict, List, Any, Optional
+import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from typing import Dict, List, Any, Iterable, Iterator, Optional
+import hashlib
 import json
 from datetime import datetime
 
+# Add the repository root to path so the shared agent modules can be imported
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from agents.client_registry import get_client
+from agents.embeddings import chroma_embedding_kwargs
+from agents.rate_limiter import get_rate_limiter
+from agents.technique_writer import TechniqueWriter, video_technique_id
+from agents.token_estimator import estimate_tokens, truncate_to_tokens
+
 # ChromaDB for vector storage
 try:
     import chromadb
@@ -35,6 +45,16 @@ except ImportError:
     CHROMADB_AVAILABLE = False
     print("⚠️  ChromaDB not installed. Install: pip install chromadb")
 
+# Batch analysis settings (see batch_analyze_videos)
+BATCH_MAX_WORKERS = int(os.getenv("YOUTUBE_BATCH_MAX_WORKERS", 4))
+BATCH_JOURNAL_PATH = os.getenv(
+    "YOUTUBE_BATCH_JOURNAL_PATH",
+    os.path.join(".", "cache", "video_analysis_journal.jsonl")
+)
+
+# Transcript tokens sent for analysis (about 5,000 characters)
+TRANSCRIPT_TOKEN_BUDGET = 1250
+
 class YouTubeVideoAnalyzer:
     """
     YOUTUBE VIDEO ANALYZER - Master Coordinator
@@ -78,13 +98,15 @@ class YouTubeVideoAnalyzer:
                 "Set in .env: ANTHROPIC_API_KEY=your_key_here"
             )
         
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        # Shared, pooled client (see agents/client_registry.py)
+        self.client = get_client(self.api_key)
         self.model = "claude-sonnet-4-20250514"
         
         # Database setup
         self.db_path = db_path
         self.db_client = None
         self.collection = None
+        self.writer = None  # Batched, repeat-safe writes (see store_in_database)
         
         if CHROMADB_AVAILABLE:
             self._initialize_database()
@@ -114,14 +136,19 @@ class YouTubeVideoAnalyzer:
             
             # Get or create collection
             # A collection stores related documents with embeddings
+            # (computed by the shared, cached embedder in agents/embeddings.py)
             self.collection = self.db_client.get_or_create_collection(
                 name="viral_techniques",
                 metadata={
                     "description": "Analyzed viral video techniques and patterns",
                     "created": datetime.now().isoformat()
-                }
+                },
+                **chroma_embedding_kwargs()
             )
             
+            # Buffers analyses and upserts them in batches
+            self.writer = TechniqueWriter(self.collection)
+            
             print(f"✅ Database initialized: {self.db_path}")
             print(f"   Collection: {self.collection.name}")
             print(f"   Techniques stored: {self.collection.count()}")
@@ -130,6 +157,7 @@ class YouTubeVideoAnalyzer:
             print(f"❌ Database initialization failed: {str(e)}")
             self.db_client = None
             self.collection = None
+            self.writer = None
     
     def analyze_video(self, 
                      video_url: str,
@@ -176,7 +204,7 @@ Views: {video_views if video_views else "Unknown"}
 Engagement Rate: {video_engagement_rate if video_engagement_rate else "Unknown"}
 
 TRANSCRIPT/CONTENT:
-{video_transcript[:5000]}  # First 5000 chars
+{truncate_to_tokens(video_transcript, TRANSCRIPT_TOKEN_BUDGET)}
 
 YOUR TASK:
 You are a team of 6 specialized video analysis agents. Analyze this video
@@ -360,16 +388,21 @@ Provide thorough, specific analysis that can inform future content creation."""
             # Call Claude to perform comprehensive analysis
             print("🤖 Running 6-agent analysis...")
             
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=8000,  # Long analysis
-                temperature=0.6,  # Balanced
-                messages=[
-                    {
-                        "role": "user",
-                        "content": analysis_prompt
-                    }
-                ]
+            # Shared rate limiter: waits for budget, retries rate limits
+            response = get_rate_limiter().call(
+                lambda: self.client.messages.create(
+                    model=self.model,
+                    max_tokens=8000,  # Long analysis
+                    temperature=0.6,  # Balanced
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": analysis_prompt
+                        }
+                    ]
+                ),
+                estimated_tokens=estimate_tokens(analysis_prompt),
+                description="Video analysis"
             )
             
             # Extract analysis
@@ -413,25 +446,32 @@ Provide thorough, specific analysis that can inform future content creation."""
                 pass
         return 7.5  # Default
     
-    def store_in_database(self, analysis: Dict[str, Any]) -> bool:
+    def store_in_database(self, analysis: Dict[str, Any], flush: bool = True) -> bool:
         """
         STORE IN DATABASE - Save analysis to vector database
         
         Takes the analysis result and stores it in ChromaDB with
         automatic embedding generation for semantic search.
         
+        The document ID is derived from the video URL, so storing the same
+        video again UPDATES its entry instead of adding a duplicate - and
+        storing an unchanged analysis again does nothing at all.
+        
         Parameters:
         -----------
         analysis : Dict[str, Any]
             Analysis result from analyze_video()
+        flush : bool
+            Write right away (default). With False the analysis is only
+            buffered and written with the next batch (see TechniqueWriter)
         
         Returns:
         --------
         bool
-            True if successful, False otherwise
+            True if successful (or buffered), False otherwise
         """
         
-        if not self.collection:
+        if not self.writer:
             print("❌ Database not available - cannot store")
             return False
         
@@ -440,26 +480,27 @@ Provide thorough, specific analysis that can inform future content creation."""
             return False
         
         try:
-            # Generate unique ID
-            video_id = f"video_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            video_id = self._technique_id(analysis)
             
-            # Store in database
+            # Buffer for the next batched upsert
             # ChromaDB automatically generates embeddings
-            self.collection.add(
-                documents=[analysis["analysis_text"]],
-                ids=[video_id],
-                metadatas=[{
+            self.writer.add(
+                video_id,
+                analysis["analysis_text"],
+                {
                     "video_url": analysis["video_url"],
                     "video_title": analysis["video_title"],
                     "views": str(analysis.get("video_views", "unknown")),
                     "viral_score": str(analysis.get("viral_score", 0)),
                     "analyzed_at": analysis["analyzed_at"],
                     "technique_count": str(analysis.get("technique_count", 0))
-                }]
+                }
             )
             
-            print(f"✅ Stored in database: {video_id}")
-            print(f"   Total techniques in library: {self.collection.count()}")
+            if flush:
+                self.writer.flush()
+                print(f"✅ Stored in database: {video_id}")
+                print(f"   Total techniques in library: {self.collection.count()}")
             
             return True
             
@@ -467,66 +508,273 @@ Provide thorough, specific analysis that can inform future content creation."""
             print(f"❌ Storage failed: {str(e)}")
             return False
     
-    def batch_analyze_videos(self, video_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _technique_id(self, analysis: Dict[str, Any]) -> str:
+        """Stable database ID for an analysis: same video URL = same ID."""
+        return video_technique_id(analysis.get("video_url") or analysis["analysis_text"])
+    
+    def batch_analyze_videos(self,
+                             video_list: Iterable[Dict[str, Any]],
+                             max_workers: Optional[int] = None,
+                             journal_path: Optional[str] = None,
+                             store: bool = True) -> Dict[str, Any]:
         """
-        BATCH ANALYZE - Analyze multiple videos
+        BATCH ANALYZE - Analyze many videos in parallel, resumable after a crash
+        
+        HOW IT WORKS:
+        - Up to max_workers videos are analyzed at the same time (the shared
+          rate limiter in agents/rate_limiter.py keeps Claude calls in budget)
+        - Every finished video is appended to a JOURNAL file (one JSON line
+          per video, keyed by video_url) and then forgotten - results go to
+          disk instead of piling up in memory
+        - Run the same batch again (same journal) and every video already
+          analyzed is SKIPPED - a crash at video 180 of 200 only costs the
+          videos that were in flight
+        - Successful analyses are stored in BATCHES (one upsert per
+          TechniqueWriter batch); a "stored" line is journaled once a
+          batch is really in the database
+        - Failed videos are retried on the next run; videos that were
+          analyzed but not stored are stored from the journal (no new
+          Claude call)
+        
+        Read the analyses back with iter_batch_journal(journal_path).
         
         Parameters:
         -----------
-        video_list : List[Dict[str, Any]]
-            List of video dictionaries with keys:
+        video_list : Iterable[Dict[str, Any]]
+            Video dictionaries with keys:
             - video_url, video_title, video_transcript
+            - optional: video_views, video_engagement_rate
+            (a generator works too - videos are read as workers free up)
+        max_workers : int, optional
+            Videos analyzed at once (default: YOUTUBE_BATCH_MAX_WORKERS or 4)
+        journal_path : str, optional
+            Checkpoint file (default: YOUTUBE_BATCH_JOURNAL_PATH or
+            ./cache/video_analysis_journal.jsonl)
+        store : bool
+            Store successful analyses in the database (default: True)
         
         Returns:
         --------
         Dict[str, Any]
-            Batch results with statistics
+            Batch statistics (the analyses themselves are in the journal)
         """
         
-        print(f"\n🎬 Batch analyzing {len(video_list)} videos...")
+        max_workers = max(1, max_workers or BATCH_MAX_WORKERS)
+        journal_path = journal_path or BATCH_JOURNAL_PATH
+        
+        # What earlier runs already finished (keys only - analyses stay on disk)
+        completed = set()
+        stored_keys = set()
+        for entry in iter_batch_journal(journal_path):
+            if entry.get("status") == "ok":
+                completed.add(entry["key"])
+            if entry.get("status") == "stored" or entry.get("stored"):
+                stored_keys.add(entry["key"])
+        
+        store = store and self.writer is not None
         
         results = {
-            "total": len(video_list),
+            "total": 0,
             "successful": 0,
             "failed": 0,
             "stored": 0,
-            "analyses": []
+            "skipped": 0,
+            "journal_path": journal_path
         }
         
-        for i, video in enumerate(video_list, 1):
-            print(f"\n[{i}/{len(video_list)}] Processing...")
+        print(f"\n🎬 Batch analyzing videos ({max_workers} at a time)...")
+        print(f"   Journal: {journal_path} ({len(completed)} videos already done)")
+        
+        journal_dir = os.path.dirname(journal_path)
+        if journal_dir:
+            os.makedirs(journal_dir, exist_ok=True)
+        
+        # A crash mid-write leaves a torn last line - end it so the first
+        # new entry starts on a line of its own instead of being glued to it
+        _terminate_journal(journal_path)
+        
+        seen = set()
+        
+        # Buffered document ID -> journal key, until its batch is written
+        buffered_keys = {}
+        
+        # Only the coordinating thread writes the journal and the database;
+        # workers just run analyze_video()
+        with open(journal_path, "a", encoding="utf-8") as journal, \
+                ThreadPoolExecutor(max_workers=max_workers) as executor:
             
-            # Analyze
-            analysis = self.analyze_video(
-                video_url=video.get("video_url", ""),
-                video_title=video.get("video_title", "Untitled"),
-                video_transcript=video.get("video_transcript", ""),
-                video_views=video.get("video_views"),
-                video_engagement_rate=video.get("video_engagement_rate")
-            )
+            def write_line(entry: Dict[str, Any]):
+                """Append one journal line (flushed immediately)."""
+                journal.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                journal.flush()
+            
+            def batch_written(doc_ids: List[str]):
+                """A database batch is in - journal its videos as stored."""
+                for doc_id in doc_ids:
+                    key = buffered_keys.pop(doc_id, None)
+                    if key is not None:
+                        results["stored"] += 1
+                        write_line({"key": key, "status": "stored"})
+            
+            def store_later(key: str, analysis: Dict[str, Any]):
+                """Buffer one analysis for the next database batch."""
+                if not store:
+                    return
+                buffered_keys[self._technique_id(analysis)] = key
+                self.store_in_database(analysis, flush=False)
+            
+            def finish(future, key: str):
+                """Count, journal and store one finished analysis."""
+                try:
+                    analysis = future.result()
+                except Exception as e:
+                    analysis = {"video_url": key, "error": str(e)}
+                
+                failed = "error" in analysis
+                results["failed" if failed else "successful"] += 1
+                
+                # Journal the analysis FIRST, then queue it for the database
+                write_line({
+                    "key": key,
+                    "status": "error" if failed else "ok",
+                    "analysis": analysis
+                })
+                if not failed:
+                    store_later(key, analysis)
+                
+                done = results["successful"] + results["failed"]
+                print(f"   [{done} analyzed, {results['skipped']} skipped] "
+                      f"{'✅' if 'error' not in analysis else '❌'} {analysis.get('video_title', key)}")
+            
+            if store:
+                self.writer.on_flush = batch_written
+                
+                # Analyzed by an earlier run but never stored - store now
+                # (streamed from the journal, no new Claude call)
+                for entry in iter_batch_journal(journal_path):
+                    key = entry.get("key")
+                    if entry.get("status") == "ok" and key not in stored_keys:
+                        stored_keys.add(key)
+                        store_later(key, entry["analysis"])
             
-            results["analyses"].append(analysis)
+            # Sliding window: never more than 2 x max_workers videos in memory
+            pending = {}
             
-            # Check success
-            if "error" in analysis:
-                results["failed"] += 1
-            else:
-                results["successful"] += 1
+            for video in video_list:
+                results["total"] += 1
+                key = _journal_key(video)
+                
+                if key in seen:
+                    results["skipped"] += 1
+                    continue
+                seen.add(key)
                 
-                # Store
-                if self.store_in_database(analysis):
-                    results["stored"] += 1
+                if key in completed:
+                    results["skipped"] += 1
+                    continue
+                
+                future = executor.submit(
+                    self.analyze_video,
+                    video_url=video.get("video_url", ""),
+                    video_title=video.get("video_title", "Untitled"),
+                    video_transcript=video.get("video_transcript", ""),
+                    video_views=video.get("video_views"),
+                    video_engagement_rate=video.get("video_engagement_rate")
+                )
+                pending[future] = key
+                
+                if len(pending) >= max_workers * 2:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        finish(future, pending.pop(future))
+            
+            # Drain what is still running
+            for future in as_completed(list(pending)):
+                finish(future, pending.pop(future))
+            
+            # Write the last, partly filled database batch
+            if store:
+                try:
+                    self.writer.flush()
+                except Exception as e:
+                    print(f"❌ Storage failed: {str(e)}")
+                finally:
+                    self.writer.on_flush = None
         
         print(f"\n{'='*70}")
         print(f"BATCH ANALYSIS COMPLETE")
         print(f"{'='*70}")
         print(f"✅ Successful: {results['successful']}/{results['total']}")
         print(f"✅ Stored: {results['stored']}/{results['total']}")
+        print(f"⏭️  Skipped (already done): {results['skipped']}/{results['total']}")
         print(f"❌ Failed: {results['failed']}/{results['total']}")
         
         return results
 
 
+def _journal_key(video: Dict[str, Any]) -> str:
+    """
+    Identify a video in the batch journal.
+    
+    The video_url when there is one; otherwise a fingerprint of the title
+    and transcript (so the same untitled video is still recognized).
+    """
+    if video.get("video_url"):
+        return video["video_url"]
+    
+    fingerprint = hashlib.sha256(
+        f"{video.get('video_title', '')}\x1f{video.get('video_transcript', '')}".encode("utf-8")
+    ).hexdigest()[:16]
+    return f"no-url:{fingerprint}"
+
+
+def _terminate_journal(journal_path: str):
+    """Make sure a non-empty journal ends with a newline before appending."""
+    if not os.path.exists(journal_path) or os.path.getsize(journal_path) == 0:
+        return
+    
+    with open(journal_path, "rb+") as journal:
+        journal.seek(-1, os.SEEK_END)
+        if journal.read(1) != b"\n":
+            journal.write(b"\n")
+
+
+def iter_batch_journal(journal_path: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Read a batch journal back, one entry at a time.
+    
+    Two kinds of entries:
+    - {"key", "status": "ok"|"error", "analysis"} per analysis
+    - {"key", "status": "stored"} once that analysis is in the database
+    A video can appear more than once (e.g. failed, then retried) - the
+    LAST analysis entry for a key is the current one. A half-written last
+    line (crash while writing) is skipped.
+    
+    Parameters:
+    -----------
+    journal_path : str, optional
+        Journal file (default: the batch default)
+    
+    Yields:
+    -------
+    Dict[str, Any]
+        Journal entries in the order they were written
+    """
+    journal_path = journal_path or BATCH_JOURNAL_PATH
+    if not os.path.exists(journal_path):
+        return
+    
+    with open(journal_path, "r", encoding="utf-8") as journal:
+        for line in journal:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
 # ==============================================================================
 # TESTING
 # ==============================================================================